@@ -0,0 +1,39 @@
+"""Throughput of the Monte Carlo points simulator (features.simulate) on a
+synthetic 600-player pool, keeping the full matrix and summary-only.
+
+    python benchmarks/bench_simulate.py [--players 600]
+
+The pool stacks candidate pools from several synthetic leagues (one league
+has ~390 players who can appear) and renumbers them.
+"""
+from __future__ import annotations
+import argparse, itertools, time
+
+import numpy as np
+import pandas as pd
+
+from fpl_opt.features.simulate import simulate_points
+from fpl_opt.utils.synthetic import make_candidates
+
+
+def candidate_pool(players: int) -> pd.DataFrame:
+    frames, total = [], 0
+    for seed in itertools.count():
+        frames.append(make_candidates(seed=seed))
+        total += len(frames[-1])
+        if total >= players:
+            break
+    pool = pd.concat(frames, ignore_index=True).head(players)
+    return pool.assign(element_id=np.arange(1, players + 1))
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--players", type=int, default=600)
+    args = ap.parse_args()
+    proj = candidate_pool(args.players)
+    for n, keep in ((10_000, True), (100_000, True), (100_000, False)):
+        t = time.perf_counter()
+        scen, _ = simulate_points(proj, n_scenarios=n, keep=keep)
+        mb = scen.nbytes / 2**20 if scen is not None else 0.0
+        print(f"{n:>7} x {len(proj)} keep={keep!s:<5} {time.perf_counter() - t:6.2f} s  ({mb:.0f} MB matrix)")
@@ -0,0 +1,19 @@
+"""Scenario-count stability of the CVaR squad model (optimize.stochastic):
+re-solves on growing scenario samples and scores each pick on a held-out one.
+Use it to choose the smallest --scenarios whose pick no longer moves.
+
+    python benchmarks/bench_stochastic.py
+"""
+from __future__ import annotations
+
+import pandas as pd
+
+from fpl_opt.optimize.stochastic import scenario_stability
+from fpl_opt.utils.synthetic import make_candidates
+
+
+if __name__ == "__main__":
+    pd.set_option("display.width", 200)
+    rep = scenario_stability(make_candidates(), counts=(250, 1000, 2500, 5000, 10_000),
+                             n_reps=200, risk_weight=0.5, max_time=10, num_workers=1)
+    print(rep.drop(columns=["status"]).round(3).to_string(index=False))
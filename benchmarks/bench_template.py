@@ -0,0 +1,40 @@
+"""Per-solve overhead of building the squad model from scratch vs. re-solving a
+compiled optimize.template.SquadTemplate, as in sweeps and batch runs.
+Single-threaded with a 1 s limit; "setup" is everything outside CpSolver.Solve.
+
+    python benchmarks/bench_template.py
+"""
+from __future__ import annotations
+import time
+
+import numpy as np
+
+from fpl_opt.optimize.hints import greedy_squad
+from fpl_opt.optimize.template import SquadTemplate
+from fpl_opt.optimize.transfers import build_squad_with_transfers
+from fpl_opt.utils.synthetic import make_candidates
+
+RUNS = 10
+
+
+def _time(label, fn):
+    t = time.perf_counter()
+    walls = [fn(k)["stats"]["wall_time"] for k in range(RUNS)]
+    per = (time.perf_counter() - t) / RUNS
+    print(f"{label:<22}{per * 1e3:8.1f} ms/solve   (solver {np.mean(walls) * 1e3:6.1f} ms, "
+          f"setup {(per - np.mean(walls)) * 1e3:6.1f} ms)")
+
+
+if __name__ == "__main__":
+    cands = make_candidates()
+    rng = np.random.default_rng(0)
+    noisy = cands.assign(ep_next=cands["ep_next"] * rng.uniform(0.3, 1.7, len(cands)))
+    current = greedy_squad(noisy, 1000, 3)
+    eps = [cands.assign(ep_next=cands["ep_next"] * rng.uniform(0.8, 1.2, len(cands))) for _ in range(RUNS)]
+    kw = dict(current_ids=current, bank_tenths=5, free_transfers=1, max_time=1.0, num_workers=1)
+
+    t = time.perf_counter()
+    tpl = SquadTemplate(cands)
+    print(f"compile template      {(time.perf_counter() - t) * 1e3:8.1f} ms (once per pool)")
+    _time("rebuild every solve", lambda k: build_squad_with_transfers(eps[k], **kw))
+    _time("compiled template", lambda k: build_squad_with_transfers(eps[k], template=tpl, **kw))
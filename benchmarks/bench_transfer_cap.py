@@ -0,0 +1,33 @@
+"""Solve time of build_squad_with_transfers with max_extra_transfers k = 1..5 vs. unbounded,
+plus the bounded-neighbourhood mode (only the 4 weakest owned players may be sold).
+
+    python benchmarks/bench_transfer_cap.py
+"""
+from __future__ import annotations
+
+import numpy as np
+
+from fpl_opt.optimize.hints import greedy_squad
+from fpl_opt.optimize.transfers import build_squad_with_transfers
+from fpl_opt.utils.synthetic import make_candidates
+
+
+def _run(label, **kw):
+    res = build_squad_with_transfers(**kw)
+    st = res["stats"]
+    print(f"{label:<24}{st['status']:>10}{st['wall_time']:8.2f}s   obj={res['objective']:7.2f}   "
+          f"transfers={res['transfers_out_count']}")
+
+
+if __name__ == "__main__":
+    cands = make_candidates()
+    # A plausible but stale squad: greedy on noisy projections
+    noisy = cands.assign(ep_next=cands["ep_next"] * np.random.default_rng(0).uniform(0.3, 1.7, len(cands)))
+    current = greedy_squad(noisy, 1000, 3)
+    base = dict(df=cands, current_ids=current, bank_tenths=5, free_transfers=2)
+
+    _run("unbounded", **base, max_extra_transfers=None)
+    for k in range(1, 6):
+        _run(f"cap k={k}", **base, max_extra_transfers=k)
+    weakest = cands[cands["element_id"].isin(current)].nsmallest(4, "ep_next")["element_id"].tolist()
+    _run("neighbourhood (4 sells)", **base, max_extra_transfers=None, sell_candidates=weakest)
@@ -0,0 +1,25 @@
+"""`python -m fpl_opt [serve|batch|sweep|backtest] ...`; anything else goes to the weekly CLI."""
+import sys
+
+def main() -> None:
+    argv = sys.argv[1:]
+    cmd = argv[0] if argv else ""
+    if cmd == "serve":
+        from .server import main as serve
+        serve(argv[1:])
+    elif cmd == "batch":
+        from .batch import main as batch
+        batch(argv[1:])
+    elif cmd == "sweep":
+        from .sweep import main as sweep
+        sweep(argv[1:])
+    elif cmd == "backtest":
+        from .backtest import main as backtest
+        backtest(argv[1:])
+    else:
+        from .cli import main as cli
+        cli(argv)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+"""Replay archived snapshots gameweek by gameweek and score the decisions.
+
+A season is a snapshot store (fplio.store) holding the bootstrap/fixtures
+snapshots taken before each deadline, plus `element_summary/*.json`
+histories (fplio.bulk) for the realised points. For every GW the last
+bootstrap snapshot whose next event is that GW is projected and optimized
+exactly as the weekly CLI does: a fresh squad in the first replayed GW, then
+build_squad_with_transfers under the real state transitions:
+- sell prices follow the 50% profit rule from the recorded purchase prices;
+- the bank is carried forward from each move;
+- free transfers roll over up to `max_free_transfers`, and hits cost 4.
+
+The chosen XI is scored on realised points with FPL auto-substitution and
+vice-captaincy. Projection accuracy (MAE and rank correlation against
+realised points) is recorded alongside.
+
+Each (season, config) replay is sequential, so runs are spread over a
+process pool by season and config. Projections are cached on disk per
+(snapshot hashes, weights), so configs that share weights, and reruns, skip
+projecting.
+
+    python -m fpl_opt backtest --season 2023-24=data/seasons/2023-24 \\
+        --weights configs/weights.yaml configs/alt.yaml --max-extra-transfers 0 1 --workers 4
+"""
+from __future__ import annotations
+import argparse, json, multiprocessing as mp, os, pathlib, time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from rich.console import Console
+from rich.table import Table
+
+from .features.projcache import ProjectionCache, fingerprint
+from .features.projections import load_yaml, project_next_gw
+from .fplio.bulk import load_element_summaries
+from .fplio.normalize import history_table
+from .fplio.store import SnapshotStore, payload_hash
+from .fplio.tablecache import TABLE_DIR, normalized_tables
+from .optimize.model import build_squad
+from .optimize.transfers import build_squad_with_transfers
+
+MAX_FREE_TRANSFERS = 5  # rollover cap since 2024/25 (2 before)
+BUDGET_TENTHS = 1000
+MIN_PLAYING = {"GK": 1, "DEF": 3, "MID": 2, "FWD": 1}
+
+console = Console()
+
+
+def season_gameweeks(store: SnapshotStore) -> Dict[int, Tuple[str, str]]:
+    """{gw: (bootstrap_hash, fixtures_hash)} from the last bootstrap snapshot whose
+    next event is gw, paired with the fixtures snapshot current at that time."""
+    out: Dict[int, Tuple[str, str]] = {}
+    for ts, bh in store.entries("bootstrap_static"):
+        events = store.load_object(bh).get("events", [])
+        gw = next((e["id"] for e in events if e.get("is_next")), None)
+        if gw is None:
+            continue
+        try:
+            _, fh = store.resolve("fixtures", ts)
+        except LookupError:
+            continue
+        out[int(gw)] = (bh, fh)  # entries are time-ordered: keep the one closest to the deadline
+    return out
+
+def realized_points(summaries: Dict[int, dict]) -> pd.DataFrame:
+    """Per (element_id, round): summed minutes and total_points (doubles add up)."""
+    hist = history_table(summaries)
+    return (hist.astype({"minutes": int, "total_points": int})
+                .groupby(["element_id", "round"], as_index=False)[["minutes", "total_points"]].sum())
+
+def next_free_transfers(free: int, made: int, max_free: int = MAX_FREE_TRANSFERS) -> int:
+    """Free transfers for the next GW: unused ones roll over (capped), plus one."""
+    return min(max_free, max(free - made, 0) + 1)
+
+def realized_score(squad: pd.DataFrame, points: Dict[int, int], minutes: Dict[int, int]) -> Tuple[int, List[int]]:
+    """(points, final XI ids) for a picked squad after FPL auto-subs and vice-captaincy.
+
+    Starters who didn't play are replaced in order by the first bench player
+    (by ep_next) who did and keeps the XI's formation legal (counted over all
+    eleven, played or not); GKs only swap with GKs.
+    The captain's points double, or the vice-captain's (the best other starter
+    by ep_next) if the captain didn't play.
+    """
+    starters = squad[squad["is_starter"]].sort_values("ep_next", ascending=False)
+    bench = squad[~squad["is_starter"]].sort_values("ep_next", ascending=False)
+    pos = dict(zip(squad["element_id"].astype(int), squad["position"].astype(str)))
+    xi = [int(x) for x in starters["element_id"]]
+    played = lambda pid: minutes.get(pid, 0) > 0
+    subs = [int(x) for x in bench["element_id"]]
+    for out in [p for p in xi if not played(p)]:
+        for sub in subs:
+            if not played(sub) or (pos[sub] == "GK") != (pos[out] == "GK"):
+                continue
+            trial = [sub if p == out else p for p in xi]
+            counts = pd.Series([pos[p] for p in trial]).value_counts()
+            if all(counts.get(P, 0) >= n for P, n in MIN_PLAYING.items() if P != "GK"):
+                xi, subs = trial, [s for s in subs if s != sub]
+                break
+    captain = int(squad.loc[squad["is_captain"], "element_id"].iloc[0])
+    vice = next((p for p in starters["element_id"].astype(int) if p != captain), captain)
+    doubled = captain if played(captain) else vice
+    total = sum(points.get(p, 0) for p in xi) + (points.get(doubled, 0) if doubled in xi else 0)
+    return int(total), xi
+
+def _projection(store: SnapshotStore, bh: str, fh: str, weights: Dict, cache_root) -> pd.DataFrame:
+    def build():
+        players, teams, fixtures = normalized_tables(store.load_object(bh), store.load_object(fh), bh, fh, cache_root)
+        return project_next_gw(players, teams, fixtures, weights=weights)
+    cache = ProjectionCache(pathlib.Path(cache_root) / "projections" if cache_root else None)
+    return cache.get_or_build(fingerprint(bh, fh, payload_hash(weights).encode()), build)
+
+def _accuracy(cands: pd.DataFrame, points: Dict[int, int]) -> Tuple[float, float]:
+    real = cands["element_id"].astype(int).map(points).fillna(0).to_numpy(np.float64)
+    ep = cands["ep_next"].to_numpy(np.float64)
+    rho = pd.Series(ep).rank().corr(pd.Series(real).rank()) if len(ep) > 1 else np.nan  # Spearman
+    return float(np.abs(ep - real).mean()), float(rho)
+
+def run_season(season: Dict[str, Any], config: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Replay one season under one config; one record per gameweek.
+
+    season: name, root, gameweeks (season_gameweeks), realized (realized_points).
+    config: name, weights (dict), max_extra_transfers, max_time, max_free_transfers,
+    cache_root.
+    """
+    store = SnapshotStore(season["root"])
+    real = season["realized"]
+    max_free = config.get("max_free_transfers", MAX_FREE_TRANSFERS)
+    ids: List[int] = []
+    purchases: Dict[int, int] = {}
+    bank = BUDGET_TENTHS
+    free = 1
+    out = []
+    for gw in sorted(season["gameweeks"]):
+        t0 = time.perf_counter()
+        bh, fh = season["gameweeks"][gw]
+        proj = _projection(store, bh, fh, config["weights"], config.get("cache_root"))
+        now = dict(zip(proj["element_id"].astype(int), proj["price_tenths"].astype(int)))
+        this = real[real["round"] == gw]
+        points = dict(zip(this["element_id"].astype(int), this["total_points"].astype(int)))
+        minutes = dict(zip(this["element_id"].astype(int), this["minutes"].astype(int)))
+        cands = proj[proj["exp_minutes"] > 0]
+
+        for pid in [p for p in ids if p not in now]:  # left the game: refunded at purchase price
+            ids.remove(pid)
+            bank += purchases.pop(pid)
+        if not ids:  # first replayed GW: unlimited changes, like a season start
+            squad, objective = build_squad(cands.reset_index(drop=True), budget_tenths=bank,
+                                           max_time=config["max_time"], num_workers=1)
+            ins, outs, hits = [], [], 0
+            purchases = {int(p): now[int(p)] for p in squad["element_id"]}
+            bank -= sum(purchases.values())
+            status, next_free = squad.attrs["solve_stats"]["status"], 1
+        else:
+            pool = proj[(proj["exp_minutes"] > 0) | proj["element_id"].isin(ids)].reset_index(drop=True)
+            res = build_squad_with_transfers(pool, ids, bank, purchases, free, config["max_extra_transfers"],
+                                             max_time=config["max_time"], num_workers=1)
+            squad, objective = res["squad"], res["objective"]
+            ins, outs = [int(x) for x in res["transfers_in"]], [int(x) for x in res["transfers_out"]]
+            hits, bank = 4 * int(res["extra_transfers"]), res["final_bank_tenths"]
+            for p in outs:
+                purchases.pop(p)
+            purchases.update({p: now[p] for p in ins})
+            status, next_free = res["stats"]["status"], next_free_transfers(free, len(ins), max_free)
+        ids = [int(x) for x in squad["element_id"]]
+
+        score, xi = realized_score(squad, points, minutes)
+        mae, rho = _accuracy(cands, points)
+        out.append({
+            "season": season["name"], "config": config["name"], "gw": int(gw),
+            "free_transfers": free, "transfers_in": ins, "transfers_out": outs,
+            "hits": hits, "bank_tenths": int(bank), "projected": float(objective),
+            "realized": score, "net": score - hits, "xi": xi,
+            "captain": int(squad.loc[squad["is_captain"], "element_id"].iloc[0]),
+            "proj_mae": mae, "proj_spearman": rho, "status": status,
+            "seconds": time.perf_counter() - t0,
+        })
+        free = next_free
+    return out
+
+def _job(season: Dict[str, Any], config: Dict[str, Any]) -> List[Dict[str, Any]]:
+    try:
+        return run_season(season, config)
+    except (RuntimeError, ValueError) as e:
+        return [{"season": season["name"], "config": config["name"], "error": f"{type(e).__name__}: {e}"}]
+
+def load_season(root: str | pathlib.Path, name: str | None = None,
+                gws: Tuple[int, ...] | None = None) -> Dict[str, Any]:
+    """Season dict for run_season from a store root with element_summary/ inside."""
+    root = pathlib.Path(root)
+    weeks = season_gameweeks(SnapshotStore(root))
+    if gws is not None:
+        weeks = {g: v for g, v in weeks.items() if gws[0] <= g <= gws[1]}
+    if not weeks:
+        raise SystemExit(f"No replayable gameweeks in {root}")
+    return {"name": name or root.name, "root": str(root), "gameweeks": weeks,
+            "realized": realized_points(load_element_summaries(root / "element_summary"))}
+
+def run_backtest(seasons: Sequence[Dict[str, Any]], configs: Sequence[Dict[str, Any]],
+                 workers: int | None = None, out_path: str | None = None) -> List[Dict[str, Any]]:
+    """All season x config replays over a process pool; per-GW records are
+    appended to out_path (JSONL) as each replay finishes."""
+    jobs = [(s, c) for s in seasons for c in configs]
+    workers = min(len(jobs), workers or os.cpu_count() or 1)
+    ctx = mp.get_context("fork" if "fork" in mp.get_all_start_methods() else "spawn")
+    records: List[Dict[str, Any]] = []
+    out = open(out_path, "a") if out_path else None
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as ex:
+            for fut in as_completed([ex.submit(_job, s, c) for s, c in jobs]):
+                recs = fut.result()
+                records.extend(recs)
+                if out:
+                    out.writelines(json.dumps(r) + "\n" for r in recs)
+                    out.flush()
+    finally:
+        if out:
+            out.close()
+    return records
+
+def summarize(records: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Season totals per (season, config)."""
+    ok = pd.DataFrame([r for r in records if "error" not in r])
+    if ok.empty:
+        return ok
+    ok["transfers"] = ok["transfers_in"].map(len)
+    return (ok.groupby(["season", "config"], as_index=False)
+              .agg(gws=("gw", "count"), net=("net", "sum"), realized=("realized", "sum"),
+                   projected=("projected", "sum"), hits=("hits", "sum"), transfers=("transfers", "sum"),
+                   proj_mae=("proj_mae", "mean"), proj_spearman=("proj_spearman", "mean"),
+                   seconds=("seconds", "sum"))
+              .sort_values(["season", "net"], ascending=[True, False], ignore_index=True))
+
+def _season_arg(s: str) -> Tuple[str | None, str]:
+    name, _, root = s.rpartition("=")
+    return name or None, root
+
+def main(argv: List[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description="Backtest projections and optimizers over stored seasons")
+    ap.add_argument("--season", action="append", default=None,
+                    help="[NAME=]DIR snapshot store with element_summary/ inside (repeatable; default data/raw)")
+    ap.add_argument("--weights", nargs="+", default=["configs/weights.yaml"])
+    ap.add_argument("--max-extra-transfers", type=int, nargs="+", default=[1])
+    ap.add_argument("--max-free-transfers", type=int, default=MAX_FREE_TRANSFERS)
+    ap.add_argument("--max-time", type=float, default=5.0, help="Solver time limit per GW (s)")
+    ap.add_argument("--gws", type=str, default=None, help="Replay only these GWs, e.g. 5-20")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--out", type=str, default=None, help="Append per-GW records (JSONL) here")
+    ap.add_argument("--cache-root", type=str, default=str(TABLE_DIR), help="Table/projection cache directory")
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    gws = tuple(int(x) for x in args.gws.split("-")) if args.gws else None
+    seasons = [load_season(root, name, gws) for name, root in map(_season_arg, args.season or ["data/raw"])]
+    configs = [{"name": f"{pathlib.Path(w).stem}/x{mx}", "weights": load_yaml(w), "max_extra_transfers": mx,
+                "max_time": args.max_time, "max_free_transfers": args.max_free_transfers,
+                "cache_root": args.cache_root}
+               for w in args.weights for mx in args.max_extra_transfers]
+    records = run_backtest(seasons, configs, args.workers, args.out)
+
+    t = Table(title="Backtest")
+    summary = summarize(records)
+    for col in summary.columns:
+        t.add_column(col, justify="left" if col in ("season", "config") else "right")
+    for r in summary.itertuples(index=False):
+        t.add_row(*[f"{v:.2f}" if isinstance(v, float) else str(v) for v in r])
+    console.print(t)
+    for r in records:
+        if "error" in r:
+            console.print(f"[red]{r['season']} / {r['config']}: {r['error']}[/red]")
+    console.print(f"{len(seasons)} season(s) x {len(configs)} config(s) in {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Batch weekly recommendations for many managers' team files.
+
+Data is fetched, normalized and projected once, and the squad model compiled
+once (optimize.template), in the parent. Workers are forked so they inherit
+the candidate pool's NumPy buffers and the compiled model copy-on-write (no
+per-task pickling); where fork isn't available the pool is sent once per
+worker through the initializer. Each worker runs CP-SAT with a small fixed
+thread count so workers x threads matches the machine. Results are appended to
+a JSONL file as each team finishes.
+
+    python -m fpl_opt batch teams/*.json --out results.jsonl --workers 8 --threads 1
+"""
+from __future__ import annotations
+import argparse, json, multiprocessing as mp, os, time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing.context import BaseContext
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+import pandas as pd
+
+from .ops import load_current_team, load_payloads, prepare
+from .optimize.template import SquadTemplate
+from .optimize.transfers import build_squad_with_transfers
+
+_POOL: pd.DataFrame | None = None  # candidate pool, set in the parent before forking
+_TEMPLATE: SquadTemplate | None = None  # its compiled squad model
+
+
+def _init_worker(pool: pd.DataFrame | None) -> None:
+    global _POOL, _TEMPLATE
+    if pool is not None:
+        _POOL, _TEMPLATE = pool, SquadTemplate(pool)
+
+def _recommend(path: str, max_extra_transfers: int, threads: int, max_time: float) -> Dict[str, Any]:
+    t0 = time.perf_counter()
+    try:
+        cfg = load_current_team(path)
+        res = build_squad_with_transfers(
+            df=_POOL,
+            current_ids=cfg["element_ids"],
+            bank_tenths=cfg["bank_tenths"],
+            purchases_tenths=cfg["purchases_tenths"],
+            free_transfers=cfg["free_transfers"],
+            max_extra_transfers=max_extra_transfers,
+            max_time=max_time,
+            num_workers=threads,
+            template=_TEMPLATE,
+        )
+    except (Exception, SystemExit) as e:  # one bad team file must not sink the batch
+        return {"team": path, "error": str(e)}
+    squad = res["squad"]
+    return {
+        "team": path,
+        "transfers_out": [int(x) for x in res["transfers_out"]],
+        "transfers_in": [int(x) for x in res["transfers_in"]],
+        "extra_transfers": int(res["extra_transfers"]),
+        "final_bank_tenths": int(res["final_bank_tenths"]),
+        "objective": float(res["objective"]),
+        "starters": [int(x) for x in squad.loc[squad["is_starter"], "element_id"]],
+        "captain": int(squad.loc[squad["is_captain"], "element_id"].iloc[0]),
+        "status": res["stats"]["status"],
+        "seconds": time.perf_counter() - t0,
+    }
+
+def run_batch(
+    team_paths: Iterable[str],
+    out_path: str,
+    candidates: pd.DataFrame,
+    workers: int | None = None,
+    threads: int = 1,
+    max_extra_transfers: int = 3,
+    max_time: float = 25.0,
+) -> Dict[str, int]:
+    """Fan build_squad_with_transfers out over team files; stream results to out_path (JSONL)."""
+    global _POOL, _TEMPLATE
+    paths: List[str] = [str(p) for p in team_paths]
+    workers = workers or max(1, (os.cpu_count() or 1) // max(1, threads))
+    _POOL, _TEMPLATE = candidates, SquadTemplate(candidates)
+    ctx: BaseContext
+    if "fork" in mp.get_all_start_methods():
+        ctx, initargs = mp.get_context("fork"), (None,)
+    else:
+        ctx, initargs = mp.get_context("spawn"), (candidates,)
+
+    ok = failed = 0
+    with open(out_path, "a") as out, ProcessPoolExecutor(
+            max_workers=workers, mp_context=ctx, initializer=_init_worker, initargs=initargs) as pool:
+        futs = [pool.submit(_recommend, p, max_extra_transfers, threads, max_time) for p in paths]
+        for fut in as_completed(futs):
+            rec = fut.result()
+            out.write(json.dumps(rec) + "\n")
+            out.flush()
+            if "error" in rec:
+                failed += 1
+            else:
+                ok += 1
+    return {"ok": ok, "failed": failed}
+
+def load_candidates(offline: bool = False, as_of: str | None = None,
+                    weights_path: str = "configs/weights.yaml") -> pd.DataFrame:
+    bs, fx, bh, fh = load_payloads(offline, as_of, None)
+    return prepare(bs, fx, bh, fh, weights_path)["candidates"].reset_index(drop=True)
+
+def main(argv: List[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description="Batch weekly recommendations")
+    ap.add_argument("teams", nargs="+", help="my_team.json files")
+    ap.add_argument("--out", default="results.jsonl")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--threads", type=int, default=1, help="CP-SAT threads per worker")
+    ap.add_argument("--max-extra-transfers", type=int, default=3)
+    ap.add_argument("--max-time", type=float, default=25.0, help="Solver time limit per team (s)")
+    ap.add_argument("--offline", action="store_true")
+    ap.add_argument("--as-of", type=str, default=None)
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    cands = load_candidates(args.offline, args.as_of)
+    counts = run_batch(args.teams, args.out, cands, args.workers, args.threads,
+                       args.max_extra_transfers, args.max_time)
+    print(f"{counts['ok']} ok, {counts['failed']} failed in {time.perf_counter() - t0:.1f}s -> {Path(args.out)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,21 @@
 from __future__ import annotations
-import argparse, json, re
+import argparse, cProfile, json
 from pathlib import Path
 from typing import Dict, List, Tuple, Iterable
 
 from rich.console import Console
 from rich.table import Table
 
-from .fplio.api import get_bootstrap_static, get_fixtures
-from .fplio.normalize import players_table, teams_table, fixtures_table
-from .features.projections import project_next_gw
+from .features.horizon import project_horizon
+from .features.simulate import simulate_points
 from .optimize.model import build_squad, pick_xi_from_squad
-from .optimize.transfers import build_squad_with_transfers
+from .optimize.hints import greedy_squad, load_last_optimum, save_last_optimum
+from .optimize.planner import plan_transfers
+from .optimize.chips import plan_chips, squad_value_tenths
+from .optimize.stochastic import build_squad_stochastic
+from .utils import profiling
+from .ops import (apply_transfers, load_current_team, load_payloads, parse_accept_list,
+                  prepare, recommend)
 
 console = Console()
 
@@ -29,53 +34,11 @@ def _pretty_table(df, title: str) -> Table:
         )
     return t
 
-def _load_current_team(path_str: str) -> Dict:
-    p = Path(path_str)
-    if not p.exists() or p.stat().st_size == 0:
-        raise SystemExit(f"Current team file not found or empty: {p.resolve()}")
-    try:
-        cfg = json.loads(p.read_text())
-    except json.JSONDecodeError as e:
-        raise SystemExit(f"Invalid JSON in {p.resolve()}: {e}")
-    for key in ("element_ids","bank_tenths","free_transfers"):
-        if key not in cfg: raise SystemExit(f"Missing '{key}' in {p.resolve()}")
-    if not isinstance(cfg["element_ids"], list) or len(cfg["element_ids"]) != 15:
-        raise SystemExit(f"'element_ids' must be a list of 15 IDs in {p.resolve()}")
-    cfg["element_ids"] = [int(x) for x in cfg["element_ids"]]
-    cfg["bank_tenths"] = int(cfg["bank_tenths"])
-    cfg["free_transfers"] = int(cfg["free_transfers"])
-    cfg["purchases_tenths"] = {int(k): int(v) for k,v in cfg.get("purchases_tenths",{}).items()}
-    return cfg
-
-def _name_to_id_map(bootstrap: dict) -> Dict[str,int]:
-    lut = {}
-    for e in bootstrap["elements"]:
-        web = e["web_name"].lower()
-        full = f'{e["first_name"]} {e["second_name"]}'.lower()
-        lut[web] = e["id"]
-        lut[full] = e["id"]
-    return lut
-
-def _parse_accept_list(s: str|None, lut: Dict[str,int]) -> List[int]:
-    """Accept either 'id1;id2' or 'Name1; Name2'. Returns element_ids."""
-    if not s: return []
-    out: List[int] = []
-    for token in [x.strip() for x in s.split(";") if x.strip()]:
-        if re.fullmatch(r"\d+", token):
-            out.append(int(token))
-        else:
-            key = token.lower()
-            if key not in lut:
-                raise SystemExit(f"Could not resolve '{token}' to an element_id. Try full name or web_name.")
-            out.append(int(lut[key]))
-    return out
-
-def _sell_price_tenths(buy_t: int, now_t: int) -> int:
-    if now_t <= buy_t:
-        return now_t
-    prof = now_t - buy_t
-    realized = (prof // 20) * 5
-    return buy_t + int(realized)
+def _fmt_solve_stats(st: Dict) -> str:
+    first = st.get("time_to_first_feasible")
+    first_s = f"{first:.2f}s" if first is not None else "-"
+    return (f"[dim]Solver: {st['status'].lower()} in {st['wall_time']:.2f}s "
+            f"(first feasible {first_s}, hinted={st.get('hinted', False)})[/dim]")
 
 # ---------- main ops ----------
 
@@ -87,31 +50,38 @@ def run(
     accept_outs_raw: str | None,
     max_extra_transfers: int,
     export_current_team: str | None,
+    cache_max_age: float | None = None,
+    offline: bool = False,
+    as_of: str | None = None,
+    top_k: int = 5,
+    sell_candidates_raw: str | None = None,
+    plan_horizon: int = 0,
+    plan_budget: float = 60.0,
+    plan_chips_flag: bool = False,
+    risk: str | None = None,
+    risk_weight: float = 0.5,
+    risk_target: float | None = None,
+    n_scenarios: int = 5000,
 ):
     console.rule("[bold green]FPL Optimizer")
 
-    # Live data
-    bs = get_bootstrap_static()
-    fx = get_fixtures()
-    players = players_table(bs)
-    teams = teams_table(bs)
-    fixtures = fixtures_table(fx)
-    proj = project_next_gw(players, teams, fixtures, "configs/weights.yaml")
-    candidates = proj[proj["exp_minutes"] > 0].copy()
-
-    id_to_name = {int(r.element_id): str(r.web_name) for _, r in candidates.iterrows()}
-    name_lut   = _name_to_id_map(bs)
+    # Live data (or a stored snapshot)
+    bs, fx, bs_hash, fx_hash = load_payloads(offline, as_of, cache_max_age)
+    st = prepare(bs, fx, bs_hash, fx_hash)
+    players, fixtures, proj, candidates = st["players"], st["fixtures"], st["proj"], st["candidates"]
+    id_to_name, name_lut = st["id_to_name"], st["name_lut"]
 
     # 1) SHOW CURRENT TEAM + XI + EP
     if show_current:
         if not current_team_path:
             raise SystemExit("--show-current requires --current-team <file>")
-        cfg = _load_current_team(current_team_path)
+        cfg = load_current_team(current_team_path)
         df15 = candidates[candidates["element_id"].isin(cfg["element_ids"])].copy()
         if len(df15) != 15:
             missing = set(cfg["element_ids"]) - set(df15["element_id"].astype(int))
             console.print(f"[yellow]Warning:[/yellow] Missing from candidate pool (status/minutes=0?): {sorted(missing)}")
-        xi_df, xi_obj = pick_xi_from_squad(df15)
+        with profiling.stage("best_xi"):
+            xi_df, xi_obj = pick_xi_from_squad(df15)
         console.print(_pretty_table(xi_df[xi_df["is_starter"]], "Best XI (from your 15)"))
         console.print(_pretty_table(xi_df[~xi_df["is_starter"]], "Bench"))
         console.print(f"[bold]Projected GW score with your team:[/bold] {xi_obj:.2f}")
@@ -120,47 +90,10 @@ def run(
     # 2) APPLY SELECTED TRANSFERS (partial acceptance)
     if apply_path:
         # We expect you already ran a recommendation; but we can still apply against live prices now.
-        cfg = _load_current_team(apply_path)
-        accept_ins  = _parse_accept_list(accept_ins_raw, name_lut)
-        accept_outs = _parse_accept_list(accept_outs_raw, name_lut)
-
-        if not accept_ins and not accept_outs:
-            raise SystemExit("Use --accept-ins/--accept-outs with IDs or names to apply transfers.")
-
-        current = set(cfg["element_ids"])
-        # If only ins are given, infer outs as arbitrary players to make space (same positions ideally).
-        # Simple rule: pair outs with same-count as ins if user didn't specify outs.
-        if accept_ins and not accept_outs:
-            # Remove cheapest players first to free cash
-            have_df = candidates[candidates["element_id"].isin(current)].copy()
-            have_df = have_df.sort_values(["position","price"], ascending=[True, True])
-            accept_outs = [int(x) for x in have_df["element_id"].head(len(accept_ins)).tolist() if x not in accept_ins]
-
-        # Validate counts
-        new_ids = list(current - set(accept_outs)) + accept_ins
-        if len(new_ids) != 15:
-            raise SystemExit(f"Applying these changes would leave {len(new_ids)} players; need exactly 15.")
-
-        # Cash flow update
-        # Build now_cost map (tenths)
-        now_map = {int(r.element_id): int(round(r.price*10)) for _, r in candidates.iterrows()}
-        purchases = cfg.get("purchases_tenths", {})
-        raise_t = sum(_sell_price_tenths(int(purchases.get(pid, now_map.get(pid,0))), now_map.get(pid,0)) for pid in accept_outs)
-        spend_t = sum(now_map.get(pid, 0) for pid in accept_ins)
-        new_bank = cfg["bank_tenths"] + raise_t - spend_t
-        if new_bank < 0:
-            raise SystemExit(f"Insufficient funds: need {(-new_bank)/10:.1f} more. (Consider different outs/ins.)")
-
-        # Update purchases: keep old buys; add buys at current price
-        for pid in accept_ins:
-            purchases[str(pid)] = int(now_map.get(pid,0))
-
-        new_cfg = {
-            "element_ids": [int(x) for x in new_ids],
-            "bank_tenths": int(new_bank),
-            "free_transfers": 1,  # after applying, typically reset to 1 for next week
-            "purchases_tenths": purchases,
-        }
+        cfg = load_current_team(apply_path)
+        accept_ins  = parse_accept_list(accept_ins_raw, name_lut)
+        accept_outs = parse_accept_list(accept_outs_raw, name_lut)
+        new_cfg, accept_outs = apply_transfers(cfg, candidates, accept_ins, accept_outs)
         Path(apply_path).write_text(json.dumps(new_cfg, indent=2))
         ins_str  = ", ".join([f"{pid} ({id_to_name.get(pid, '?')})" for pid in accept_ins]) if accept_ins else "None"
         outs_str = ", ".join([f"{pid} ({id_to_name.get(pid, '?')})" for pid in accept_outs]) if accept_outs else "None"
@@ -170,7 +103,7 @@ def run(
 
     # 3) RECOMMEND TRANSFERS (weekly)
     if current_team_path:
-        cfg = _load_current_team(current_team_path)
+        cfg = load_current_team(current_team_path)
         current_ids = cfg["element_ids"]
         bank_tenths = cfg["bank_tenths"]
         free_transfers = cfg["free_transfers"]
@@ -181,20 +114,65 @@ def run(
         if missing:
             console.print(f"[yellow]Warning:[/yellow] Not in pool (status/minutes=0?): {missing}")
 
-        res = build_squad_with_transfers(
-            df=candidates,
-            current_ids=current_ids,
-            bank_tenths=bank_tenths,
-            purchases_tenths={int(k):int(v) for k,v in purchases.items()},
-            free_transfers=free_transfers,
-            max_extra_transfers=max_extra_transfers,
-            max_per_team=3,
+        if plan_chips_flag:
+            with profiling.stage("project_horizon"):
+                ep_h, gws = project_horizon(players, fixtures, weights_path="configs/weights.yaml")
+            budget = squad_value_tenths(players, current_ids, bank_tenths,
+                                        {int(k):int(v) for k,v in purchases.items()})
+            with profiling.stage("plan_chips"):
+                chips = plan_chips(players, ep_h, gws, current_ids, budget)
+            t = Table(title=f"Chip schedule (GW{gws[0]}-{gws[-1]})")
+            for col in ["chip","GW","gain"]:
+                t.add_column(col)
+            for item in chips["schedule"]:
+                t.add_row(item["chip"], str(item["gw"]), f"{item['gain']:+.2f}")
+            console.print(t)
+            console.print(f"[bold]Projected gain from chips:[/bold] {chips['total_gain']:.2f}")
+            return
+
+        if plan_horizon > 0:
+            gone = sorted(set(current_ids) - set(players["element_id"].astype(int)))
+            if gone:
+                raise SystemExit(f"--plan-horizon needs all 15 owned players in the game data; missing: {gone}")
+            with profiling.stage("project_horizon"):
+                ep_h, gws = project_horizon(players, fixtures, n_gw=plan_horizon, weights_path="configs/weights.yaml")
+            with profiling.stage("plan_transfers"):
+                plan = plan_transfers(
+                    players, ep_h, gws, current_ids, bank_tenths,
+                    purchases_tenths={int(k):int(v) for k,v in purchases.items()},
+                    free_transfers=free_transfers, horizon=plan_horizon, time_budget=plan_budget,
+                )
+            t = Table(title=f"{plan_horizon}-week transfer plan")
+            for col in ["GW","FT","out","in","hits","bank","points"]:
+                t.add_column(col)
+            name = lambda ids: ", ".join(id_to_name.get(pid, str(pid)) for pid in ids) or "-"
+            for w in plan["weeks"]:
+                t.add_row(str(w["gw"]), str(w["free_transfers"]), name(w["transfers_out"]),
+                          name(w["transfers_in"]), str(w["hits"]), f"£{w['bank_tenths']/10:.1f}",
+                          f"{w['points']:.2f}")
+            console.print(t)
+            console.print(f"[bold]Projected points over the plan (net of hits):[/bold] {plan['total_points']:.2f}")
+            return
+
+        # Exact 0-2 transfer ranking (fast); its best move also seeds CP-SAT.
+        fmt = lambda ids: ", ".join(f"{pid} ({id_to_name.get(pid,'?')})" for pid in ids) if ids else "None"
+        ranked, res = recommend(
+            proj, candidates, cfg, max_extra_transfers, top_k,
+            sell_candidates=parse_accept_list(sell_candidates_raw, name_lut) if sell_candidates_raw else None,
         )
+        if top_k > 0 and ranked is not None:
+            t = Table(title=f"Top {len(ranked)} moves (0-2 transfers)")
+            for col in ["out","in","hits","net","gain","bank"]:
+                t.add_column(col)
+            for _, r in ranked.iterrows():
+                t.add_row(fmt(r.transfers_out), fmt(r.transfers_in), str(r.hits),
+                          f"{r.net:.2f}", f"{r.gain:+.2f}", f"£{r.bank_after/10:.1f}")
+            console.print(t)
+
         squad = res["squad"]
         starters = squad[squad["is_starter"]]
         bench = squad[~squad["is_starter"]]
 
-        fmt = lambda ids: ", ".join(f"{pid} ({id_to_name.get(pid,'?')})" for pid in ids) if ids else "None"
         console.print(f"[bold]Transfers out ({res['transfers_out_count']}):[/bold] {fmt(res['transfers_out'])}")
         console.print(f"[bold]Transfers in:[/bold]  {fmt(res['transfers_in'])}")
         console.print(f"[bold]Extra transfers (hits):[/bold] {res['extra_transfers']} → penalty = {4*res['extra_transfers']} pts")
@@ -202,34 +180,58 @@ def run(
         console.print(_pretty_table(starters, "Starting XI (post-transfers)"))
         console.print(_pretty_table(bench, "Bench"))
         console.print(f"[bold]Projected GW score (net of hits):[/bold] {res['objective']:.2f}")
+        console.print(_fmt_solve_stats(res["stats"]))
+        save_last_optimum(squad["element_id"])
         console.print("\nTo apply some/all of these, run:")
         console.print("  python -m fpl_opt.cli --apply my_team.json --accept-ins \"Name1; Name2\" --accept-outs \"NameA; NameB\"")
         return
 
     # 4) FRESH-SQUAD (GW1) + auto-save my_team.json
     budget_tenths = 1000
-    squad, projected = build_squad(candidates, budget_tenths=budget_tenths, max_per_team=3)
+    with profiling.stage("hint"):
+        hint = load_last_optimum() or greedy_squad(candidates, budget_tenths, max_per_team=3)
+    if risk:
+        with profiling.stage("simulate"):
+            scenarios, _ = simulate_points(candidates, n_scenarios=n_scenarios, keep=True)
+            assert scenarios is not None
+        with profiling.stage("optimize"):
+            # warm-started from the scenario-mean optimum rather than `hint`
+            squad, projected = build_squad_stochastic(candidates, scenarios, budget_tenths=budget_tenths,
+                                                      max_per_team=3, risk=risk, risk_weight=risk_weight,
+                                                      target=risk_target)
+    else:
+        with profiling.stage("optimize"):
+            squad, projected = build_squad(candidates, budget_tenths=budget_tenths, max_per_team=3, hint_ids=hint)
     starters = squad[squad["is_starter"]]
     bench = squad[~squad["is_starter"]]
     console.print(_pretty_table(starters, "Starting XI"))
     console.print(_pretty_table(bench, "Bench"))
-    console.print(f"[bold]Projected GW score:[/bold] {projected:.2f}")
+    if risk:
+        r = squad.attrs["risk"]
+        line = f"mean {r['mean']:.2f}, CVaR(worst 20%) {r['cvar']:.2f}"
+        if "p_target" in r:
+            line += f", P(>= {risk_target:g}) {r['p_target']:.1%}"
+        console.print(f"[bold]Risk objective ({risk}):[/bold] {r['objective']:.3f}  [dim]XI over {r['scenarios']} scenarios: {line}[/dim]")
+    else:
+        console.print(f"[bold]Projected GW score:[/bold] {projected:.2f}")
+    console.print(_fmt_solve_stats(squad.attrs["solve_stats"]))
+    save_last_optimum(squad["element_id"])
 
     out_path = Path(export_current_team) if export_current_team else Path("my_team.json")
     element_ids = [int(x) for x in squad["element_id"].tolist()]
-    total_cost_t = int(round(squad["price"].sum() * 10))
+    total_cost_t = int(squad["price_tenths"].astype(int).sum())
     bank_t = max(0, budget_tenths - total_cost_t)
     team_blob = {
         "element_ids": element_ids,
         "bank_tenths": bank_t,
         "free_transfers": 1,
-        "purchases_tenths": {str(pid): int(round(price*10)) for pid, price in zip(squad["element_id"], squad["price"])},
+        "purchases_tenths": {str(pid): int(t) for pid, t in zip(squad["element_id"], squad["price_tenths"])},
     }
     out_path.write_text(json.dumps(team_blob, indent=2))
     console.print(f"[bold green]Saved optimal GW1 squad to:[/bold green] {out_path} (bank £{bank_t/10:.1f})")
 
 
-if __name__ == "__main__":
+def main(argv: List[str] | None = None) -> None:
     p = argparse.ArgumentParser(description="FPL Weekly Optimizer")
     p.add_argument("--current-team", type=str, default=None, help="Path to my_team.json (to recommend transfers)")
     p.add_argument("--show-current", action="store_true", help="Show your current team, best XI & projected points")
@@ -238,8 +240,53 @@ if __name__ == "__main__":
     p.add_argument("--accept-outs", type=str, default=None, help="Names or IDs to sell (semicolon-separated)")
     p.add_argument("--max-extra-transfers", type=int, default=3, help="Cap extra transfers (each costs -4)")
     p.add_argument("--export-current-team", type=str, default=None, help="When building fresh squad, save JSON here")
-    args = p.parse_args()
+    p.add_argument("--cache-max-age", type=float, default=None, help="Seconds a cached API response is reused without revalidating (0 = always revalidate)")
+    p.add_argument("--offline", action="store_true", help="Use the newest stored snapshot instead of the live API")
+    p.add_argument("--as-of", type=str, default=None, help="Use the stored snapshot at/before this UTC timestamp (YYYYMMDDTHHMMSSZ); implies --offline")
+    p.add_argument("--sell-candidates", type=str, default=None, help="Only these owned players (names or IDs, semicolon-separated) may be sold")
+    p.add_argument("--plan-horizon", type=int, default=0, help="Plan transfers over this many GWs (3-8) instead of one")
+    p.add_argument("--plan-budget", type=float, default=60.0, help="Time budget in seconds for --plan-horizon")
+    p.add_argument("--plan-chips", action="store_true", help="Schedule wildcard / free hit / bench boost / triple captain for the rest of the season")
+    p.add_argument("--risk", choices=["cvar", "target"], default=None, help="Fresh squad: optimize simulated points with a risk term instead of ep_next")
+    p.add_argument("--risk-weight", type=float, default=0.5, help="Weight of CVaR(worst 20%%) vs the mean for --risk cvar")
+    p.add_argument("--target", type=float, default=None, help="XI score to beat for --risk target")
+    p.add_argument("--scenarios", type=int, default=5000, help="Simulated scenarios for --risk (reduced to 200 representatives)")
+    p.add_argument("--top-k", type=int, default=5, help="Show the K best 0-2 transfer moves (0 to hide)")
+    p.add_argument("--profile", action="store_true", help="Print per-stage wall/CPU/peak-memory timings and solver stats")
+    p.add_argument("--pstats", type=str, default=None, help="Also dump a cProfile stats file here (implies --profile)")
+    p.add_argument("--trace", type=str, default=None, help="Also write a Chrome trace-event JSON here (implies --profile)")
+    args = p.parse_args(argv)
+    if args.risk == "target" and args.target is None:
+        p.error("--risk target requires --target")
+
+    if args.profile or args.pstats or args.trace:
+        _profiled_run(args)
+    else:
+        _run_args(args)
+
+def _profiled_run(args) -> None:
+    prof = profiling.activate()
+    cprof = cProfile.Profile() if args.pstats else None
+    try:
+        if cprof:
+            cprof.enable()
+        with prof.stage("run"):
+            _run_args(args)
+    finally:
+        if cprof:
+            cprof.disable()
+            cprof.dump_stats(args.pstats)
+        profiling.deactivate()
+        console.print(prof.summary())
+        solver_table = prof.solver_summary()
+        if solver_table is not None:
+            console.print(solver_table)
+        if args.trace:
+            prof.write_trace(args.trace)
+        for path in filter(None, [args.pstats, args.trace]):
+            console.print(f"[dim]Wrote {path}[/dim]")
 
+def _run_args(args) -> None:
     run(
         current_team_path=args.current_team,
         show_current=args.show_current,
@@ -248,4 +295,20 @@ if __name__ == "__main__":
         accept_outs_raw=args.accept_outs,
         max_extra_transfers=args.max_extra_transfers,
         export_current_team=args.export_current_team,
+        cache_max_age=args.cache_max_age,
+        offline=args.offline,
+        as_of=args.as_of,
+        top_k=args.top_k,
+        sell_candidates_raw=args.sell_candidates,
+        plan_horizon=args.plan_horizon,
+        plan_budget=args.plan_budget,
+        plan_chips_flag=args.plan_chips,
+        risk=args.risk,
+        risk_weight=args.risk_weight,
+        risk_target=args.target,
+        n_scenarios=args.scenarios,
     )
+
+
+if __name__ == "__main__":
+    main()
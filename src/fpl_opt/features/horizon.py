@@ -0,0 +1,60 @@
+"""Players x gameweeks projection matrix.
+
+Every fixture a team plays in a gameweek contributes, so doubles count twice
+and blanks are zero. Built with scatter-adds over the fixture list; the only
+per-player work is one outer product.
+"""
+from __future__ import annotations
+from typing import Any, Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .projections import int_lookup, load_yaml, player_rates
+
+
+def team_gw_tables(fixtures: pd.DataFrame, gws: np.ndarray, fixture_bump: Dict[int, float],
+                   n_teams: int) -> Tuple[np.ndarray, np.ndarray]:
+    """(mult_sum, count): teams x GWs sums of fixture multipliers and fixture counts.
+    Row index is the team id (row 0 unused)."""
+    fx = fixtures.dropna(subset=["event"])
+    ev = fx["event"].to_numpy(np.int64)
+    inside = (ev >= gws[0]) & (ev <= gws[-1])
+    fx, col = fx[inside], ev[inside] - gws[0]
+
+    teams = np.concatenate([fx["team_h"].to_numpy(np.int64), fx["team_a"].to_numpy(np.int64)])
+    cols = np.concatenate([col, col])
+    diffs = np.concatenate([fx["team_h_difficulty"].to_numpy(), fx["team_a_difficulty"].to_numpy()])
+    mult = int_lookup(diffs, fixture_bump, 1.0)
+
+    mult_sum = np.zeros((n_teams + 1, len(gws)), dtype=np.float32)
+    count = np.zeros((n_teams + 1, len(gws)), dtype=np.float32)
+    np.add.at(mult_sum, (teams, cols), mult)
+    np.add.at(count, (teams, cols), 1.0)
+    return mult_sum, count
+
+def project_horizon(players: pd.DataFrame, fixtures: pd.DataFrame,
+                    start_gw: int | None = None, n_gw: int | None = None,
+                    weights_path: str = "configs/weights.yaml",
+                    weights: Dict[str, Any] | None = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Expected points per player (rows aligned with `players`) per GW.
+
+    Returns (matrix float32 [n_players, n_gw], gws int array). start_gw defaults to
+    the earliest scheduled event; n_gw defaults to running through the last one.
+    """
+    weights = weights if weights is not None else load_yaml(weights_path)
+    events = fixtures["event"].dropna().astype(int)
+    if start_gw is None:
+        start_gw = int(events.min()) if len(events) else 1
+    if n_gw is None:
+        n_gw = max(1, (int(events.max()) if len(events) else start_gw) - start_gw + 1)
+    gws = np.arange(start_gw, start_gw + n_gw)
+
+    team = players["team"].to_numpy(np.int64)
+    n_teams = int(max(team.max(initial=0), fixtures["team_h"].max(), fixtures["team_a"].max()))
+    mult_sum, count = team_gw_tables(fixtures, gws, weights["fixture_bump"], n_teams)
+
+    exp_minutes, per_min_est, pos_bias = player_rates(players, weights)
+    rate = exp_minutes * per_min_est
+    matrix = rate[:, None] * mult_sum[team] + pos_bias[:, None] * count[team]
+    return matrix.astype(np.float32, copy=False), gws
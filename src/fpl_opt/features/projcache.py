@@ -0,0 +1,74 @@
+"""On-disk memo of project_next_gw results, keyed by input fingerprints.
+
+The key is a hash of the bootstrap and fixtures snapshot hashes, the weights
+file bytes and PROJ_SCHEMA. Identical inputs give the identical projection,
+so a hit skips projecting entirely. Entries are tablecache column directories
+under `root`. Reads refresh an entry's mtime, and writes evict the least
+recently used entries once the total size passes `max_bytes`. `hits` and
+`misses` count lookups made through this instance.
+"""
+from __future__ import annotations
+import hashlib, os, pathlib, threading
+from typing import Any, Callable, Dict
+
+import pandas as pd
+
+from ..fplio.tablecache import load_table, save_table
+from ..utils.lru import cache_entries, evict_lru
+
+PROJ_DIR = pathlib.Path("data/cache/projections")
+PROJ_SCHEMA = 1  # bump when project_next_gw's output changes for the same inputs
+MAX_BYTES = 256 * 2**20
+
+
+def fingerprint(bootstrap_hash: str, fixtures_hash: str, weights: bytes) -> str:
+    h = hashlib.sha256(f"v{PROJ_SCHEMA}:{bootstrap_hash}:{fixtures_hash}:".encode())
+    h.update(weights)
+    return h.hexdigest()[:32]
+
+
+class ProjectionCache:
+    def __init__(self, root: str | pathlib.Path | None = None, max_bytes: int = MAX_BYTES):
+        self.root = pathlib.Path(root or PROJ_DIR)
+        self.max_bytes = int(max_bytes)
+        self.hits = self.misses = self.evictions = 0
+        self._lock = threading.Lock()  # counters and eviction, for the threaded daemon
+
+    def _path(self, key: str) -> pathlib.Path:
+        return self.root / key
+
+    def get(self, key: str) -> pd.DataFrame | None:
+        meta = self._path(key) / "meta.json"
+        try:
+            df = load_table(self._path(key), mmap=False)
+            os.utime(meta)  # LRU clock
+        except (FileNotFoundError, ValueError, KeyError):  # absent, or evicted/rewritten mid-read
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return df
+
+    def put(self, key: str, df: pd.DataFrame) -> None:
+        save_table(df, self._path(key))
+        self.evict(keep=key)
+
+    def get_or_build(self, key: str, build: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+        df = self.get(key)
+        if df is None:
+            df = build()
+            self.put(key, df)
+        return df
+
+    def evict(self, keep: str | None = None) -> int:
+        """Drop least recently used entries until the cache fits max_bytes."""
+        with self._lock:
+            n = evict_lru(self.root, self.max_bytes, () if keep is None else (keep,))
+            self.evictions += n
+            return n
+
+    def stats(self) -> Dict[str, Any]:
+        entries = cache_entries(self.root)
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "entries": len(entries), "bytes": sum(e[2] for e in entries)}
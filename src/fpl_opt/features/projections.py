@@ -1,46 +1,98 @@
 from __future__ import annotations
 import yaml
+import numpy as np
 import pandas as pd
-from typing import Dict, Any
+from typing import Dict, Any, Mapping
 
 def load_yaml(path: str) -> Dict[str, Any]:
     with open(path, "r") as f:
         return yaml.safe_load(f)
 
-def project_next_gw(players: pd.DataFrame, teams: pd.DataFrame, fixtures: pd.DataFrame,
-                    weights_path: str = "configs/weights.yaml") -> pd.DataFrame:
-    weights = load_yaml(weights_path)
+def next_fixture_difficulty(fixtures: pd.DataFrame) -> pd.Series:
+    """Difficulty of each team's first scheduled fixture, indexed by team id."""
+    fx = fixtures.dropna(subset=["event"])
+    sides = pd.concat([
+        pd.DataFrame({"event": fx["event"], "fixture_id": fx["fixture_id"],
+                      "team": fx["team_h"], "diff": fx["team_h_difficulty"]}),
+        pd.DataFrame({"event": fx["event"], "fixture_id": fx["fixture_id"],
+                      "team": fx["team_a"], "diff": fx["team_a_difficulty"]}),
+    ], ignore_index=True)
+    first = sides.sort_values(["event", "fixture_id"], kind="stable").groupby("team", sort=False)["diff"].first()
+    return first
 
-    next_fx = (fixtures.sort_values(["event","fixture_id"]).dropna(subset=["event"]))
-    team_diff = {}
-    for _, row in next_fx.iterrows():
-        team_diff.setdefault(row["team_h"], row["team_h_difficulty"])
-        team_diff.setdefault(row["team_a"], row["team_a_difficulty"])
+def int_lookup(values: np.ndarray, table: Mapping[int, float], default: float) -> np.ndarray:
+    """Vectorized `table.get(v, default)` for small non-negative ints."""
+    values = np.asarray(values, dtype=np.int64)
+    size = max([int(k) for k in table] + [int(values.max(initial=0))]) + 1
+    lut = np.full(size, default, dtype=np.float32)
+    for k, v in table.items():
+        if int(k) >= 0:
+            lut[int(k)] = v
+    return lut[values]
 
-    df = players.copy()
-    df["fixture_diff"] = df["team"].map(team_diff).fillna(3).astype(int)
+def category_lookup(s: pd.Series, table: Mapping[str, float], default: float) -> np.ndarray:
+    """Vectorized `table.get(label, default)` over a (categorical) label column."""
+    cat = s if isinstance(s.dtype, pd.CategoricalDtype) else s.astype("category")
+    lut = np.array([float(table.get(c, default)) for c in cat.cat.categories] + [default],
+                   dtype=np.float32)
+    return lut[cat.cat.codes.to_numpy()]  # code -1 (missing) hits the trailing default
 
-    fixture_bump = weights["fixture_bump"]
-    df["fixture_mult"] = df["fixture_diff"].map(lambda d: float(fixture_bump.get(int(d), 1.0)))
+def _lut_rows(tables, keys, default: float) -> np.ndarray:
+    """[len(tables), len(keys) + 1] float32: row w is tables[w] looked up at keys, plus a trailing default."""
+    return np.array([[float(t.get(k, default)) for k in keys] + [default] for t in tables], dtype=np.float32)
 
-    status_minutes = weights["status_minutes"]
-    df["exp_minutes"] = df["status"].map(lambda s: float(status_minutes.get(s, 0)))
+def _rates(df: pd.DataFrame, weight_sets) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """player_rates for many weight dicts: three float32 [W, P] matrices."""
+    status = df["status"].astype("category")
+    minutes = _lut_rows([w["status_minutes"] for w in weight_sets], status.cat.categories, 0.0)
+    pos = df["position"].astype("category")
+    bias = _lut_rows([w["position_bps_bias"] for w in weight_sets], pos.cat.categories, 0.0)
+    w_ppg = np.array([float(w.get("ppg_weight", 0.7)) for w in weight_sets], dtype=np.float32)[:, None]
+    w_form = np.array([float(w.get("form_weight", 0.3)) for w in weight_sets], dtype=np.float32)[:, None]
+    # Convert appearance-based numbers to per-minute-ish signal
+    ppg = df["points_per_game"].to_numpy(np.float32)
+    form = df["form"].to_numpy(np.float32)
+    per_min_est = w_ppg * (ppg / 75.0) + w_form * (form / 75.0)
+    # code -1 (missing) hits the trailing default
+    return minutes[:, status.cat.codes.to_numpy()], per_min_est, bias[:, pos.cat.codes.to_numpy()]
 
+def player_rates(df: pd.DataFrame, weights: Dict[str, Any]):
+    """Fixture-independent parts of the projection as float32 arrays:
+    (exp_minutes, per_min_est, pos_bias)."""
+    exp_minutes, per_min_est, pos_bias = _rates(df, [weights])
+    return exp_minutes[0], per_min_est[0], pos_bias[0]
 
-# New (keeps it config-driven via two optional weights):
-    df["ppg"]  = pd.to_numeric(df.get("points_per_game"), errors="coerce").fillna(0.0)
-    df["form"] = pd.to_numeric(df.get("form"), errors="coerce").fillna(0.0)
+def project_next_gw(players: pd.DataFrame, teams: pd.DataFrame, fixtures: pd.DataFrame,
+                    weights_path: str = "configs/weights.yaml",
+                    weights: Dict[str, Any] | None = None) -> pd.DataFrame:
+    weights = weights if weights is not None else load_yaml(weights_path)
+    frame, ep, exp_minutes = project_weight_sets(players, teams, fixtures, [weights])
+    df = frame.assign(exp_minutes=exp_minutes[0], ep_next=ep[0])
+    keep = ["element_id","web_name","team","position","price","price_tenths","status",
+            "chance_of_playing_next_round","fixture_diff","exp_minutes","ppg","ep_next"]
+    return df[keep].sort_values("ep_next", ascending=False).reset_index(drop=True)
 
-    w_ppg  = float(weights.get("ppg_weight", 0.7))
-    w_form = float(weights.get("form_weight", 0.3))
-    # Convert appearance-based numbers to per-minute-ish signal
-    df["per_min_est"] = (w_ppg * (df["ppg"] / 75.0)) + (w_form * (df["form"] / 75.0))
+def project_weight_sets(players: pd.DataFrame, teams: pd.DataFrame, fixtures: pd.DataFrame,
+                        weight_sets) -> tuple[pd.DataFrame, np.ndarray, np.ndarray]:
+    """The projection for many weight dicts in one pass (project_next_gw is the
+    single-set case).
 
-    pos_bias = weights["position_bps_bias"]
-    df["pos_bias"] = df["position"].map(pos_bias).fillna(0)
+    Returns (frame, ep [W, P], exp_minutes [W, P]): frame holds the
+    weight-independent columns in `players` order; row w of the float32
+    matrices is what project_next_gw(weights=weight_sets[w]) gives those rows.
+    """
+    weight_sets = list(weight_sets)
+    team_diff = next_fixture_difficulty(fixtures)
+    df = players.copy()
+    df["fixture_diff"] = df["team"].map(team_diff).fillna(3).astype(int)
+    df["ppg"] = df["points_per_game"]
 
-    df["ep_next"] = (df["exp_minutes"] * df["per_min_est"] * df["fixture_mult"]) + df["pos_bias"]
+    diff = df["fixture_diff"].to_numpy(np.int64)
+    n_diff = max([int(k) for w in weight_sets for k in w["fixture_bump"]] + [int(diff.max(initial=0))]) + 1
+    bump = _lut_rows([{int(k): v for k, v in w["fixture_bump"].items()} for w in weight_sets], range(n_diff), 1.0)
+    exp_minutes, per_min_est, pos_bias = _rates(df, weight_sets)
+    ep = exp_minutes * per_min_est * bump[:, diff] + pos_bias
 
-    keep = ["element_id","web_name","team","position","price","status",
-            "chance_of_playing_next_round","fixture_diff","exp_minutes","ppg","ep_next"]
-    return df[keep].sort_values("ep_next", ascending=False).reset_index(drop=True)
+    keep = ["element_id", "web_name", "team", "position", "price", "price_tenths", "status",
+            "chance_of_playing_next_round", "fixture_diff", "ppg"]
+    return df[keep].reset_index(drop=True), ep, exp_minutes
@@ -0,0 +1,165 @@
+"""Monte Carlo next-GW points for the candidate pool.
+
+Each player's `ep_next` is split into appearance, clean-sheet and attacking
+points. Per scenario:
+- minutes: 60+ / cameo / no appearance from exp_minutes;
+- team shocks: one lognormal attack and one defence factor (mean 1) per
+  team, shared by teammates, so their points are correlated;
+- clean sheet: one draw per team, P = exp(-concede rate x defence shock);
+- goals, assists and other 1-pt events (saves, bonus): Poisson counts
+  drawn by inverting the CDF of one uniform per cell, with goal/assist
+  rates scaled by the attack shock.
+Rates are calibrated so a player's mean matches ep_next whenever ep_next
+exceeds their appearance + clean-sheet baseline.
+
+Scenarios are generated in fixed-size chunks (each with its own spawned RNG
+stream), so peak working memory is a few chunk-sized arrays regardless of N.
+Points are integers, so per-player histograms accumulated over the chunks give
+exact quantiles without sorting the full matrix.
+"""
+from __future__ import annotations
+from typing import Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .projections import category_lookup, int_lookup
+
+GOAL_PTS = {"GK": 6, "DEF": 6, "MID": 5, "FWD": 4}
+CS_PTS = {"GK": 4, "DEF": 4, "MID": 1, "FWD": 0}
+# How attacking points (ep_next minus appearance and clean-sheet points) split
+# into goals / assists / other 1-pt events.
+GOAL_SHARE = {"GK": 0.0, "DEF": 0.35, "MID": 0.45, "FWD": 0.6}
+ASSIST_SHARE = {"GK": 0.1, "DEF": 0.35, "MID": 0.4, "FWD": 0.3}
+CONCEDE_RATE = {1: 0.7, 2: 0.9, 3: 1.15, 4: 1.4, 5: 1.7}  # by fixture difficulty
+FULL_SHARE = 0.9       # share of appearances that reach 60 minutes
+CAMEO_ATTACK = 0.3     # attacking output of a cameo relative to a full game
+MAX_POINTS = 40        # histogram cap for quantiles (means/stds use exact sums)
+
+_ATTACK_FACTOR = np.array([0.0, CAMEO_ATTACK, 1.0], dtype=np.float32)  # by minutes state
+
+
+def _poisson(u: np.ndarray, lam: np.ndarray, kmax: int = 40) -> np.ndarray:
+    """Poisson(lam) counts from uniforms u, by CDF inversion.
+
+    Only cells still above the CDF are iterated: they are compacted after the
+    zero-count check and then every few steps, so the work shrinks quickly
+    when rates are small."""
+    shape = u.shape
+    out = np.zeros(u.size, dtype=np.float32)
+    p = np.exp(-lam).ravel()
+    idx = np.flatnonzero(u.ravel() > p)
+    u, lam, p = u.ravel()[idx], lam.ravel()[idx], p[idx]
+    cdf, k = p.copy(), np.ones(len(idx), dtype=np.float32)
+    for j in range(1, kmax):
+        if not len(idx):
+            break
+        p *= lam
+        p *= np.float32(1.0 / j)
+        cdf += p
+        more = u > cdf
+        k += more
+        if j % 4 == 0:
+            out[idx] = k
+            idx, u, lam, p, cdf, k = idx[more], u[more], lam[more], p[more], cdf[more], k[more]
+    out[idx] = k
+    return out.reshape(shape)
+
+def _lognormal_mean1(rng: np.random.Generator, sigma: float, shape) -> np.ndarray:
+    return np.exp(rng.standard_normal(shape, dtype=np.float32) * np.float32(sigma)
+                  - np.float32(sigma * sigma / 2))
+
+def player_params(proj: pd.DataFrame, defence_sigma: float = 0.35) -> dict:
+    """Per-player probabilities and rates (float32 arrays) calibrated to ep_next."""
+    play = np.clip(proj["exp_minutes"].to_numpy(np.float32) / 90.0, 0.0, 1.0)
+    p_full, p_cameo = play * FULL_SHARE, play * (1 - FULL_SHARE)
+    concede = int_lookup(proj["fixture_diff"].to_numpy(), CONCEDE_RATE, CONCEDE_RATE[3])
+
+    # E[exp(-concede * D)] over the defence shock, by Gauss-Hermite quadrature
+    z, w = np.polynomial.hermite_e.hermegauss(24)
+    shock = np.exp(z * defence_sigma - defence_sigma ** 2 / 2)
+    p_cs = (np.exp(-concede[:, None] * shock[None, :]) @ (w / w.sum())).astype(np.float32)
+
+    cs_pts = category_lookup(proj["position"], CS_PTS, 0.0)
+    goal_pts = category_lookup(proj["position"], GOAL_PTS, 4.0)
+    base = 2 * p_full + p_cameo + cs_pts * p_full * p_cs
+    games = p_full + CAMEO_ATTACK * p_cameo
+    attack = np.where(games > 0, np.maximum(proj["ep_next"].to_numpy(np.float32) - base, 0.0)
+                      / np.maximum(games, 1e-6), 0.0).astype(np.float32)  # attacking points per full game
+    goal_share = category_lookup(proj["position"], GOAL_SHARE, 0.0)
+    assist_share = category_lookup(proj["position"], ASSIST_SHARE, 0.0)
+    return {
+        "p_full": p_full, "p_play": play, "concede": concede, "cs_pts": cs_pts,
+        "goal_pts": goal_pts, "goal_rate": attack * goal_share / goal_pts,
+        "assist_rate": attack * assist_share / 3.0,
+        "other_rate": attack * (1 - goal_share - assist_share),
+    }
+
+def _chunk(rng: np.random.Generator, prm: dict, team: np.ndarray, n_teams: int, size: int,
+           attack_sigma: float, defence_sigma: float) -> np.ndarray:
+    shape = (size, len(team))
+    att = _lognormal_mean1(rng, attack_sigma, (size, n_teams))[:, team]
+    dfn = _lognormal_mean1(rng, defence_sigma, (size, n_teams))[:, team]
+    cs = rng.random((size, n_teams), dtype=np.float32)[:, team] < np.exp(-prm["concede"] * dfn)
+
+    # state 2 = 60+ minutes, 1 = cameo, 0 = no appearance; equals the appearance points
+    u = rng.random(shape, dtype=np.float32)
+    state = (u < prm["p_full"]).view(np.int8) + (u < prm["p_play"]).view(np.int8)
+    factor = _ATTACK_FACTOR[state]
+    pts = state.astype(np.float32)
+    pts += prm["cs_pts"] * (cs & (state == 2))
+    rate = factor * att
+    pts += prm["goal_pts"] * _poisson(rng.random(shape, dtype=np.float32), prm["goal_rate"] * rate)
+    pts += 3 * _poisson(rng.random(shape, dtype=np.float32), prm["assist_rate"] * rate)
+    pts += _poisson(rng.random(shape, dtype=np.float32), prm["other_rate"] * factor)
+    return pts
+
+def simulate_points(proj: pd.DataFrame, n_scenarios: int = 10_000, seed: int = 0,
+                    chunk: int = 512, attack_sigma: float = 0.35, defence_sigma: float = 0.35,
+                    keep: bool = True,
+                    quantiles: Sequence[float] = (0.05, 0.25, 0.5, 0.75, 0.95),
+                    haul: int = 10) -> Tuple[np.ndarray | None, pd.DataFrame]:
+    """Draw n_scenarios of next-GW points for every row of `proj` (project_next_gw output).
+
+    Returns (scenarios float32 [n_scenarios, n_players] or None if keep=False,
+    summary DataFrame per player: element_id, ep_next, mean, std, q.., p_haul
+    (P(points >= haul)) and p_blank (P(points <= 2))).
+    """
+    prm = player_params(proj, defence_sigma)
+    # Players who can't appear always score 0; simulate only the others
+    active = np.flatnonzero(prm["p_play"] > 0)
+    prm = {k: v[active] for k, v in prm.items()}
+    uniq, team = np.unique(proj["team"].to_numpy(np.int64)[active], return_inverse=True)
+    n = len(proj)
+    out = np.empty((n_scenarios, n), dtype=np.float32) if keep else None
+    hist = np.zeros(n * (MAX_POINTS + 1), dtype=np.int64)
+    offsets = np.arange(n, dtype=np.int32) * (MAX_POINTS + 1)
+    total, total_sq = np.zeros(n), np.zeros(n)
+
+    starts = range(0, n_scenarios, chunk)
+    for start, ss in zip(starts, np.random.SeedSequence(seed).spawn(len(starts))):
+        size = min(chunk, n_scenarios - start)
+        pts = np.zeros((size, n), dtype=np.float32)
+        pts[:, active] = _chunk(np.random.default_rng(ss), prm, team, len(uniq), size,
+                                attack_sigma, defence_sigma)
+        if out is not None:
+            out[start:start + size] = pts
+        total += pts.sum(axis=0, dtype=np.float64)
+        total_sq += np.square(pts, dtype=np.float64).sum(axis=0)
+        cells = np.minimum(pts, MAX_POINTS).astype(np.int32) + offsets
+        hist += np.bincount(cells.ravel(), minlength=len(hist))
+
+    prob = hist.reshape(n, MAX_POINTS + 1) / max(n_scenarios, 1)
+    mean = total / max(n_scenarios, 1)
+    cdf = np.cumsum(prob, axis=1)
+    summary = pd.DataFrame({
+        "element_id": proj["element_id"].to_numpy(),
+        "ep_next": proj["ep_next"].to_numpy(np.float32),
+        "mean": mean.astype(np.float32),
+        "std": np.sqrt(np.maximum(total_sq / max(n_scenarios, 1) - mean ** 2, 0)).astype(np.float32),
+    })
+    for q in quantiles:
+        summary[f"q{round(q * 100):02d}"] = (cdf < q - 1e-12).sum(axis=1).astype(np.int16)
+    summary["p_haul"] = (1 - cdf[:, haul - 1]).astype(np.float32)
+    summary["p_blank"] = cdf[:, 2].astype(np.float32)
+    return out, summary
@@ -1,26 +1,27 @@
-import json, pathlib
-from datetime import datetime, timezone
-import requests
-
-BASE = "https://fantasy.premierleague.com/api"
-RAW_DIR = pathlib.Path("data/raw")
+from .client import BASE, get_client
+from .store import RAW_DIR, SnapshotStore
 
 def _save_json(name, payload):
-    RAW_DIR.mkdir(parents=True, exist_ok=True)
-    ts = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
-    path = RAW_DIR / f"{name}_{ts}.json"
-    path.write_text(json.dumps(payload, indent=2))
+    return SnapshotStore(RAW_DIR).put(name, payload)
 
-def get_bootstrap_static(save=True):
-    r = requests.get(f"{BASE}/bootstrap-static/")
-    r.raise_for_status()
-    data = r.json()
+def get_bootstrap_static(save=True, max_age=None, client=None):
+    data, _ = (client or get_client()).get_json("/bootstrap-static/", max_age)
     if save: _save_json("bootstrap_static", data)
     return data
 
-def get_fixtures(save=True):
-    r = requests.get(f"{BASE}/fixtures/?future=1")
-    r.raise_for_status()
-    data = r.json()
+def get_fixtures(save=True, max_age=None, client=None):
+    data, _ = (client or get_client()).get_json("/fixtures/?future=1", max_age)
     if save: _save_json("fixtures", data)
     return data
+
+def load_snapshot(name, as_of=None, store=None):
+    """(payload, hash) of the newest stored snapshot, or the newest at/before as_of - no network."""
+    store = store or SnapshotStore(RAW_DIR)
+    _, h = store.resolve(name, as_of)
+    return store.load_object(h), h
+
+def load_bootstrap_static(as_of=None, store=None):
+    return load_snapshot("bootstrap_static", as_of, store)[0]
+
+def load_fixtures(as_of=None, store=None):
+    return load_snapshot("fixtures", as_of, store)[0]
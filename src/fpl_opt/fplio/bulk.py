@@ -0,0 +1,117 @@
+"""Concurrent bulk fetch of per-player `element-summary/{id}/` payloads.
+
+Bodies land one file per player in `out_dir`; a checkpoint file records which
+ids are done for the current run key (e.g. the gameweek), so an interrupted
+run resumes where it stopped and a new gameweek starts fresh.
+"""
+from __future__ import annotations
+import argparse, json, pathlib, time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, List
+
+from .client import FPLClient
+
+SUMMARY_DIR = pathlib.Path("data/raw/element_summary")
+CHECKPOINT = "_checkpoint.json"
+
+
+def _read_checkpoint(out_dir: pathlib.Path, run_key: str) -> set:
+    p = out_dir / CHECKPOINT
+    if not p.exists():
+        return set()
+    try:
+        ck = json.loads(p.read_text())
+    except json.JSONDecodeError:
+        return set()
+    if ck.get("run_key") != run_key:
+        return set()
+    return {int(x) for x in ck.get("done", [])}
+
+def _write_checkpoint(out_dir: pathlib.Path, run_key: str, done: set) -> None:
+    tmp = out_dir / (CHECKPOINT + ".tmp")
+    tmp.write_text(json.dumps({"run_key": run_key, "done": sorted(done)}))
+    tmp.replace(out_dir / CHECKPOINT)
+
+def fetch_element_summaries(
+    ids: Iterable[int],
+    out_dir: str | pathlib.Path = SUMMARY_DIR,
+    run_key: str = "",
+    client: FPLClient | None = None,
+    workers: int = 16,
+    rate: float = 40.0,
+    checkpoint_every: int = 50,
+    progress: Callable[[int, int], None] | None = None,
+) -> Dict[str, Any]:
+    """Fetch every id not already done for `run_key`. Returns a small summary dict.
+
+    Failures are collected rather than raised so one bad id doesn't lose the
+    rest; rerun with the same run_key to retry only those.
+    """
+    out_dir = pathlib.Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    client = client or FPLClient(rate=rate, burst=workers, pool_size=workers)
+
+    ids = sorted({int(x) for x in ids})
+    done = _read_checkpoint(out_dir, run_key)
+    todo = [pid for pid in ids if pid not in done]
+    total, n_done = len(ids), len(ids) - len(todo)
+    failed: List[int] = []
+    t0 = time.perf_counter()
+
+    def fetch(pid: int) -> int:
+        body = client.get(f"/element-summary/{pid}/").content
+        tmp = out_dir / f"{pid}.json.tmp"
+        tmp.write_bytes(body)
+        tmp.replace(out_dir / f"{pid}.json")
+        return pid
+
+    if progress: progress(n_done, total)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futs = {pool.submit(fetch, pid): pid for pid in todo}
+        for fut in as_completed(futs):
+            pid = futs[fut]
+            try:
+                fut.result()
+            except Exception:
+                failed.append(pid)
+                continue
+            done.add(pid)
+            n_done += 1
+            if n_done % checkpoint_every == 0:
+                _write_checkpoint(out_dir, run_key, done)
+            if progress: progress(n_done, total)
+    _write_checkpoint(out_dir, run_key, done)
+
+    return {
+        "total": total,
+        "fetched": len(todo) - len(failed),
+        "skipped": total - len(todo),
+        "failed": sorted(failed),
+        "seconds": time.perf_counter() - t0,
+    }
+
+def load_element_summaries(out_dir: str | pathlib.Path = SUMMARY_DIR) -> Dict[int, dict]:
+    out_dir = pathlib.Path(out_dir)
+    return {int(p.name.split(".")[0]): json.loads(p.read_text())
+            for p in out_dir.glob("*.json") if not p.name.startswith("_")}
+
+
+if __name__ == "__main__":
+    from rich.progress import Progress
+    from .api import get_bootstrap_static
+
+    ap = argparse.ArgumentParser(description="Bulk-fetch element-summary histories")
+    ap.add_argument("--out", default=str(SUMMARY_DIR))
+    ap.add_argument("--workers", type=int, default=16)
+    ap.add_argument("--rate", type=float, default=40.0, help="Max requests per second")
+    args = ap.parse_args()
+
+    bs = get_bootstrap_static()
+    current = next((e["id"] for e in bs.get("events", []) if e.get("is_current")), 0)
+    ids = [e["id"] for e in bs["elements"]]
+    with Progress() as bar:
+        task = bar.add_task("element-summary", total=len(ids))
+        res = fetch_element_summaries(ids, args.out, run_key=f"gw{current}", workers=args.workers,
+                                      rate=args.rate, progress=lambda d, t: bar.update(task, completed=d))
+    print(f"fetched {res['fetched']}, skipped {res['skipped']}, failed {len(res['failed'])} "
+          f"in {res['seconds']:.1f}s")
@@ -0,0 +1,132 @@
+"""Shared HTTP client for the FPL API.
+
+One `requests.Session` with a keep-alive pool, per-request timeouts, retries
+with exponential backoff + jitter on 429/5xx and connection errors, and a
+token-bucket rate limiter shared by every thread using the client.
+"""
+from __future__ import annotations
+import json, random, threading, time
+from typing import Any, Dict, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .httpcache import HttpCache
+
+BASE = "https://fantasy.premierleague.com/api"
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Allow `rate` requests/second on average with bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait = (1.0 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class FPLClient:
+    def __init__(
+        self,
+        base: str = BASE,
+        timeout: float | Tuple[float, float] = (3.05, 20.0),
+        max_retries: int = 5,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+        rate: float = 10.0,
+        burst: float = 20.0,
+        pool_size: int = 32,
+        cache: HttpCache | None = None,
+    ):
+        self.base = base.rstrip("/")
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.bucket = TokenBucket(rate, burst)
+        self.cache = cache if cache is not None else HttpCache()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"User-Agent": "fpl-optimizer/0.1"})
+
+    def _sleep_before_retry(self, attempt: int, resp: requests.Response | None) -> None:
+        retry_after = resp.headers.get("Retry-After") if resp is not None else None
+        if retry_after is not None:
+            try:
+                time.sleep(min(self.max_backoff, float(retry_after)))
+                return
+            except ValueError:
+                pass
+        cap = min(self.max_backoff, self.backoff * (2 ** attempt))
+        time.sleep(random.uniform(cap / 2, cap))  # "equal jitter"
+
+    def get(self, path: str, headers: Dict[str, str] | None = None) -> requests.Response:
+        """GET base+path; retries transient failures, raises on final failure."""
+        url = path if path.startswith("http") else f"{self.base}{path}"
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire()
+            try:
+                r = self.session.get(url, headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.max_retries:
+                    raise
+                self._sleep_before_retry(attempt, None)
+                continue
+            if r.status_code in RETRY_STATUS and attempt < self.max_retries:
+                self._sleep_before_retry(attempt, r)
+                continue
+            if r.status_code != 304:
+                r.raise_for_status()
+            return r
+        raise RuntimeError("unreachable")
+
+    def get_json(self, path: str, max_age: float | None = None) -> Tuple[Any, bool]:
+        """Cached conditional GET. Returns (payload, changed)."""
+        body = self.cache.fresh(path, max_age)
+        if body is not None:
+            return json.loads(body), False
+        r = self.get(path, headers=self.cache.validators(path))
+        if r.status_code == 304:
+            self.cache.touch(path)
+            return json.loads(self.cache.load(path)), False
+        self.cache.store(path, r.content, r.headers)
+        return r.json(), True
+
+    def close(self) -> None:
+        self.session.close()
+
+
+_default: FPLClient | None = None
+_default_lock = threading.Lock()
+
+def get_client() -> FPLClient:
+    """Process-wide shared client (created lazily)."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = FPLClient()
+        return _default
+
+def set_client(client: FPLClient | None) -> None:
+    global _default
+    with _default_lock:
+        _default = client
@@ -0,0 +1,73 @@
+"""On-disk conditional-GET cache for FPL API responses.
+
+Each endpoint gets a body file plus a small JSON sidecar holding the
+validators (ETag / Last-Modified) and the time it was last confirmed fresh.
+"""
+from __future__ import annotations
+import hashlib, json, pathlib, time
+from typing import Dict, Mapping
+
+CACHE_DIR = pathlib.Path("data/cache/http")
+DEFAULT_MAX_AGE = 3600.0  # seconds; repeated runs within this window stay offline
+
+
+class HttpCache:
+    def __init__(self, root: str | pathlib.Path = CACHE_DIR, max_age: float = DEFAULT_MAX_AGE):
+        self.root = pathlib.Path(root)
+        self.max_age = float(max_age)
+
+    def _paths(self, key: str):
+        h = hashlib.sha1(key.encode()).hexdigest()[:16]
+        return self.root / f"{h}.meta.json", self.root / f"{h}.body"
+
+    def _meta(self, key: str) -> Dict | None:
+        meta_p, body_p = self._paths(key)
+        if not meta_p.exists() or not body_p.exists():
+            return None
+        try:
+            return json.loads(meta_p.read_text())
+        except json.JSONDecodeError:
+            return None
+
+    def fresh(self, key: str, max_age: float | None = None) -> bytes | None:
+        """Cached body if it was confirmed within max_age seconds, else None."""
+        meta = self._meta(key)
+        age = self.max_age if max_age is None else float(max_age)
+        if meta is None or time.time() - meta.get("checked_at", 0) > age:
+            return None
+        return self._paths(key)[1].read_bytes()
+
+    def validators(self, key: str) -> Dict[str, str]:
+        """Request headers for a conditional GET (empty if nothing cached)."""
+        meta = self._meta(key)
+        if meta is None:
+            return {}
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def load(self, key: str) -> bytes:
+        return self._paths(key)[1].read_bytes()
+
+    def touch(self, key: str) -> None:
+        """Mark the cached body as revalidated (after a 304)."""
+        meta = self._meta(key) or {"key": key}
+        meta["checked_at"] = time.time()
+        self._paths(key)[0].write_text(json.dumps(meta))
+
+    def store(self, key: str, body: bytes, headers: Mapping[str, str]) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        meta_p, body_p = self._paths(key)
+        tmp = body_p.with_suffix(".tmp")
+        tmp.write_bytes(body)
+        tmp.replace(body_p)
+        meta = {
+            "key": key,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "checked_at": time.time(),
+        }
+        meta_p.write_text(json.dumps(meta))
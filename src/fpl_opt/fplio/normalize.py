@@ -1,13 +1,29 @@
+import numpy as np
 import pandas as pd
 
+POSITIONS = pd.CategoricalDtype(["GK", "DEF", "MID", "FWD"], ordered=True)
+STATUSES = pd.CategoricalDtype(["a", "d", "i", "n", "s", "u"])
+
 def players_table(bootstrap):
+    """Player pool with compact dtypes: small ints for ids/prices, categorical
+    position/status and float32 numerics parsed once here."""
     df = pd.DataFrame(bootstrap["elements"])
-    df["price"] = df["now_cost"] / 10.0
-    pos_map = {1: "GK", 2: "DEF", 3: "MID", 4: "FWD"}
-    df["position"] = df["element_type"].map(pos_map)
-    keep = ["id","web_name","team","position","price","status",
-            "chance_of_playing_next_round","form","points_per_game"]
-    return df[keep].rename(columns={"id":"element_id"})
+    unknown = set(df["status"]) - set(STATUSES.categories)
+    if unknown:  # would silently become NaN, i.e. 0 projected minutes
+        raise ValueError(f"Unknown player status codes: {sorted(unknown)}")
+    out = pd.DataFrame({
+        "element_id": df["id"].astype(np.int16),
+        "web_name": df["web_name"],
+        "team": df["team"].astype(np.int8),
+        "position": pd.Categorical.from_codes(df["element_type"].astype(np.int8) - 1, dtype=POSITIONS),
+        "price_tenths": df["now_cost"].astype(np.int16),
+        "status": df["status"].astype(STATUSES),
+        "chance_of_playing_next_round": pd.to_numeric(df["chance_of_playing_next_round"], errors="coerce").astype(np.float32),
+        "form": pd.to_numeric(df["form"], errors="coerce").fillna(0.0).astype(np.float32),
+        "points_per_game": pd.to_numeric(df["points_per_game"], errors="coerce").fillna(0.0).astype(np.float32),
+    })
+    out.insert(5, "price", (out["price_tenths"] / 10.0).astype(np.float32))
+    return out
 
 def teams_table(bootstrap):
     return pd.DataFrame(bootstrap["teams"])[["id","name","short_name"]] \
@@ -16,3 +32,12 @@ def teams_table(bootstrap):
 def fixtures_table(fixtures):
     keep = ["id","event","team_h","team_a","team_h_difficulty","team_a_difficulty","kickoff_time"]
     return pd.DataFrame(fixtures)[keep].rename(columns={"id":"fixture_id"})
+
+def history_table(summaries):
+    """Per-player, per-fixture history from element-summary payloads ({id: payload})."""
+    rows = [h for s in summaries.values() for h in s.get("history", [])]
+    keep = ["element","fixture","round","minutes","total_points","goals_scored","assists",
+            "clean_sheets","was_home","opponent_team"]
+    if not rows:
+        return pd.DataFrame(columns=keep).rename(columns={"element":"element_id"})
+    return pd.DataFrame(rows)[keep].rename(columns={"element":"element_id"})
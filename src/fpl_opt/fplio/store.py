@@ -0,0 +1,124 @@
+"""Content-addressed, compressed store for raw API snapshots.
+
+Layout under `root`:
+    objects/<sha256>.json.gz   canonical JSON body (gzip or lzma)
+    index.json                 {name: [[ts, sha256], ...]} sorted by ts
+
+Identical payloads are stored once and a new index entry is only added when
+a payload differs from the previous snapshot of the same name.
+"""
+from __future__ import annotations
+import bisect, gzip, hashlib, json, lzma, pathlib, re
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Tuple
+
+RAW_DIR = pathlib.Path("data/raw")
+TS_FMT = "%Y%m%dT%H%M%SZ"
+_CODECS = {"gzip": (".json.gz", gzip), "lzma": (".json.xz", lzma)}
+
+
+def canonical_bytes(payload: Any) -> bytes:
+    return json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode()
+
+def payload_hash(payload: Any) -> str:
+    return hashlib.sha256(canonical_bytes(payload)).hexdigest()
+
+def now_ts() -> str:
+    return datetime.now(timezone.utc).strftime(TS_FMT)
+
+
+class SnapshotStore:
+    def __init__(self, root: str | pathlib.Path = RAW_DIR, codec: str = "gzip"):
+        if codec not in _CODECS:
+            raise ValueError(f"Unknown codec {codec!r}; use one of {sorted(_CODECS)}")
+        self.root = pathlib.Path(root)
+        self.codec = codec
+        self._index: Dict[str, List[List[str]]] | None = None
+
+    # ---------- index ----------
+    @property
+    def index_path(self) -> pathlib.Path:
+        return self.root / "index.json"
+
+    def _load_index(self) -> Dict[str, List[List[str]]]:
+        if self._index is None:
+            p = self.index_path
+            self._index = json.loads(p.read_text()) if p.exists() else {}
+        return self._index
+
+    def _save_index(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self._load_index(), indent=1))
+        tmp.replace(self.index_path)
+
+    def entries(self, name: str) -> List[Tuple[str, str]]:
+        return [(ts, h) for ts, h in self._load_index().get(name, [])]
+
+    # ---------- objects ----------
+    def _object_path(self, h: str) -> pathlib.Path | None:
+        for suffix, _ in _CODECS.values():
+            p = self.root / "objects" / f"{h}{suffix}"
+            if p.exists():
+                return p
+        return None
+
+    def load_object(self, h: str) -> Any:
+        p = self._object_path(h)
+        if p is None:
+            raise KeyError(f"No snapshot object {h}")
+        mod = gzip if p.name.endswith(".gz") else lzma
+        with mod.open(p, "rb") as f:
+            return json.loads(f.read())
+
+    def put(self, name: str, payload: Any, ts: str | None = None) -> str:
+        """Store payload under name at ts (default: now). Returns its hash."""
+        body = canonical_bytes(payload)
+        h = hashlib.sha256(body).hexdigest()
+        if self._object_path(h) is None:
+            suffix, mod = _CODECS[self.codec]
+            obj_dir = self.root / "objects"
+            obj_dir.mkdir(parents=True, exist_ok=True)
+            tmp = obj_dir / f"{h}.tmp"
+            with mod.open(tmp, "wb") as f:
+                f.write(body)
+            tmp.replace(obj_dir / f"{h}{suffix}")
+
+        rows = self._load_index().setdefault(name, [])
+        ts = ts or now_ts()
+        i = bisect.bisect_right([r[0] for r in rows], ts)
+        if i > 0 and rows[i - 1][1] == h:
+            return h  # unchanged since the previous snapshot
+        rows.insert(i, [ts, h])
+        self._save_index()
+        return h
+
+    def resolve(self, name: str, as_of: str | None = None) -> Tuple[str, str]:
+        """(ts, hash) of the newest snapshot at or before as_of (default: newest)."""
+        rows = self._load_index().get(name, [])
+        if not rows:
+            raise LookupError(f"No '{name}' snapshots in {self.root}")
+        if as_of is None:
+            ts, h = rows[-1]
+            return ts, h
+        i = bisect.bisect_right([r[0] for r in rows], as_of)
+        if i == 0:
+            raise LookupError(f"No '{name}' snapshot at or before {as_of}")
+        ts, h = rows[i - 1]
+        return ts, h
+
+    def get(self, name: str, as_of: str | None = None) -> Any:
+        return self.load_object(self.resolve(name, as_of)[1])
+
+    def import_legacy(self, remove: bool = False) -> int:
+        """Fold old `<name>_<ts>.json` files from root into the store."""
+        n = 0
+        for p in sorted(self.root.glob("*_*.json")):
+            m = re.fullmatch(r"(.+)_(\d{8}T\d{6}Z)\.json", p.name)
+            if not m:
+                continue
+            self.put(m.group(1), json.loads(p.read_text()), ts=m.group(2))
+            if remove:
+                p.unlink()
+            n += 1
+        return n
@@ -0,0 +1,89 @@
+"""Columnar on-disk cache of the normalized tables, keyed by snapshot hash.
+
+Each table is a directory of `.npy` column files plus `meta.json`; numeric
+columns reload memory-mapped, so repeated runs and notebooks skip JSON
+parsing and DataFrame construction almost entirely.
+"""
+from __future__ import annotations
+import json, os, pathlib, shutil
+from typing import Callable, Literal, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .normalize import players_table, teams_table, fixtures_table
+from .store import payload_hash
+
+TABLE_DIR = pathlib.Path("data/cache/tables")
+SCHEMA = 2  # bump when normalize.* output changes
+
+
+def save_table(df: pd.DataFrame, path: str | pathlib.Path) -> None:
+    path = pathlib.Path(path)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")  # per process: workers may race on a key
+    if tmp.exists():
+        shutil.rmtree(tmp)
+    tmp.mkdir(parents=True)
+    cols = []
+    for i, col in enumerate(df.columns):
+        s = df[col]
+        fname = f"c{i}.npy"
+        if isinstance(s.dtype, pd.CategoricalDtype):
+            np.save(tmp / fname, s.cat.codes.to_numpy())
+            cols.append({"name": col, "kind": "category", "file": fname,
+                         "categories": [str(c) for c in s.cat.categories],
+                         "ordered": bool(s.cat.ordered)})
+        elif s.dtype == object:
+            mask = s.isna().to_numpy()
+            np.save(tmp / fname, s.where(~mask, "").astype(str).to_numpy().astype(str))
+            np.save(tmp / f"c{i}.mask.npy", mask)
+            cols.append({"name": col, "kind": "str", "file": fname})
+        else:
+            np.save(tmp / fname, s.to_numpy())
+            cols.append({"name": col, "kind": "num", "file": fname})
+    (tmp / "meta.json").write_text(json.dumps({"schema": SCHEMA, "rows": len(df), "columns": cols}))
+    if path.exists():
+        shutil.rmtree(path, ignore_errors=True)
+    try:
+        tmp.replace(path)
+    except OSError:  # another process finished the same table first
+        shutil.rmtree(tmp, ignore_errors=True)
+
+def load_table(path: str | pathlib.Path, mmap: bool = True) -> pd.DataFrame:
+    path = pathlib.Path(path)
+    meta = json.loads((path / "meta.json").read_text())
+    mode: Literal["r"] | None = "r" if mmap else None
+    data = {}
+    for c in meta["columns"]:
+        arr = np.load(path / c["file"], mmap_mode=mode)
+        if c["kind"] == "category":
+            data[c["name"]] = pd.Categorical.from_codes(arr, categories=c["categories"],
+                                                        ordered=c.get("ordered", False))
+        elif c["kind"] == "str":
+            mask = np.load(path / c["file"].replace(".npy", ".mask.npy"))
+            vals = arr.astype(object)
+            vals[mask] = None
+            data[c["name"]] = vals
+        else:
+            data[c["name"]] = arr
+    return pd.DataFrame(data, copy=False)
+
+def cached_table(kind: str, key: str, build: Callable[[], pd.DataFrame],
+                 root: str | pathlib.Path | None = None) -> pd.DataFrame:
+    path = pathlib.Path(root or TABLE_DIR) / f"{kind}-v{SCHEMA}-{key[:20]}"
+    if (path / "meta.json").exists():
+        return load_table(path)
+    df = build()
+    save_table(df, path)
+    return df
+
+def normalized_tables(bootstrap, fixtures, bootstrap_hash: str | None = None,
+                      fixtures_hash: str | None = None,
+                      root: str | pathlib.Path | None = None) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """(players, teams, fixtures) through the columnar cache."""
+    bh = bootstrap_hash or payload_hash(bootstrap)
+    fh = fixtures_hash or payload_hash(fixtures)
+    players = cached_table("players", bh, lambda: players_table(bootstrap), root)
+    teams = cached_table("teams", bh, lambda: teams_table(bootstrap), root)
+    fixtures_df = cached_table("fixtures", fh, lambda: fixtures_table(fixtures), root)
+    return players, teams, fixtures_df
@@ -0,0 +1,192 @@
+"""Team-file handling, data loading and the recommend/apply operations shared
+by the CLI, the daemon (server.py) and the batch and sweep runners.
+
+Bad input (a malformed team, an unknown name, an unaffordable move) raises
+SystemExit with a message, which the CLI prints and the daemon turns into a
+400 response.
+"""
+from __future__ import annotations
+import json, re
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import yaml
+
+from .fplio.api import get_bootstrap_static, get_fixtures, load_snapshot
+from .fplio.store import payload_hash
+from .fplio.tablecache import normalized_tables
+from .features.projcache import ProjectionCache, fingerprint
+from .features.projections import project_next_gw
+from .optimize.transfers import build_squad_with_transfers
+from .optimize.swaps import enumerate_transfers
+from .utils import profiling
+
+def load_current_team(path_str: str) -> Dict:
+    p = Path(path_str)
+    if not p.exists() or p.stat().st_size == 0:
+        raise SystemExit(f"Current team file not found or empty: {p.resolve()}")
+    try:
+        cfg = json.loads(p.read_text())
+    except json.JSONDecodeError as e:
+        raise SystemExit(f"Invalid JSON in {p.resolve()}: {e}")
+    return check_team(cfg, f" in {p.resolve()}")
+
+def check_team(cfg: Dict, where: str = "") -> Dict:
+    for key in ("element_ids","bank_tenths","free_transfers"):
+        if key not in cfg: raise SystemExit(f"Missing '{key}'{where}")
+    if not isinstance(cfg["element_ids"], list) or len(cfg["element_ids"]) != 15:
+        raise SystemExit(f"'element_ids' must be a list of 15 IDs{where}")
+    cfg["element_ids"] = [int(x) for x in cfg["element_ids"]]
+    cfg["bank_tenths"] = int(cfg["bank_tenths"])
+    cfg["free_transfers"] = int(cfg["free_transfers"])
+    cfg["purchases_tenths"] = {int(k): int(v) for k,v in cfg.get("purchases_tenths",{}).items()}
+    return cfg
+
+def _name_to_id_map(bootstrap: dict) -> Dict[str,int]:
+    lut = {}
+    for e in bootstrap["elements"]:
+        web = e["web_name"].lower()
+        full = f'{e["first_name"]} {e["second_name"]}'.lower()
+        lut[web] = e["id"]
+        lut[full] = e["id"]
+    return lut
+
+def parse_accept_list(s: str|None, lut: Dict[str,int]) -> List[int]:
+    """Accept either 'id1;id2' or 'Name1; Name2'. Returns element_ids."""
+    if not s: return []
+    out: List[int] = []
+    for token in [x.strip() for x in s.split(";") if x.strip()]:
+        if re.fullmatch(r"\d+", token):
+            out.append(int(token))
+        else:
+            key = token.lower()
+            if key not in lut:
+                raise SystemExit(f"Could not resolve '{token}' to an element_id. Try full name or web_name.")
+            out.append(int(lut[key]))
+    return out
+
+def _sell_price_tenths(buy_t: int, now_t: int) -> int:
+    if now_t <= buy_t:
+        return now_t
+    prof = now_t - buy_t
+    realized = (prof // 20) * 5
+    return buy_t + int(realized)
+
+def load_payloads(offline: bool, as_of: str | None, cache_max_age: float | None):
+    """(bootstrap, fixtures, bootstrap_hash, fixtures_hash) from the live (cached) API, or
+    replayed from the raw snapshot store when offline/as_of. Hashes are None when live."""
+    with profiling.stage("fetch"):
+        if offline or as_of:
+            try:
+                bs, bh = load_snapshot("bootstrap_static", as_of)
+                fx, fh = load_snapshot("fixtures", as_of)
+            except LookupError as e:
+                raise SystemExit(f"Offline mode: {e}")
+            return bs, fx, bh, fh
+        return get_bootstrap_static(max_age=cache_max_age), get_fixtures(max_age=cache_max_age), None, None
+
+def prepare(bs: dict, fx: list, bs_hash: str | None = None, fx_hash: str | None = None,
+             weights_path: str = "configs/weights.yaml", proj_cache: ProjectionCache | None = None) -> Dict:
+    """Normalize and project one snapshot: everything the ops read. The
+    projection is reused from proj_cache (default: the on-disk one) when the
+    snapshots and weights file are unchanged."""
+    bs_hash, fx_hash = bs_hash or payload_hash(bs), fx_hash or payload_hash(fx)
+    with profiling.stage("normalize"):
+        players, teams, fixtures = normalized_tables(bs, fx, bs_hash, fx_hash)
+    with profiling.stage("project") as rec:
+        cache = proj_cache or ProjectionCache()
+        weights_bytes = Path(weights_path).read_bytes()
+        key = fingerprint(bs_hash, fx_hash, weights_bytes)
+        proj = cache.get(key)
+        if rec is not None:
+            rec["args"]["projection_cache"] = "miss" if proj is None else "hit"
+        if proj is None:
+            proj = project_next_gw(players, teams, fixtures, weights=yaml.safe_load(weights_bytes))
+            cache.put(key, proj)
+    candidates = proj[proj["exp_minutes"] > 0].copy()
+    return {
+        "players": players, "teams": teams, "fixtures": fixtures, "proj": proj, "candidates": candidates,
+        "id_to_name": {int(i): str(n) for i, n in zip(candidates["element_id"], candidates["web_name"])},
+        "name_lut": _name_to_id_map(bs),
+    }
+
+def apply_transfers(cfg: Dict, candidates, accept_ins: List[int], accept_outs: List[int]) -> Tuple[Dict, List[int]]:
+    """New team blob after selling accept_outs and buying accept_ins at current prices.
+    Returns (new_cfg, accept_outs) since outs are inferred when only ins are given."""
+    if not accept_ins and not accept_outs:
+        raise SystemExit("Use --accept-ins/--accept-outs with IDs or names to apply transfers.")
+
+    current = set(cfg["element_ids"])
+    # If only ins are given, infer outs as arbitrary players to make space (same positions ideally).
+    # Simple rule: pair outs with same-count as ins if user didn't specify outs.
+    if accept_ins and not accept_outs:
+        # Remove cheapest players first to free cash
+        have_df = candidates[candidates["element_id"].isin(current)].copy()
+        have_df = have_df.sort_values(["position","price"], ascending=[True, True])
+        accept_outs = [int(x) for x in have_df["element_id"].head(len(accept_ins)).tolist() if x not in accept_ins]
+
+    # Validate counts
+    new_ids = list(current - set(accept_outs)) + accept_ins
+    if len(new_ids) != 15:
+        raise SystemExit(f"Applying these changes would leave {len(new_ids)} players; need exactly 15.")
+
+    # Cash flow update
+    # Build now_cost map (tenths)
+    now_map: Dict[int, int] = dict(zip(candidates["element_id"].astype(int), candidates["price_tenths"].astype(int)))
+    purchases = {str(k): int(v) for k, v in cfg.get("purchases_tenths", {}).items()}
+    raise_t = sum(_sell_price_tenths(int(purchases.get(str(pid), now_map.get(pid,0))), now_map.get(pid,0)) for pid in accept_outs)
+    spend_t = sum(now_map.get(pid, 0) for pid in accept_ins)
+    new_bank = cfg["bank_tenths"] + raise_t - spend_t
+    if new_bank < 0:
+        raise SystemExit(f"Insufficient funds: need {(-new_bank)/10:.1f} more. (Consider different outs/ins.)")
+
+    # Update purchases: keep old buys; add buys at current price
+    for pid in accept_ins:
+        purchases[str(pid)] = int(now_map.get(pid,0))
+
+    new_cfg = {
+        "element_ids": [int(x) for x in new_ids],
+        "bank_tenths": int(new_bank),
+        "free_transfers": 1,  # after applying, typically reset to 1 for next week
+        "purchases_tenths": purchases,
+    }
+    return new_cfg, accept_outs
+
+def recommend(proj, candidates, cfg: Dict, max_extra_transfers: int, top_k: int = 5,
+               sell_candidates: List[int] | None = None, num_workers: int | None = None,
+               max_time: float = 25.0, template=None):
+    """(ranked 0-2 transfer moves, CP-SAT result) for one team; the best ranked move seeds CP-SAT.
+
+    The enumerator needs all 15 owned players in the pool; if any is missing
+    (e.g. left the league) ranked is None and CP-SAT runs unhinted."""
+    current_ids = cfg["element_ids"]
+    purchases = {int(k):int(v) for k,v in cfg.get("purchases_tenths", {}).items()}
+    owned_pool = proj[(proj["exp_minutes"] > 0) | proj["element_id"].isin(current_ids)]
+    ranked, hint = None, None
+    if set(current_ids) <= set(owned_pool["element_id"].astype(int)):
+        with profiling.stage("enumerate"):
+            ranked = enumerate_transfers(
+                owned_pool, current_ids, cfg["bank_tenths"],
+                purchases_tenths=purchases,
+                free_transfers=cfg["free_transfers"],
+                max_transfers=min(2, cfg["free_transfers"] + max_extra_transfers),
+                top_k=max(1, top_k),
+            )
+        best = ranked.iloc[0]
+        hint = [pid for pid in current_ids if pid not in best["transfers_out"]] + list(best["transfers_in"])
+    with profiling.stage("optimize"):
+        res = build_squad_with_transfers(
+            df=candidates,
+            current_ids=current_ids,
+            bank_tenths=cfg["bank_tenths"],
+            purchases_tenths=purchases,
+            free_transfers=cfg["free_transfers"],
+            max_extra_transfers=max_extra_transfers,
+            max_per_team=3,
+            hint_ids=hint,
+            sell_candidates=sell_candidates,
+            max_time=max_time,
+            num_workers=num_workers,
+            template=template,
+        )
+    return ranked, res
@@ -0,0 +1,193 @@
+"""Season chip scheduling: wildcard, free hit, bench boost, triple captain.
+
+Each chip's value in each gameweek is measured against holding the current
+squad, using a players x GWs projection matrix:
+
+- free hit: best one-week squad for that GW (a build_squad solve) minus holding;
+- wildcard: squad built for the next `wildcard_span` weeks, scored week by week;
+- bench boost: the current squad's bench points that week;
+- triple captain: the current captain's points that week.
+
+Free-hit and wildcard squads are solved in a process pool and cached on disk
+with their solve status, keyed by the inputs and the time limit (least recently
+used entries are trimmed past a size cap), so a longer budget re-solves. The schedule is then an exact DP over (week, chips used) with at most
+one chip per gameweek. Chip values are treated as additive, which is the
+approximation that keeps this out of one monolithic model.
+"""
+from __future__ import annotations
+import hashlib, json, multiprocessing as mp, os, pathlib
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.context import BaseContext
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ..utils.lru import evict_lru
+from .common import price_tenths_list
+from .model import build_squad
+from .transfers import _sell_price_tenths
+from .xi import best_xi
+
+CHIP_CACHE = pathlib.Path("data/cache/chips")
+CHIP_CACHE_MAX_BYTES = 16 * 2**20
+# (chip, first GW, last GW); two wildcards, one per half-season
+DEFAULT_CHIPS: List[Tuple[str, int, int]] = [
+    ("wildcard", 1, 19), ("wildcard", 20, 38),
+    ("free_hit", 1, 38), ("bench_boost", 1, 38), ("triple_captain", 1, 38),
+]
+
+# Worker state (set before the pool starts so forked workers inherit it)
+_DF: pd.DataFrame | None = None
+_EP_COLS: List[np.ndarray] | None = None
+
+
+def squad_value_tenths(df: pd.DataFrame, current_ids: Iterable[int], bank_tenths: int,
+                       purchases_tenths: Dict[int, int] | None = None) -> int:
+    """Bank plus the selling value of the current squad (the free hit / wildcard budget)."""
+    purchases_tenths = purchases_tenths or {}
+    now: Dict[int, int] = dict(zip(df["element_id"].astype(int), price_tenths_list(df)))
+    return int(bank_tenths) + sum(
+        _sell_price_tenths(purchases_tenths.get(pid, now[pid]), now[pid]) for pid in map(int, current_ids))
+
+def _init_worker(df: pd.DataFrame | None, ep_cols: List[np.ndarray] | None) -> None:
+    # fork: the module globals were set before the pool started, nothing to pickle
+    global _DF, _EP_COLS
+    if df is not None:
+        _DF, _EP_COLS = df, ep_cols
+
+def _squad_job(col: int, budget: int, max_per_team: int, max_time: float) -> Dict[str, Any]:
+    assert _DF is not None and _EP_COLS is not None
+    pool = _DF.assign(ep_next=_EP_COLS[col])
+    squad, obj = build_squad(pool, budget_tenths=budget, max_per_team=max_per_team,
+                             max_time=max_time, num_workers=1)
+    return {"element_ids": [int(x) for x in squad["element_id"]], "objective": float(obj),
+            "status": squad.attrs["solve_stats"]["status"]}
+
+def _job_key(df: pd.DataFrame, ep_col: np.ndarray, budget: int, max_per_team: int, max_time: float) -> str:
+    h = hashlib.sha256()
+    h.update(df["element_id"].to_numpy(np.int64).tobytes())
+    h.update(np.asarray(price_tenths_list(df), dtype=np.int64).tobytes())
+    h.update(df["team"].to_numpy(np.int64).tobytes())
+    h.update(np.asarray(ep_col, dtype=np.float32).tobytes())
+    h.update(f"{budget}:{max_per_team}:{max_time}".encode())
+    return h.hexdigest()[:24]
+
+def solve_squads(df: pd.DataFrame, ep_cols: Sequence[np.ndarray], budget: int, max_per_team: int = 3,
+                 workers: int | None = None, max_time: float = 15.0,
+                 cache_dir: str | pathlib.Path | None = None,
+                 max_bytes: int = CHIP_CACHE_MAX_BYTES) -> List[Dict[str, Any]]:
+    """build_squad for each objective column, in a process pool, with an on-disk
+    cache trimmed to max_bytes (least recently used first)."""
+    global _DF, _EP_COLS
+    cache = pathlib.Path(cache_dir or CHIP_CACHE)
+    cache.mkdir(parents=True, exist_ok=True)
+    df = df.reset_index(drop=True)
+    keys = [_job_key(df, col, budget, max_per_team, max_time) for col in ep_cols]
+    done: Dict[str, Dict[str, Any]] = {}
+    todo: Dict[str, int] = {}
+    for i, k in enumerate(keys):
+        p = cache / f"{k}.json"
+        if p.exists():
+            done[k] = json.loads(p.read_text())
+            os.utime(p)  # LRU clock
+        elif k not in todo:
+            todo[k] = i
+    if todo:
+        _DF, _EP_COLS = df, [np.asarray(col) for col in ep_cols]
+        if "fork" in mp.get_all_start_methods():
+            ctx: BaseContext = mp.get_context("fork")
+            initargs: tuple = (None, None)
+        else:
+            ctx, initargs = mp.get_context("spawn"), (_DF, _EP_COLS)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                                 initializer=_init_worker, initargs=initargs) as pool:
+            futs = [pool.submit(_squad_job, i, budget, max_per_team, max_time) for i in todo.values()]
+            for k, fut in zip(todo, futs):
+                res = fut.result()
+                (cache / f"{k}.json").write_text(json.dumps(res))
+                done[k] = res
+        evict_lru(cache, max_bytes, keep=set(keys))
+    return [done[k] for k in keys]
+
+def _xi_points(ep_squad: np.ndarray, pos: np.ndarray) -> Tuple[float, float, float]:
+    """(XI + captain points, captain points, bench points) for one squad-week."""
+    starters, cap, pts = best_xi(ep_squad, pos)
+    return pts, float(ep_squad[cap]), float(ep_squad[~starters].sum())
+
+def chip_values(df: pd.DataFrame, ep: np.ndarray, current_ids: Iterable[int], budget_tenths: int,
+                max_per_team: int = 3, wildcard_span: int = 4, workers: int | None = None,
+                max_time: float = 15.0, cache_dir: str | pathlib.Path | None = None) -> Dict[str, Any]:
+    """Per-chip, per-GW gain over holding the current squad, plus the chip squads."""
+    df = df.reset_index(drop=True)
+    ids = df["element_id"].astype(int).to_numpy()
+    pos = df["position"].astype(str).to_numpy()
+    G = ep.shape[1]
+    cur_rows = np.flatnonzero(np.isin(ids, [int(x) for x in current_ids]))
+    if len(cur_rows) != 15:
+        raise ValueError(f"All 15 owned players must be in df; found {len(cur_rows)}")
+
+    hold, captain, bench = np.zeros(G), np.zeros(G), np.zeros(G)
+    for g in range(G):
+        hold[g], captain[g], bench[g] = _xi_points(ep[cur_rows, g], pos[cur_rows])
+
+    spans = [ep[:, g:min(G, g + wildcard_span)].sum(axis=1) for g in range(G)]
+    squads = solve_squads(df, [ep[:, g] for g in range(G)] + spans, budget_tenths, max_per_team,
+                          workers, max_time, cache_dir)
+    fh_sq, wc_sq = squads[:G], squads[G:]
+
+    row_of = {pid: i for i, pid in enumerate(ids)}
+    free_hit = np.array([fh_sq[g]["objective"] - hold[g] for g in range(G)])
+    wildcard = np.zeros(G)
+    for g in range(G):
+        rows = np.array([row_of[pid] for pid in wc_sq[g]["element_ids"]])
+        wildcard[g] = sum(_xi_points(ep[rows, u], pos[rows])[0] - hold[u]
+                          for u in range(g, min(G, g + wildcard_span)))
+    return {
+        "gains": {"free_hit": free_hit, "wildcard": wildcard, "bench_boost": bench,
+                  "triple_captain": captain},
+        "hold": hold,
+        "squads": {"free_hit": [s["element_ids"] for s in fh_sq],
+                   "wildcard": [s["element_ids"] for s in wc_sq]},
+    }
+
+def schedule_chips(gains: Dict[str, np.ndarray], gws: Sequence[int] | np.ndarray,
+                   chips: Sequence[Tuple[str, int, int]] = DEFAULT_CHIPS) -> Tuple[float, List[Dict[str, Any]]]:
+    """Exact DP over (week, used-chip bitmask): at most one chip per GW, each chip
+    instance once, inside its allowed GW range. Returns (total_gain, schedule)."""
+    G, K = len(gws), len(chips)
+    full = 1 << K
+    value = np.zeros((G + 1, full))
+    choice = np.full((G, full), -1, dtype=np.int64)
+    for g in range(G - 1, -1, -1):
+        for mask in range(full):
+            best, arg = value[g + 1, mask], -1
+            for k, (chip, lo, hi) in enumerate(chips):
+                if mask & (1 << k) or not lo <= gws[g] <= hi:
+                    continue
+                v = float(gains[chip][g]) + value[g + 1, mask | (1 << k)]
+                if v > best + 1e-9:
+                    best, arg = v, k
+            value[g, mask], choice[g, mask] = best, arg
+    schedule, mask = [], 0
+    for g in range(G):
+        k = int(choice[g, mask])
+        if k >= 0:
+            schedule.append({"chip": chips[k][0], "gw": int(gws[g]), "gain": float(gains[chips[k][0]][g])})
+            mask |= 1 << k
+    return float(value[0, 0]), schedule
+
+def plan_chips(df: pd.DataFrame, ep: np.ndarray, gws: Sequence[int] | np.ndarray, current_ids: Iterable[int],
+               budget_tenths: int, chips: Sequence[Tuple[str, int, int]] = DEFAULT_CHIPS,
+               **kwargs) -> Dict[str, Any]:
+    """Chip values + DP schedule. kwargs go to chip_values (workers, max_time, wildcard_span, ...).
+
+    Returns {"schedule": [{chip, gw, gain, squad_ids?}], "total_gain", "gains"}.
+    """
+    vals = chip_values(df, ep, current_ids, budget_tenths, **kwargs)
+    total, schedule = schedule_chips(vals["gains"], gws, chips)
+    gw_index = {int(g): i for i, g in enumerate(gws)}
+    for item in schedule:
+        if item["chip"] in vals["squads"]:
+            item["squad_ids"] = vals["squads"][item["chip"]][gw_index[item["gw"]]]
+    return {"schedule": schedule, "total_gain": total, "gains": vals["gains"]}
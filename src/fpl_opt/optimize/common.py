@@ -0,0 +1,12 @@
+"""Small helpers shared by the optimize modules."""
+from __future__ import annotations
+import pandas as pd
+
+# Squad quota per position (15 players)
+QUOTAS = {"GK": 2, "DEF": 5, "MID": 5, "FWD": 3}
+
+def price_tenths_list(df: pd.DataFrame) -> list:
+    """Prices in tenths; uses the integer column from players_table when present."""
+    if "price_tenths" in df.columns:
+        return df["price_tenths"].astype(int).tolist()
+    return (df["price"] * 10).round().astype(int).tolist()
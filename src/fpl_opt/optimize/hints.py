@@ -0,0 +1,91 @@
+"""Warm-start sources for the squad models: greedy fill and the persisted last optimum."""
+from __future__ import annotations
+import json, pathlib
+from typing import Iterable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .common import QUOTAS, price_tenths_list
+from .xi import best_xi
+
+LAST_OPTIMUM = pathlib.Path("data/cache/last_optimum.json")
+
+def greedy_squad(df: pd.DataFrame, budget_tenths: int = 1000, max_per_team: int = 3) -> List[int] | None:
+    """Fill the 15 slots by descending ep_next, keeping enough money back to fill
+    the remaining slots with the cheapest eligible players. None if it gets stuck."""
+    ids = df["element_id"].astype(int).tolist()
+    price = price_tenths_list(df)
+    pos = [str(p) for p in df["position"]]
+    team = df["team"].astype(int).tolist()
+    order = sorted(range(len(df)), key=lambda i: -float(df["ep_next"].iloc[i]))
+    by_price = sorted(range(len(df)), key=lambda i: price[i])
+
+    need = dict(QUOTAS)
+    per_team: dict = {}
+    chosen: List[int] = []
+    taken: set = set()
+    budget = budget_tenths
+
+    def reserve(need_after, club, exclude):
+        # cheapest way to fill need_after from players still available after picking `exclude`
+        left, total = dict(need_after), 0
+        full = {t for t, k in per_team.items() if k + (t == club) >= max_per_team}
+        for j in by_price:
+            if j == exclude or j in taken or left.get(pos[j], 0) == 0 or team[j] in full:
+                continue
+            left[pos[j]] -= 1
+            total += price[j]
+            if not any(left.values()):
+                break
+        return total if not any(left.values()) else None
+
+    for i in order:
+        P = pos[i]
+        if need.get(P, 0) == 0 or per_team.get(team[i], 0) >= max_per_team:
+            continue
+        after = dict(need)
+        after[P] -= 1
+        r = reserve(after, team[i], i)
+        if r is None or price[i] + r > budget:
+            continue
+        chosen.append(ids[i])
+        taken.add(i)
+        need, budget = after, budget - price[i]
+        per_team[team[i]] = per_team.get(team[i], 0) + 1
+        if len(chosen) == 15:
+            return chosen
+    return None
+
+def squad_hint(df: pd.DataFrame, hint_ids: Iterable[int] | None
+               ) -> Tuple[np.ndarray, np.ndarray, np.ndarray] | None:
+    """x/s/c hint values (bool arrays over df rows) for a squad of element_ids, with
+    the XI and captain filled in exactly. Ids not in df are ignored; None if no row matches."""
+    if hint_ids is None:
+        return None
+    rows = np.flatnonzero(df["element_id"].isin([int(h) for h in hint_ids]).to_numpy())
+    if not len(rows):
+        return None
+    x, s, c = (np.zeros(len(df), dtype=bool) for _ in range(3))
+    x[rows] = True
+    try:
+        starters, cap, _ = best_xi(df["ep_next"].to_numpy()[rows], df["position"].to_numpy()[rows])
+    except (ValueError, KeyError):
+        return x, s, c
+    s[rows[np.asarray(starters, dtype=bool)]] = True
+    c[rows[cap]] = True
+    return x, s, c
+
+def load_last_optimum(path: str | pathlib.Path = LAST_OPTIMUM) -> List[int] | None:
+    p = pathlib.Path(path)
+    if not p.exists():
+        return None
+    try:
+        return [int(x) for x in json.loads(p.read_text())["element_ids"]]
+    except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+        return None
+
+def save_last_optimum(ids: Iterable[int], path: str | pathlib.Path = LAST_OPTIMUM) -> None:
+    p = pathlib.Path(path)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    p.write_text(json.dumps({"element_ids": [int(x) for x in ids]}))
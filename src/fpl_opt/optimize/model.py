@@ -1,72 +1,90 @@
 from __future__ import annotations
+from typing import Iterable
+import numpy as np
 import pandas as pd
 from ortools.sat.python import cp_model
 
-def build_squad(df: pd.DataFrame, budget_tenths: int = 1000, max_per_team: int = 3):
-    """Pick a 15-man squad, legal XI, and a captain to maximize expected next-GW points."""
-    model = cp_model.CpModel()
-
-    n = len(df)
-    price_tenths = (df["price"] * 10).round().astype(int).tolist()
-    ep = df["ep_next"].tolist()
-    teams = df["team"].tolist()
-    pos = df["position"].tolist()
-
-    x = [model.NewBoolVar(f"x_{i}") for i in range(n)]  # in 15-man squad
-    s = [model.NewBoolVar(f"s_{i}") for i in range(n)]  # starter
-    c = [model.NewBoolVar(f"c_{i}") for i in range(n)]  # captain
-
-    # Link starters/captain to squad
-    for i in range(n):
-        model.Add(s[i] <= x[i])
-        model.Add(c[i] <= s[i])
-
-    # Budget
-    model.Add(sum(x[i] * price_tenths[i] for i in range(n)) <= budget_tenths)
-
-    # Squad composition
-    model.Add(sum(x) == 15)
-    for P, cnt in [("GK",2),("DEF",5),("MID",5),("FWD",3)]:
-        idx = [i for i in range(n) if pos[i] == P]
-        model.Add(sum(x[i] for i in idx) == cnt)
-
-    # Per-team limit
-    for t in set(teams):
-        idx = [i for i in range(n) if teams[i] == t]
-        model.Add(sum(x[i] for i in idx) <= max_per_team)
-
-    # Valid XI
-    model.Add(sum(s) == 11)
-    model.Add(sum(s[i] for i in range(n) if pos[i] == "GK") == 1)
-    model.Add(sum(s[i] for i in range(n) if pos[i] == "DEF") >= 3)
-    model.Add(sum(s[i] for i in range(n) if pos[i] == "MID") >= 2)
-    model.Add(sum(s[i] for i in range(n) if pos[i] == "FWD") >= 1)
-
-    # Captain exactly one
-    model.Add(sum(c) == 1)
-
-    # Objective: starters + captain doubles
-    model.Maximize(sum(s[i] * ep[i] for i in range(n)) + sum(c[i] * ep[i] for i in range(n)))
-
-    solver = cp_model.CpSolver()
-    solver.parameters.max_time_in_seconds = 15.0
-    res = solver.Solve(model)
-    if res not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+from .common import price_tenths_list
+from .hints import squad_hint
+from .presolve import prune_dominated
+from .template import SquadTemplate
+from .xi import best_xi
+
+def build_squad(df: pd.DataFrame, budget_tenths: int = 1000, max_per_team: int = 3,
+                hint_ids: Iterable[int] | None = None, prune: bool = True,
+                max_time: float = 15.0, num_workers: int | None = None,
+                template: SquadTemplate | None = None, exclude_ids: Iterable[int] = ()):
+    """Pick a 15-man squad, legal XI, and a captain to maximize expected next-GW points.
+
+    hint_ids warm-starts the search (e.g. last week's optimum or hints.greedy_squad).
+    prune drops strictly dominated candidates first (see presolve).
+    template: a SquadTemplate compiled for df's rows, reused instead of building the
+    model (pruned players are then fixed out rather than dropped).
+    exclude_ids are left out of the pool the same way.
+    Solve timings are attached as squad.attrs["solve_stats"].
+    """
+    df, template, fixed_out, n_pruned = _pool_template(df, template, max_per_team, prune,
+                                                       exclude_ids=exclude_ids)
+    hint = squad_hint(df, hint_ids)
+    res = template.solve(df["ep_next"].to_numpy(), price_tenths_list(df), budget_tenths,
+                         fixed_out=fixed_out, hint=hint,
+                         max_time=max_time, num_workers=num_workers)
+    stats = res["stats"]
+    if res["squad"] is None:
         raise RuntimeError("No feasible solution")
-
-    chosen_idx = [i for i in range(n) if solver.Value(x[i]) == 1]
-    squad = df.iloc[chosen_idx].copy()
-    squad["is_starter"] = [solver.Value(s[i]) == 1 for i in chosen_idx]
-    squad["is_captain"] = [solver.Value(c[i]) == 1 for i in chosen_idx]
-    return squad, solver.ObjectiveValue()
-
-
-def pick_xi_from_squad(squad_df: pd.DataFrame):
+    stats["hinted"] = hint is not None
+    stats["pruned"] = n_pruned
+    return _squad_frame(df, res), res["objective"]
+
+def _pool_template(df: pd.DataFrame, template: SquadTemplate | None, max_per_team: int,
+                   prune: bool, keep_ids: Iterable[int] = (), exclude_ids: Iterable[int] = ()):
+    """(df, template, fixed_out mask or None, n_pruned) for one solve. Rows in
+    exclude_ids (but not keep_ids) are dropped, or fixed out of a template."""
+    keep_ids = [int(k) for k in keep_ids]
+    ids = df["element_id"]
+    excluded = ids.isin([int(k) for k in exclude_ids]).to_numpy() & ~ids.isin(keep_ids).to_numpy()
+    if template is None:
+        n_pruned = 0
+        if excluded.any():
+            df = df[~excluded]
+        if prune:
+            df, n_pruned = prune_dominated(df, keep_ids=keep_ids, max_per_team=max_per_team)
+        return df, SquadTemplate(df, max_per_team), None, n_pruned
+    if not template.matches(df) or template.max_per_team != max_per_team:
+        raise ValueError("template was compiled for a different candidate pool")
+    if not prune:
+        return df, template, excluded if excluded.any() else None, 0
+    kept, n_pruned = prune_dominated(df[~excluded], keep_ids=keep_ids, max_per_team=max_per_team)
+    return df, template, ~ids.isin(kept["element_id"]).to_numpy(), n_pruned
+
+def _squad_frame(df: pd.DataFrame, res) -> pd.DataFrame:
+    chosen = np.flatnonzero(res["squad"])
+    squad = df.iloc[chosen].copy()
+    squad["is_starter"] = res["starters"][chosen]
+    squad["is_captain"] = res["captain"][chosen]
+    squad.attrs["solve_stats"] = res["stats"]
+    return squad
+
+
+def pick_xi_from_squad(squad_df: pd.DataFrame, method: str = "exact"):
     """
     Given a fixed 15-man squad (rows = those 15), choose a valid starting XI + captain
     to maximize expected points.
+
+    method="exact" enumerates the legal formations (microseconds); CP-SAT is used
+    when asked for explicitly or when the exact path can't handle the input.
     """
     df = squad_df.reset_index(drop=True).copy()
+    if method == "exact":
+        try:
+            starters, captain, projected = best_xi(df["ep_next"].to_numpy(), df["position"].to_numpy())
+        except (ValueError, KeyError):
+            pass
+        else:
+            df["is_starter"] = starters
+            df["is_captain"] = False
+            df.loc[captain, "is_captain"] = True
+            return df, projected
     n = len(df)
     pos = df["position"].tolist()
     ep  = df["ep_next"].tolist()
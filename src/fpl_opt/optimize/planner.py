@@ -0,0 +1,203 @@
+"""Multi-gameweek transfer planner (rolling horizon).
+
+Plans H gameweeks of transfers, XI and captain from a players x GWs projection
+matrix (features.horizon.project_horizon). Each step solves a W-week window
+with CP-SAT, commits only its first week, and slides forward, hinting the next
+window with the previous solution shifted by one week. The time budget is split
+across the remaining windows.
+
+Modelled per week: squad/XI/captain rules, banked free transfers (up to
+max_free_transfers; unused ones roll over, hits when exceeding them), and cash
+flow with the 50% sell rule for players already owned. Prices are assumed
+constant over the horizon, so anything bought inside the plan sells at cost.
+"""
+from __future__ import annotations
+import time
+from typing import Any, Dict, Iterable, List, Sequence
+
+import numpy as np
+import pandas as pd
+from ortools.sat.python import cp_model
+
+from .common import QUOTAS, price_tenths_list
+from .solve import solve
+from .transfers import _sell_price_tenths
+from .xi import best_xi
+
+POOL_PER_POSITION = {"GK": 10, "DEF": 30, "MID": 30, "FWD": 20}
+
+
+def _horizon_pool(df: pd.DataFrame, ep: np.ndarray, keep_ids: Iterable[int],
+                  per_position: Dict[str, int]) -> np.ndarray:
+    """Row indices of the top players per position by horizon total, plus keep_ids."""
+    keep = set(int(k) for k in keep_ids)
+    total = ep.sum(axis=1)
+    pos = df["position"].astype(str).to_numpy()
+    ids = df["element_id"].astype(int).to_numpy()
+    rows = set(np.flatnonzero(np.isin(ids, list(keep))).tolist())
+    for P, k in per_position.items():
+        idx = np.flatnonzero(pos == P)
+        rows.update(idx[np.argsort(-total[idx], kind="stable")[:k]].tolist())
+    return np.array(sorted(rows))
+
+def _solve_window(ep, price, sell_value, pos, team, prev, bank, ft, max_per_team,
+                  max_free_transfers, hit_cost, hint, max_time, num_workers):
+    """One W-week window. prev is the 0/1 squad before week 0. Returns (plan, stats)."""
+    n, W = ep.shape
+    m = cp_model.CpModel()
+    x = [[m.NewBoolVar(f"x_{w}_{i}") for i in range(n)] for w in range(W)]
+    s = [[m.NewBoolVar(f"s_{w}_{i}") for i in range(n)] for w in range(W)]
+    c = [[m.NewBoolVar(f"c_{w}_{i}") for i in range(n)] for w in range(W)]
+    buy = [[m.NewBoolVar(f"b_{w}_{i}") for i in range(n)] for w in range(W)]
+    sell = [[m.NewBoolVar(f"o_{w}_{i}") for i in range(n)] for w in range(W)]
+    by_pos = {P: [i for i in range(n) if pos[i] == P] for P in QUOTAS}
+    by_team = {t: [i for i in range(n) if team[i] == t] for t in set(team)}
+
+    cash = bank
+    ftv = ft
+    hits_total = []
+    objective = []
+    weekly = []
+    for w in range(W):
+        for i in range(n):
+            m.Add(s[w][i] <= x[w][i])
+            m.Add(c[w][i] <= s[w][i])
+            before = prev[i] if w == 0 else x[w - 1][i]
+            m.Add(buy[w][i] - sell[w][i] == x[w][i] - before)
+            m.Add(buy[w][i] + sell[w][i] <= 1)
+        m.Add(sum(x[w]) == 15)
+        for P, cnt in QUOTAS.items():
+            m.Add(sum(x[w][i] for i in by_pos[P]) == cnt)
+        for idx in by_team.values():
+            m.Add(sum(x[w][i] for i in idx) <= max_per_team)
+        m.Add(sum(s[w]) == 11)
+        m.Add(sum(s[w][i] for i in by_pos["GK"]) == 1)
+        m.Add(sum(s[w][i] for i in by_pos["DEF"]) >= 3)
+        m.Add(sum(s[w][i] for i in by_pos["MID"]) >= 2)
+        m.Add(sum(s[w][i] for i in by_pos["FWD"]) >= 1)
+        m.Add(sum(c[w]) == 1)
+
+        # Cash flow
+        bank_w = m.NewIntVar(0, 5000, f"bank_{w}")
+        m.Add(bank_w == cash + sum(sell[w][i] * sell_value[i] for i in range(n))
+              - sum(buy[w][i] * price[i] for i in range(n)))
+        cash = bank_w
+
+        # Free transfers are spent before any hit; unused ones roll over (capped)
+        t_w = m.NewIntVar(0, 15, f"t_{w}")
+        m.Add(t_w == sum(buy[w]))
+        used = m.NewIntVar(0, max_free_transfers, f"used_{w}")
+        m.AddMinEquality(used, [t_w, ftv])
+        hits = m.NewIntVar(0, 15, f"hits_{w}")
+        m.Add(hits == t_w - used)
+        ft_next = m.NewIntVar(1, max_free_transfers, f"ft_{w + 1}")
+        m.AddMinEquality(ft_next, [ftv - used + 1, max_free_transfers])
+        weekly.append((bank_w, t_w, hits, ftv))
+        ftv = ft_next
+        hits_total.append(hits)
+
+        objective.append(sum(s[w][i] * float(ep[i, w]) for i in range(n))
+                         + sum(c[w][i] * float(ep[i, w]) for i in range(n)))
+    m.Maximize(sum(objective) - hit_cost * sum(hits_total))
+
+    if hint is not None:
+        for w in range(W):
+            for i in range(n):
+                m.AddHint(x[w][i], bool(hint[w][i]))
+
+    solver, status, stats = solve(m, max_time, num_workers)
+    if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        raise RuntimeError("No feasible plan for this window")
+    squads = np.array([[solver.Value(x[w][i]) for i in range(n)] for w in range(W)], dtype=np.int8)
+    transfers, hits = solver.Value(weekly[0][1]), solver.Value(weekly[0][2])
+    first = {
+        "squad": squads[0],
+        "bank": solver.Value(weekly[0][0]),
+        "transfers": transfers,
+        "hits": hits,
+        "ft_next": min(max_free_transfers, ft - (transfers - hits) + 1),
+    }
+    return first, squads, stats
+
+def plan_transfers(
+    df: pd.DataFrame,
+    ep: np.ndarray,
+    gws: Sequence[int] | np.ndarray,
+    current_ids: Iterable[int],
+    bank_tenths: int,
+    purchases_tenths: Dict[int, int] | None = None,
+    free_transfers: int = 1,
+    horizon: int = 6,
+    window: int = 3,
+    time_budget: float = 60.0,
+    max_per_team: int = 3,
+    max_free_transfers: int = 5,
+    hit_cost: float = 4.0,
+    pool_per_position: Dict[str, int] | None = None,
+    num_workers: int | None = None,
+) -> Dict[str, Any]:
+    """Week-by-week plan over `horizon` GWs. ep rows align with df; columns with gws.
+
+    Returns {"weeks": [...], "total_points": float, "stats": [per-window solve stats]}.
+    Each week has gw, transfers_in/out, hits, free_transfers (before the week),
+    bank_tenths (after), points (XI + captain - hits) and the squad DataFrame.
+    """
+    horizon = min(horizon, ep.shape[1])
+    purchases_tenths = purchases_tenths or {}
+    cur = [int(x) for x in current_ids]
+    rows = _horizon_pool(df, ep[:, :horizon], cur, pool_per_position or POOL_PER_POSITION)
+    pool = df.iloc[rows].reset_index(drop=True)
+    ep = np.asarray(ep[rows, :horizon], dtype=np.float64)
+
+    ids = pool["element_id"].astype(int).to_numpy()
+    price = price_tenths_list(pool)
+    pos = pool["position"].astype(str).tolist()
+    team = pool["team"].astype(int).tolist()
+    owned0 = np.isin(ids, cur)
+    if owned0.sum() != 15:
+        raise ValueError(f"All 15 owned players must be in df; found {int(owned0.sum())}")
+    sell_value = [
+        _sell_price_tenths(int(purchases_tenths.get(int(ids[i]), price[i])), price[i]) if owned0[i] else price[i]
+        for i in range(len(ids))
+    ]
+
+    prev = owned0.astype(np.int8)
+    bank, ft = int(bank_tenths), int(free_transfers)
+    hint = None
+    deadline = time.perf_counter() + time_budget
+    weeks: List[Dict[str, Any]] = []
+    all_stats = []
+    for t in range(horizon):
+        W = min(window, horizon - t)
+        if hint is None:
+            hint = np.repeat(prev[None, :], W, axis=0)
+        hint = hint[:W]
+        remaining = max(0.5, deadline - time.perf_counter())
+        first, squads, stats = _solve_window(
+            ep[:, t:t + W], price, sell_value, pos, team, prev, bank, ft, max_per_team,
+            max_free_transfers, hit_cost, hint, remaining / (horizon - t), num_workers)
+        all_stats.append(stats)
+
+        # The committed week's XI/captain is re-picked exactly (the window may stop at FEASIBLE)
+        chosen = np.flatnonzero(first["squad"])
+        squad = pool.iloc[chosen].copy()
+        squad["ep_gw"] = ep[chosen, t]
+        starters, cap, xi_points = best_xi(squad["ep_gw"].to_numpy(), squad["position"].astype(str).to_numpy())
+        squad["is_starter"] = starters
+        squad["is_captain"] = np.arange(len(chosen)) == cap
+        points = xi_points - hit_cost * first["hits"]
+        weeks.append({
+            "gw": int(gws[t]),
+            "transfers_out": sorted(int(ids[i]) for i in np.flatnonzero((prev == 1) & (first["squad"] == 0))),
+            "transfers_in": sorted(int(ids[i]) for i in np.flatnonzero((prev == 0) & (first["squad"] == 1))),
+            "hits": int(first["hits"]),
+            "free_transfers": ft,
+            "bank_tenths": int(first["bank"]),
+            "points": points,
+            "squad": squad,
+        })
+        prev, bank, ft = first["squad"].astype(np.int8), int(first["bank"]), int(first["ft_next"])
+        # Warm start: shift this window's plan by one week, repeating its last week
+        hint = np.concatenate([squads[1:], squads[-1:]], axis=0)
+
+    return {"weeks": weeks, "total_points": float(sum(w["points"] for w in weeks)), "stats": all_stats}
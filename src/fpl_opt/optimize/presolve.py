@@ -0,0 +1,47 @@
+"""Dominance pruning of the candidate pool before model construction.
+
+Player i is dominated when at least k players of the same position, from k
+different clubs, cost no more and have strictly higher ep_next. With
+k = quota + 14 // max_per_team some dominator is always outside the
+squad and in a club with room, so swapping it in never hurts: pruning i
+cannot change the optimum.
+"""
+from __future__ import annotations
+from typing import Iterable, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .common import QUOTAS, price_tenths_list
+
+
+def dominance_counts(price: np.ndarray, ep: np.ndarray, team: np.ndarray) -> np.ndarray:
+    """Per player: number of distinct clubs with a cheaper-or-equal, strictly better player."""
+    dom = (price[None, :] <= price[:, None]) & (ep[None, :] > ep[:, None])  # dom[i, j]: j dominates i
+    clubs, club_idx = np.unique(team, return_inverse=True)
+    onehot = np.zeros((len(team), len(clubs)), dtype=np.int32)
+    onehot[np.arange(len(team)), club_idx] = 1
+    return ((dom.astype(np.int32) @ onehot) > 0).sum(axis=1)
+
+def prune_dominated(df: pd.DataFrame, keep_ids: Iterable[int] = (), max_per_team: int = 3,
+                    margin: int | None = None) -> Tuple[pd.DataFrame, int]:
+    """Drop strictly dominated rows; rows whose element_id is in keep_ids always stay.
+    Returns (pruned_df, n_pruned)."""
+    if margin is None:
+        margin = (15 - 1) // max_per_team  # clubs that can be full besides i's own
+    keep = {int(k) for k in keep_ids}
+    price = np.asarray(price_tenths_list(df))
+    ep = df["ep_next"].to_numpy(np.float64)
+    team = df["team"].to_numpy()
+    pos = df["position"].astype(str).to_numpy()
+    ids = df["element_id"].astype(int).to_numpy()
+
+    mask = np.ones(len(df), dtype=bool)
+    for P, quota in QUOTAS.items():
+        idx = np.flatnonzero(pos == P)
+        if len(idx) == 0:
+            continue
+        counts = dominance_counts(price[idx], ep[idx], team[idx])
+        mask[idx[counts >= quota + margin]] = False
+    mask |= np.isin(ids, list(keep))
+    return df[mask], int((~mask).sum())
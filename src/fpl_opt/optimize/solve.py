@@ -0,0 +1,62 @@
+"""CP-SAT solve wrapper that records solution-progress timings."""
+from __future__ import annotations
+import time
+from typing import Any, Dict, Tuple
+
+from ortools.sat.python import cp_model
+
+from ..utils import profiling
+
+
+class _Progress(cp_model.CpSolverSolutionCallback):
+    def __init__(self):
+        super().__init__()
+        self.t0 = time.perf_counter()
+        self.first = None
+        self.best = None
+        self.n = 0
+
+    def on_solution_callback(self):
+        t = time.perf_counter() - self.t0
+        self.n += 1
+        if self.first is None:
+            self.first = t
+        self.best = t
+
+def solve(model: cp_model.CpModel, max_time: float, num_workers: int | None = None,
+          params: Dict[str, Any] | None = None) -> Tuple[cp_model.CpSolver, int, Dict[str, Any]]:
+    """Solve and return (solver, status, stats). params sets extra CpSolver
+    parameters by name (e.g. {"linearization_level": 2}).
+
+    stats: status, wall_time, time_to_first_feasible, time_to_best,
+    time_to_optimal (None unless proven optimal), objective, best_bound, gap
+    (relative to |objective|), solutions, conflicts, branches.
+    """
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = float(max_time)
+    if num_workers:
+        solver.parameters.num_workers = int(num_workers)
+    for k, v in (params or {}).items():
+        setattr(solver.parameters, k, v)
+    cb = _Progress()
+    with profiling.stage("solve") as rec:
+        status = solver.Solve(model, cb)
+    found = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+    obj = solver.ObjectiveValue() if found else None
+    bound = solver.BestObjectiveBound() if found else None
+    stats = {
+        "status": solver.StatusName(status),
+        "wall_time": solver.WallTime(),
+        "time_to_first_feasible": cb.first,
+        "time_to_best": cb.best,
+        "time_to_optimal": solver.WallTime() if status == cp_model.OPTIMAL else None,
+        "objective": obj,
+        "best_bound": bound,
+        "gap": abs(bound - obj) / max(abs(obj), 1e-9) if obj is not None and bound is not None else None,
+        "solutions": cb.n,
+        "conflicts": solver.NumConflicts(),
+        "branches": solver.NumBranches(),
+    }
+    if rec is not None:  # profiling active
+        rec["args"]["solver"] = stats
+    return solver, status, stats
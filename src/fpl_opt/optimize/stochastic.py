@@ -0,0 +1,254 @@
+"""Squad selection against sampled points scenarios (features.simulate).
+
+Instead of plain ep_next, the XI+captain score is treated as a random variable
+over scenarios and the model maximizes either
+- "cvar":   (1 - w) * E[score] + w * CVaR_alpha(score), the mean of the worst
+  alpha share of scenarios (Rockafellar-Uryasev: one auxiliary shortfall
+  variable per scenario), or
+- "target": P(score >= target), with expected score as a tie-break.
+
+The expectation is linear in the starters, so only the risk term needs
+per-scenario rows. Thousands of scenarios are first reduced to a few hundred
+weighted representatives by k-means (reduce_scenarios); each representative
+is the real scenario nearest its cluster centre, so points stay integers and
+the tails keep their shape. `scenario_stability` shows how the chosen squad
+and its held-out score settle as the scenario count grows.
+"""
+from __future__ import annotations
+import time
+from typing import Dict, Iterable, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from ortools.sat.python import cp_model
+
+from ..features.simulate import simulate_points
+from .common import price_tenths_list
+from .hints import squad_hint
+from .model import _pool_template, _squad_frame
+from .template import SquadTemplate, _set
+
+RISKS = ("cvar", "target")
+LP_PARAMS = {"linearization_level": 2}  # the scenario rows make a full LP relaxation pay off
+
+
+def reduce_scenarios(scen: np.ndarray, n_reps: int = 200, seed: int = 0,
+                     iters: int = 25) -> Tuple[np.ndarray, np.ndarray]:
+    """(representatives [k, players], weights [k] summing to 1) by k-means.
+
+    k-means++ seeding, then Lloyd iterations; each cluster is represented by
+    its member closest to the centre, weighted by the cluster's share.
+    """
+    scen = np.asarray(scen, dtype=np.float32)
+    n = len(scen)
+    if n <= n_reps:
+        return scen, np.full(n, 1.0 / max(n, 1))
+    rng = np.random.default_rng(seed)
+    sq = np.einsum("ij,ij->i", scen, scen)
+
+    centres = np.empty((n_reps, scen.shape[1]), dtype=np.float32)
+    centres[0] = scen[rng.integers(n)]
+    d2 = np.maximum(sq - 2 * scen @ centres[0] + centres[0] @ centres[0], 0)
+    for j in range(1, n_reps):
+        total = d2.sum()
+        pick = rng.choice(n, p=d2 / total) if total > 0 else rng.integers(n)
+        centres[j] = scen[pick]
+        d2 = np.minimum(d2, np.maximum(sq - 2 * scen @ centres[j] + centres[j] @ centres[j], 0))
+
+    labels: np.ndarray | None = None
+    for _ in range(iters):
+        dist = sq[:, None] - 2 * scen @ centres.T + np.einsum("ij,ij->i", centres, centres)[None, :]
+        new = dist.argmin(axis=1)
+        if labels is not None and np.array_equal(new, labels):
+            break
+        labels = new
+        counts = np.bincount(labels, minlength=n_reps)
+        sums = np.zeros_like(centres)
+        np.add.at(sums, labels, scen)
+        live = counts > 0  # empty clusters keep their old centre
+        centres[live] = sums[live] / counts[live, None]
+
+    assert labels is not None, "iters must be >= 1"
+    own = dist[np.arange(n), labels]
+    order = np.lexsort((own, labels))
+    first = order[np.r_[True, labels[order][1:] != labels[order][:-1]]]
+    return scen[first], np.bincount(labels, minlength=n_reps)[labels[first]] / n
+
+def xi_points(scen: np.ndarray, starters: np.ndarray, captain: np.ndarray) -> np.ndarray:
+    """Per-scenario score of a fixed XI with its captain counted twice."""
+    return scen[:, np.asarray(starters, dtype=bool)].sum(axis=1) + scen[:, np.asarray(captain, dtype=bool)].sum(axis=1)
+
+def risk_stats(points: np.ndarray, weights: np.ndarray | None = None, alpha: float = 0.2,
+               target: float | None = None) -> Dict[str, float]:
+    """Weighted mean, CVaR_alpha (mean of the worst alpha share) and P(points >= target)."""
+    points = np.asarray(points, dtype=np.float64)
+    w = np.full(len(points), 1.0 / len(points)) if weights is None else np.asarray(weights, dtype=np.float64)
+    order = np.argsort(points, kind="stable")
+    p, w_sorted = points[order], w[order]
+    take = np.clip(alpha - (np.cumsum(w_sorted) - w_sorted), 0, w_sorted)  # tail mass per scenario
+    out = {"mean": float(w @ points), "cvar": float(take @ p / alpha)}
+    if target is not None:
+        out["p_target"] = float(w[points >= target].sum())
+    return out
+
+def risk_objective(stats: Dict[str, float], risk: str = "cvar", risk_weight: float = 0.5) -> float:
+    """The quantity build_squad_stochastic maximizes, from risk_stats output."""
+    if risk == "target":
+        return stats["p_target"]
+    return (1 - risk_weight) * stats["mean"] + risk_weight * stats["cvar"]
+
+def _add_var(p, lo: int, hi: int) -> int:
+    v = p.variables.add()
+    v.domain.extend([int(lo), int(hi)])
+    return len(p.variables) - 1
+
+def _add_row(p, vars_, coeffs, lo: int) -> None:
+    lin = p.constraints.add().linear
+    lin.vars.extend(vars_)
+    lin.coeffs.extend(coeffs)
+    lin.domain.extend([int(lo), cp_model.INT_MAX])
+
+def build_squad_stochastic(df: pd.DataFrame, scenarios: np.ndarray, budget_tenths: int = 1000,
+                           max_per_team: int = 3, risk: str = "cvar", risk_weight: float = 0.5,
+                           alpha: float = 0.2, target: float | None = None, n_reps: int = 200,
+                           seed: int = 0, hint_ids: Iterable[int] | None = None, prune: bool = True,
+                           max_time: float = 15.0, num_workers: int | None = None,
+                           template: SquadTemplate | None = None):
+    """Like model.build_squad, but scored on `scenarios` ([n, len(df)] points,
+    columns aligned with df rows, e.g. from simulate_points).
+
+    risk="cvar" maximizes (1 - risk_weight) * mean + risk_weight * CVaR_alpha;
+    risk="target" maximizes P(XI score >= target). Scenarios are reduced to
+    n_reps representatives first. Without hint_ids the search is warm-started
+    from the expected-points optimum on the same scenarios. prune fixes out players dominated on
+    ep_next (presolve); that is exact for the mean but only a heuristic for the
+    risk term, so pass prune=False when tails of cheap players matter.
+    Returns (squad, solver objective); the in-sample mean/cvar/p_target of the
+    chosen XI and the objective recomputed from them are in squad.attrs["risk"].
+    The two agree at OPTIMAL; after a time-out the solver's CVaR auxiliaries
+    need not be tight, so its objective only lower-bounds the recomputed one.
+    """
+    if risk not in RISKS:
+        raise ValueError(f"risk must be one of {RISKS}")
+    if risk == "target" and target is None:
+        raise ValueError("risk='target' needs a target score")
+    scenarios = np.asarray(scenarios)
+    if scenarios.ndim != 2 or scenarios.shape[1] != len(df):
+        raise ValueError("scenarios must be [n_scenarios, len(df)]")
+    ids = df["element_id"].to_numpy()
+    df, template, fixed_out, n_pruned = _pool_template(df, template, max_per_team, prune)
+    scenarios = scenarios[:, np.flatnonzero(np.isin(ids, df["element_id"].to_numpy()))]
+    live = np.ones(len(df), dtype=bool) if fixed_out is None else ~fixed_out
+
+    sub, w = reduce_scenarios(scenarios[:, live], n_reps, seed)  # cluster on players still in play
+    reps = np.zeros((len(sub), len(df)), dtype=np.int64)  # duplicates/empty clusters can leave fewer
+    reps[:, live] = np.rint(sub)
+    mean = w @ reps
+    cost = price_tenths_list(df)
+    if hint_ids is None:  # warm start from the expected-points optimum on the same scenarios
+        first = template.run(template.prepare(mean, cost, budget_tenths, fixed_out=fixed_out),
+                             min(max_time, 5.0), num_workers, LP_PARAMS)
+        hint = None if first["squad"] is None else (first["squad"], first["starters"], first["captain"])
+    else:
+        hint = squad_hint(df, hint_ids)
+    m = template.prepare(np.zeros(len(df)), cost, budget_tenths, fixed_out=fixed_out, hint=hint)
+    p = m.Proto()
+    top = np.sort(reps, axis=1)
+    ub = int((top[:, -11:].sum(axis=1) + top[:, -1]).max()) + 1  # best XI + captain in any scenario
+    si, ci = template.si, template.ci
+
+    # the hint covers x/s/c only; complete it for the auxiliary variables too
+    z = xi_points(reps, hint[1], hint[2]) if hint is not None else None
+    aux_vars, aux_vals = [], []
+
+    obj_vars, obj_coeffs = [*si.tolist(), *ci.tolist()], [*mean.tolist(), *mean.tolist()]
+    if risk == "cvar":
+        # u_k >= eta - score_k, u_k >= 0; CVaR = eta - sum_k w_k u_k / alpha at the optimum
+        eta = _add_var(p, 0, ub)
+        obj_coeffs = [(1 - risk_weight) * c for c in obj_coeffs] + [risk_weight]
+        obj_vars.append(eta)
+        if z is not None:  # eta = the hinted XI's alpha-quantile
+            order = np.argsort(z, kind="stable")
+            var = int(z[order][np.searchsorted(np.cumsum(w[order]), alpha - 1e-12)])
+            aux_vars.append(eta)
+            aux_vals.append(var)
+        for k, row in enumerate(reps):
+            u = _add_var(p, 0, ub)
+            nz = np.flatnonzero(row)
+            _add_row(p, [u, eta, *si[nz].tolist(), *ci[nz].tolist()],
+                     [1, -1, *row[nz].tolist(), *row[nz].tolist()], 0)
+            obj_vars.append(u)
+            obj_coeffs.append(-risk_weight * w[k] / alpha)
+            if z is not None:
+                aux_vars.append(u)
+                aux_vals.append(max(0, var - int(z[k])))
+    else:
+        # b_k = 1 only if score_k >= target; the mean breaks ties below one scenario's weight
+        assert target is not None
+        need = int(np.ceil(target))
+        eps = 0.01 * w.min() / ub
+        obj_coeffs = [eps * c for c in obj_coeffs]
+        for k, row in enumerate(reps):
+            b = _add_var(p, 0, 1)
+            nz = np.flatnonzero(row)
+            _add_row(p, [*si[nz].tolist(), *ci[nz].tolist(), b],
+                     [*row[nz].tolist(), *row[nz].tolist(), -need], 0)
+            obj_vars.append(b)
+            obj_coeffs.append(float(w[k]))
+            if z is not None:
+                aux_vars.append(b)
+                aux_vals.append(int(z[k] >= need))
+    p.solution_hint.vars.extend(aux_vars)
+    p.solution_hint.values.extend(aux_vals)
+    _set(p.floating_point_objective.vars, obj_vars)
+    _set(p.floating_point_objective.coeffs, [float(c) for c in obj_coeffs])
+
+    res = template.run(m, max_time, num_workers, LP_PARAMS)
+    if res["squad"] is None:
+        raise RuntimeError("No feasible solution")
+    squad = _squad_frame(df, res)
+    squad.attrs["risk"] = risk_stats(xi_points(reps, res["starters"], res["captain"]), w, alpha, target)
+    squad.attrs["risk"].update(objective=risk_objective(squad.attrs["risk"], risk, risk_weight),
+                               scenarios=len(scenarios), reps=len(reps))
+    squad.attrs["solve_stats"].update(hinted=hint is not None, pruned=n_pruned)
+    return squad, res["objective"]
+
+def _pool_mask(df: pd.DataFrame, squad: pd.DataFrame, col: str) -> np.ndarray:
+    """Boolean over df rows: the squad players flagged in `col`."""
+    return df["element_id"].isin(squad.loc[squad[col], "element_id"]).to_numpy()
+
+def scenario_stability(df: pd.DataFrame, counts: Sequence[int] = (250, 500, 1000, 2500, 5000),
+                       n_eval: int = 20_000, seed: int = 0, **kw) -> pd.DataFrame:
+    """Re-solve build_squad_stochastic on the first n of max(counts) simulated
+    scenarios for each n in counts, and score every chosen XI on an independent
+    n_eval-scenario sample.
+
+    One row per count: seconds, in-sample objective, held-out mean/cvar
+    (/p_target), `score` (the objective re-computed on the held-out sample),
+    `regret` against the best held-out score, and players shared with the
+    previous and the largest count's squads. The cheapest stable setting is
+    the smallest count after which regret stays near zero and the squad stops
+    changing.
+    """
+    risk, risk_weight = kw.get("risk", "cvar"), kw.get("risk_weight", 0.5)
+    alpha, target = kw.get("alpha", 0.2), kw.get("target")
+    scen, _ = simulate_points(df, max(counts), seed=seed)
+    held, _ = simulate_points(df, n_eval, seed=seed + 1)
+    assert scen is not None and held is not None
+    rows, squads = [], []
+    for n in sorted(counts):
+        t = time.perf_counter()
+        squad, objective = build_squad_stochastic(df, scen[:n], seed=seed, **kw)
+        seconds = time.perf_counter() - t
+        ev = risk_stats(xi_points(held, _pool_mask(df, squad, "is_starter"), _pool_mask(df, squad, "is_captain")),
+                        None, alpha, target)
+        score = risk_objective(ev, risk, risk_weight)
+        rows.append({"n_scenarios": n, "reps": squad.attrs["risk"]["reps"], "seconds": seconds,
+                     "objective": objective, **{f"eval_{k}": v for k, v in ev.items()}, "score": score,
+                     "status": squad.attrs["solve_stats"]["status"]})
+        squads.append(set(squad["element_id"].astype(int)))
+    out = pd.DataFrame(rows)
+    out["regret"] = out["score"].max() - out["score"]
+    out["shared_prev"] = [15] + [len(a & b) for a, b in zip(squads[1:], squads[:-1])]
+    out["shared_last"] = [len(s & squads[-1]) for s in squads]
+    return out
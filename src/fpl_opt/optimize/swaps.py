@@ -0,0 +1,129 @@
+"""Exact enumeration of 0-, 1- and 2-transfer moves with vectorized scoring.
+
+Every position-preserving swap (owned slot -> non-owned player) is a "single".
+Singles and all pairs of singles are checked against the cash-flow and club
+masks as arrays, and each surviving squad is re-scored through the exact
+XI/captain evaluator (xi.best_xi_batch). The incoming pool is first reduced
+with dominance pruning, which cannot remove any player an optimal move needs.
+"""
+from __future__ import annotations
+from typing import Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+
+from .common import price_tenths_list
+from .presolve import prune_dominated
+from .transfers import _sell_price_tenths
+from .xi import POS_ORDER, best_xi_batch, position_codes
+
+CHUNK = 200_000  # pairs scored per batch
+
+
+def enumerate_transfers(
+    df: pd.DataFrame,
+    current_ids: Iterable[int],
+    bank_tenths: int,
+    purchases_tenths: Dict[int, int] | None = None,
+    free_transfers: int = 1,
+    max_transfers: int = 2,
+    max_per_team: int = 3,
+    top_k: int = 10,
+    hit_cost: float = 4.0,
+) -> pd.DataFrame:
+    """Rank every legal 0..max_transfers (<= 2) move by net projected points.
+
+    df must contain rows for all 15 owned players. Returns up to top_k rows with
+    transfers_out, transfers_in, n_transfers, hits, points (XI + captain),
+    net (points - hit_cost * hits), gain (net vs. no transfer) and bank_after.
+    """
+    if max_transfers > 2:
+        raise ValueError("enumerate_transfers handles at most 2 transfers; use the CP-SAT model beyond that")
+    purchases_tenths = purchases_tenths or {}
+    cur = [int(x) for x in current_ids]
+    ids_all = df["element_id"].astype(int).to_numpy()
+    owned_mask = np.isin(ids_all, cur)
+    if owned_mask.sum() != 15:
+        missing = sorted(set(cur) - set(ids_all.tolist()))
+        raise ValueError(f"All 15 owned players must be in df; missing {missing}")
+
+    # Owned squad, slots ordered GK, DEF, MID, FWD
+    own = df[owned_mask]
+    own = own.iloc[np.argsort(position_codes(own["position"].astype(str)), kind="stable")]
+    slot_ids = own["element_id"].astype(int).to_numpy()
+    slot_pos = position_codes(own["position"].astype(str))
+    slot_team = own["team"].astype(int).to_numpy()
+    slot_ep = own["ep_next"].to_numpy(np.float32)
+    now_t = np.asarray(price_tenths_list(own))
+    slot_sell = np.array([_sell_price_tenths(int(purchases_tenths.get(pid, now)), int(now))
+                          for pid, now in zip(slot_ids, now_t)])
+
+    # Incoming pool (non-owned, non-dominated)
+    pool, _ = prune_dominated(df[~owned_mask], max_per_team=max_per_team)
+    in_ids = pool["element_id"].astype(int).to_numpy()
+    in_pos = position_codes(pool["position"].astype(str))
+    in_team = pool["team"].astype(int).to_numpy()
+    in_ep = pool["ep_next"].to_numpy(np.float32)
+    in_price = np.asarray(price_tenths_list(pool))
+
+    n_clubs = int(max(slot_team.max(), in_team.max(initial=0))) + 1
+    club_count = np.bincount(slot_team, minlength=n_clubs)
+
+    # Singles: every (slot, incoming) pair with matching position
+    o, j = np.nonzero(slot_pos[:, None] == in_pos[None, :])
+    d_cash = slot_sell[o] - in_price[j]
+    same_club = slot_team[o] == in_team[j]
+
+    layout = [POS_ORDER[p] for p in slot_pos]
+    base_pts = float(best_xi_batch(slot_ep[None, :], layout)[0])
+
+    frames: List[pd.DataFrame] = [pd.DataFrame({
+        "o1": [-1], "j1": [-1], "o2": [-1], "j2": [-1], "points": [base_pts], "cash": [0]})]
+
+    if max_transfers >= 1:
+        ok = (bank_tenths + d_cash >= 0) & (club_count[in_team[j]] + 1 - same_club <= max_per_team)
+        so, sj = o[ok], j[ok]
+        ep = np.repeat(slot_ep[None, :], len(so), axis=0)
+        ep[np.arange(len(so)), so] = in_ep[sj]
+        frames.append(pd.DataFrame({"o1": so, "j1": sj, "o2": -1, "j2": -1,
+                                    "points": best_xi_batch(ep, layout), "cash": d_cash[ok]}))
+
+    if max_transfers >= 2 and len(o) > 1:
+        a, b = np.triu_indices(len(o), 1)
+        keep = (o[a] != o[b]) & (j[a] != j[b]) & (bank_tenths + d_cash[a] + d_cash[b] >= 0)
+        a, b = a[keep], b[keep]
+        ta, tb = in_team[j[a]], in_team[j[b]]
+        oa, ob = slot_team[o[a]], slot_team[o[b]]
+        after_a = club_count[ta] + 1 + (tb == ta) - (oa == ta) - (ob == ta)
+        after_b = club_count[tb] + 1 + (ta == tb) - (oa == tb) - (ob == tb)
+        keep = (after_a <= max_per_team) & (after_b <= max_per_team)
+        a, b = a[keep], b[keep]
+        for s in range(0, len(a), CHUNK):
+            ca, cb = a[s:s + CHUNK], b[s:s + CHUNK]
+            ep = np.repeat(slot_ep[None, :], len(ca), axis=0)
+            rows = np.arange(len(ca))
+            ep[rows, o[ca]] = in_ep[j[ca]]
+            ep[rows, o[cb]] = in_ep[j[cb]]
+            frames.append(pd.DataFrame({"o1": o[ca], "j1": j[ca], "o2": o[cb], "j2": j[cb],
+                                        "points": best_xi_batch(ep, layout),
+                                        "cash": d_cash[ca] + d_cash[cb]}))
+
+    res = pd.concat(frames, ignore_index=True)
+    res["n_transfers"] = (res["o1"] >= 0).astype(int) + (res["o2"] >= 0).astype(int)
+    res["hits"] = np.maximum(0, res["n_transfers"] - int(free_transfers))
+    res["net"] = res["points"] - hit_cost * res["hits"]
+    res = res.nlargest(top_k, "net", keep="first").reset_index(drop=True)
+
+    def _ids(table, cols):
+        return [sorted(int(table[int(r[c])]) for c in cols if r[c] >= 0) for _, r in res.iterrows()]
+
+    return pd.DataFrame({
+        "transfers_out": _ids(slot_ids, ["o1", "o2"]),
+        "transfers_in": _ids(in_ids, ["j1", "j2"]),
+        "n_transfers": res["n_transfers"],
+        "hits": res["hits"],
+        "points": res["points"].astype(float),
+        "net": res["net"].astype(float),
+        "gain": res["net"].astype(float) - base_pts,
+        "bank_after": bank_tenths + res["cash"].astype(int),
+    })
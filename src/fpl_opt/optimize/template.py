@@ -0,0 +1,149 @@
+"""Squad model compiled once per candidate pool, re-solved with new data.
+
+The structure (x/s/c linking, 2-5-5-3 squad, club limit, XI shape, one
+captain) depends only on the pool's positions and clubs, so it is built once.
+Each solve clones the compiled model (sub-millisecond) and edits its proto in
+place: objective coefficients, the cost row and its bound, which players count
+as transfers, the free-transfer offset, and domains of fixed/forbidden
+players. Clones keep one template safe to share across threads.
+
+One cost row covers both models:
+- fresh squad: cost = price, bound = budget, nobody counted;
+- transfers: cost = price for buys and sell value for owned players,
+  bound = bank + total sell value of the owned squad, counted = not owned
+  (so transfers = buys = sells).
+"""
+from __future__ import annotations
+from typing import Any, Dict, Tuple
+
+import numpy as np
+import pandas as pd
+from numpy.typing import ArrayLike
+from ortools.sat.python import cp_model
+
+from .common import QUOTAS
+from .solve import solve
+
+
+def _set(field, values) -> None:
+    field.clear()
+    field.extend(values)
+
+
+class SquadTemplate:
+    def __init__(self, df: pd.DataFrame, max_per_team: int = 3):
+        self.ids = df["element_id"].to_numpy(np.int64)
+        self.max_per_team = int(max_per_team)
+        n = len(self.ids)
+        pos = df["position"].astype(str).to_numpy()
+        teams = df["team"].to_numpy(np.int64)
+
+        m = cp_model.CpModel()
+        x = [m.NewBoolVar(f"x_{i}") for i in range(n)]  # in 15-man squad
+        s = [m.NewBoolVar(f"s_{i}") for i in range(n)]  # starter
+        c = [m.NewBoolVar(f"c_{i}") for i in range(n)]  # captain
+        out = m.NewIntVar(0, 15, "transfers")
+        extra = m.NewIntVar(0, 15, "extra_transfers")
+
+        for i in range(n):
+            m.Add(s[i] <= x[i])
+            m.Add(c[i] <= s[i])
+        m.Add(sum(x) == 15)
+        for P, cnt in QUOTAS.items():
+            m.Add(sum(x[i] for i in np.flatnonzero(pos == P)) == cnt)
+        for t in np.unique(teams):
+            m.Add(sum(x[i] for i in np.flatnonzero(teams == t)) <= self.max_per_team)
+        m.Add(sum(s) == 11)
+        m.Add(sum(s[i] for i in np.flatnonzero(pos == "GK")) == 1)
+        m.Add(sum(s[i] for i in np.flatnonzero(pos == "DEF")) >= 3)
+        m.Add(sum(s[i] for i in np.flatnonzero(pos == "MID")) >= 2)
+        m.Add(sum(s[i] for i in np.flatnonzero(pos == "FWD")) >= 1)
+        m.Add(sum(c) == 1)
+
+        # Rows rewritten on every solve (placeholders here)
+        self._cost = m.Add(sum(x) >= 0).Index()    # sum cost_i x_i <= bound
+        self._count = m.Add(out == 0).Index()      # sum counted_i x_i - out == 0
+        self._extra = m.Add(extra >= out).Index()  # extra - out >= -free_transfers
+
+        self.model = m
+        self.xi = np.array([v.Index() for v in x])
+        self.si = np.array([v.Index() for v in s])
+        self.ci = np.array([v.Index() for v in c])
+        self.out_i, self.extra_i = out.Index(), extra.Index()
+
+    def matches(self, df: pd.DataFrame) -> bool:
+        """True if df lists the same players in the same order as the compiled pool."""
+        return len(df) == len(self.ids) and np.array_equal(df["element_id"].to_numpy(np.int64), self.ids)
+
+    def solve(self, ep: ArrayLike, cost_tenths: ArrayLike, bound_tenths: int,
+              counted: np.ndarray | None = None, free_transfers: int = 0, max_transfers: int = 15,
+              hit_cost: float = 4.0, fixed_in: np.ndarray | None = None,
+              fixed_out: np.ndarray | None = None,
+              hint: Tuple[np.ndarray, np.ndarray, np.ndarray] | None = None,
+              max_time: float = 15.0, num_workers: int | None = None) -> Dict[str, Any]:
+        """Solve with per-call data (arrays aligned with the pool rows).
+
+        Returns {"squad", "starters", "captain" (bool arrays), "objective",
+        "transfers", "extra_transfers", "stats"}; the arrays are None when no
+        solution was found (check stats["status"]).
+        """
+        m = self.prepare(ep, cost_tenths, bound_tenths, counted, free_transfers, max_transfers,
+                         hit_cost, fixed_in, fixed_out, hint)
+        return self.run(m, max_time, num_workers)
+
+    def prepare(self, ep: ArrayLike, cost_tenths: ArrayLike, bound_tenths: int,
+                counted: np.ndarray | None = None, free_transfers: int = 0, max_transfers: int = 15,
+                hit_cost: float = 4.0, fixed_in: np.ndarray | None = None,
+                fixed_out: np.ndarray | None = None,
+                hint: Tuple[np.ndarray, np.ndarray, np.ndarray] | None = None) -> cp_model.CpModel:
+        """The edited clone that `solve` runs, for callers that add rows or
+        objective terms of their own (see optimize.stochastic) before `run`."""
+        n = len(self.ids)
+        m = self.model.clone()
+        p = m.Proto()
+
+        ep = np.asarray(ep, dtype=np.float64)
+        obj = p.floating_point_objective
+        _set(obj.vars, [*self.si.tolist(), *self.ci.tolist(), self.extra_i])
+        _set(obj.coeffs, [*ep.tolist(), *ep.tolist(), -float(hit_cost)])
+        obj.maximize = True
+
+        lin = p.constraints[self._cost].linear
+        _set(lin.vars, self.xi.tolist())
+        _set(lin.coeffs, np.asarray(cost_tenths, dtype=np.int64).tolist())
+        _set(lin.domain, [cp_model.INT_MIN, int(bound_tenths)])
+
+        counted = np.zeros(n, dtype=bool) if counted is None else np.asarray(counted, dtype=bool)
+        lin = p.constraints[self._count].linear
+        _set(lin.vars, [*self.xi[counted].tolist(), self.out_i])
+        _set(lin.coeffs, [1] * int(counted.sum()) + [-1])
+        _set(lin.domain, [0, 0])
+        lin = p.constraints[self._extra].linear
+        _set(lin.vars, [self.extra_i, self.out_i])
+        _set(lin.coeffs, [1, -1])
+        _set(lin.domain, [-int(free_transfers), cp_model.INT_MAX])
+        _set(p.variables[self.out_i].domain, [0, max(0, min(15, int(max_transfers)))])
+
+        for mask, val in ((fixed_in, 1), (fixed_out, 0)):
+            if mask is not None:
+                for k in self.xi[np.asarray(mask, dtype=bool)]:
+                    _set(p.variables[int(k)].domain, [val, val])
+
+        if hint is not None:
+            hx, hs, hc = (np.asarray(h, dtype=np.int64) for h in hint)
+            _set(p.solution_hint.vars, [*self.xi.tolist(), *self.si.tolist(), *self.ci.tolist()])
+            _set(p.solution_hint.values, [*hx.tolist(), *hs.tolist(), *hc.tolist()])
+        return m
+
+    def run(self, m: cp_model.CpModel, max_time: float = 15.0, num_workers: int | None = None,
+            params: Dict[str, Any] | None = None) -> Dict[str, Any]:
+        """Solve a model from `prepare` and read the squad back (as `solve`)."""
+        solver, status, stats = solve(m, max_time, num_workers, params)
+        res: Dict[str, Any] = {"squad": None, "starters": None, "captain": None, "objective": None,
+                               "transfers": None, "extra_transfers": None, "stats": stats}
+        if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            sol = np.asarray(solver.ResponseProto().solution, dtype=np.int64)
+            res.update(squad=sol[self.xi] == 1, starters=sol[self.si] == 1, captain=sol[self.ci] == 1,
+                       objective=solver.ObjectiveValue(), transfers=int(sol[self.out_i]),
+                       extra_transfers=int(sol[self.extra_i]))
+        return res
@@ -1,7 +1,12 @@
 from __future__ import annotations
 from typing import Iterable, Dict, Any, Set
+import numpy as np
 import pandas as pd
-from ortools.sat.python import cp_model
+
+from .common import price_tenths_list
+from .hints import squad_hint
+from .model import _pool_template, _squad_frame
+from .template import SquadTemplate
 
 def _sell_price_tenths(buy_t: int, now_t: int) -> int:
     """FPL selling price in tenths.
@@ -21,8 +26,16 @@ def build_squad_with_transfers(
     bank_tenths: int,
     purchases_tenths: Dict[int, int] | None = None,
     free_transfers: int = 1,
-    max_extra_transfers: int = 3,
+    max_extra_transfers: int | None = 3,
     max_per_team: int = 3,
+    hint_ids: Iterable[int] | None = None,
+    warm_start: bool = True,
+    prune: bool = True,
+    sell_candidates: Iterable[int] | None = None,
+    max_time: float = 25.0,
+    num_workers: int | None = None,
+    template: SquadTemplate | None = None,
+    exclude_ids: Iterable[int] = (),
 ) -> Dict[str, Any]:
     """
     Cash-flow-aware transfer optimization.
@@ -34,16 +47,27 @@ def build_squad_with_transfers(
     - Keeps are free (already owned).
     - SELL price uses FPL's 50% rule.
     - Objective: maximize EP of XI + captain - 4 * extra_transfers.
+
+    Warm start: hint_ids (default: the current squad) is passed to CP-SAT as a
+    hint unless warm_start=False. Timings are returned under "stats".
+    prune drops strictly dominated candidates (owned players are always kept).
+    template (optimize.template.SquadTemplate compiled for df) skips model building.
+    exclude_ids can't be bought (owned players among them can still be kept).
+
+    Search-space bounds:
+    - max_extra_transfers caps transfers at free_transfers + max_extra_transfers
+      (None = unbounded).
+    - sell_candidates, if given, fixes every owned player outside that set in
+      the squad, so only those players can be sold.
     """
     purchases_tenths = purchases_tenths or {}
     cur: Set[int] = set(int(x) for x in current_ids)
+    df, template, fixed_out, n_pruned = _pool_template(df, template, max_per_team, prune, keep_ids=cur,
+                                                       exclude_ids=exclude_ids)
 
     n = len(df)
     ids = df["element_id"].astype(int).tolist()
-    price_t = (df["price"] * 10).round().astype(int).tolist()
-    ep = df["ep_next"].tolist()
-    teams = df["team"].tolist()
-    pos = df["position"].tolist()
+    price_t = price_tenths_list(df)
 
     # Precompute per-player sell prices (only relevant for currently owned)
     id_to_now_t = {ids[i]: price_t[i] for i in range(n)}
@@ -53,95 +77,38 @@ def build_squad_with_transfers(
         now_t = int(id_to_now_t.get(pid, buy_t))
         sell_price_map[pid] = _sell_price_tenths(buy_t, now_t)
 
-    m = cp_model.CpModel()
-
-    # Decision variables
-    x = [m.NewBoolVar(f"x_{i}") for i in range(n)]  # in final 15
-    s = [m.NewBoolVar(f"s_{i}") for i in range(n)]  # starter
-    c = [m.NewBoolVar(f"c_{i}") for i in range(n)]  # captain
-
-    # Linking
-    for i in range(n):
-        m.Add(s[i] <= x[i])
-        m.Add(c[i] <= s[i])
-
-    # Squad composition rules
-    m.Add(sum(x) == 15)
-    for P, cnt in [("GK", 2), ("DEF", 5), ("MID", 5), ("FWD", 3)]:
-        idx = [i for i in range(n) if pos[i] == P]
-        m.Add(sum(x[i] for i in idx) == cnt)
-
-    # Club limit
-    for t in set(teams):
-        idx = [i for i in range(n) if teams[i] == t]
-        m.Add(sum(x[i] for i in idx) <= max_per_team)
-
-    # Valid XI & captain
-    m.Add(sum(s) == 11)
-    m.Add(sum(s[i] for i in range(n) if pos[i] == "GK") == 1)
-    m.Add(sum(s[i] for i in range(n) if pos[i] == "DEF") >= 3)
-    m.Add(sum(s[i] for i in range(n) if pos[i] == "MID") >= 2)
-    m.Add(sum(s[i] for i in range(n) if pos[i] == "FWD") >= 1)
-    m.Add(sum(c) == 1)
-
-    # Identify buy/sell decisions
-    buys = []   # players not currently owned that we select (x=1)
-    sells = []  # players currently owned that we do NOT select (x=0)
-    sell_values = []
-    buy_costs = []
-
-    for i in range(n):
-        pid = ids[i]
-        if pid in cur:
-            # selling boolean: current & not kept => sell
-            o = m.NewBoolVar(f"sell_{i}")
-            m.Add(o == 1 - x[i])
-            sells.append(o)
-            sell_values.append(sell_price_map.get(pid, 0))
-        else:
-            # buying boolean: not current & selected => buy
-            b = m.NewBoolVar(f"buy_{i}")
-            m.Add(b == x[i])
-            buys.append(b)
-            buy_costs.append(price_t[i])
-
-    # Cash flow: sum(buy prices) <= bank + sum(sell prices)
-    if buys:
-        lhs = sum(buys[i] * buy_costs[i] for i in range(len(buys)))
-    else:
-        lhs = 0
-    if sells:
-        rhs = bank_tenths + sum(sells[i] * sell_values[i] for i in range(len(sells)))
-    else:
-        rhs = bank_tenths
-    m.Add(lhs <= rhs)
-
-    # Transfers counting & hit penalty
-    transfers_out = m.NewIntVar(0, 15, "transfers_out")
-    if sells:
-        m.Add(transfers_out == sum(sells))
-    else:
-        m.Add(transfers_out == 0)
-
-    extra = m.NewIntVar(0, 15, "extra_transfers")
-    m.Add(extra >= transfers_out - free_transfers)
-    m.Add(extra >= 0)
+    # Cash flow: sum(buy prices) <= bank + sum(sell prices) is, with x = final squad,
+    #   sum(price_i x_i, not owned) + sum(sell_i x_i, owned) <= bank + sum(sell_i, owned)
+    owned = np.array([pid in cur for pid in ids], dtype=bool)
+    cost = np.array([sell_price_map[pid] if pid in cur else price_t[i] for i, pid in enumerate(ids)],
+                    dtype=np.int64)
+    bound = bank_tenths + int(cost[owned].sum())
 
-    # Objective: starters + captain doubles - 4 per extra transfer
-    m.Maximize(sum(s[i] * ep[i] for i in range(n)) + sum(c[i] * ep[i] for i in range(n)) - 4.0 * extra)
+    # Hard cap on transfers (domain bound, so presolve sees it)
+    cap = 15
+    if max_extra_transfers is not None:
+        cap = min(15, max(0, free_transfers) + max(0, int(max_extra_transfers)))
 
-    solver = cp_model.CpSolver()
-    solver.parameters.max_time_in_seconds = 25.0
-    res = solver.Solve(m)
-    if res not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
-        raise RuntimeError("No feasible transfer plan under cash-flow constraints")
+    # Bounded neighbourhood: owned players outside the sell set stay
+    fixed_in = None
+    if sell_candidates is not None:
+        may_sell = {int(x) for x in sell_candidates}
+        fixed_in = owned & ~np.isin(ids, list(may_sell))
 
-    chosen_idx = [i for i in range(n) if solver.Value(x[i]) == 1]
-    squad = df.iloc[chosen_idx].copy()
-    squad["is_starter"] = [solver.Value(s[i]) == 1 for i in chosen_idx]
-    squad["is_captain"] = [solver.Value(c[i]) == 1 for i in chosen_idx]
+    # Objective: starters + captain doubles - 4 per extra transfer
+    hint = squad_hint(df, cur if hint_ids is None else hint_ids) if warm_start else None
+    res = template.solve(df["ep_next"].to_numpy(), cost, bound, counted=~owned,
+                         free_transfers=free_transfers, max_transfers=cap, hit_cost=4.0,
+                         fixed_in=fixed_in, fixed_out=fixed_out, hint=hint,
+                         max_time=max_time, num_workers=num_workers)
+    stats = res["stats"]
+    stats["hinted"] = hint is not None
+    stats["pruned"] = n_pruned
+    if res["squad"] is None:
+        raise RuntimeError("No feasible transfer plan under cash-flow constraints")
 
-    final_ids = set(int(ids[i]) for i in chosen_idx)
+    squad = _squad_frame(df, res)
+    final_ids = set(int(x) for x in squad["element_id"])
     outs_list = sorted(list(cur - final_ids))
     ins_list  = sorted(list(final_ids - cur))
 
@@ -152,11 +119,11 @@ def build_squad_with_transfers(
 
     return {
         "squad": squad,
-        "objective": solver.ObjectiveValue(),
+        "objective": res["objective"],
         "transfers_out": outs_list,
         "transfers_in": ins_list,
-        "transfers_out_count": solver.Value(transfers_out),
-        "extra_transfers": solver.Value(extra),
+        "transfers_out_count": res["transfers"],
+        "extra_transfers": res["extra_transfers"],
         "final_bank_tenths": int(final_bank),
+        "stats": stats,
     }
-
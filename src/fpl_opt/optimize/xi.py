@@ -0,0 +1,79 @@
+"""Exact starting-XI / captain selection by formation enumeration.
+
+With the squad fixed, the best XI for a formation is simply the top-k players
+of each position, and the captain is the best starter - so scoring every legal
+formation is exact and needs no solver.
+"""
+from __future__ import annotations
+from typing import List, Tuple
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+POS_ORDER = ("GK", "DEF", "MID", "FWD")
+XI_MIN = (1, 3, 2, 1)
+XI_MAX = (1, 5, 5, 3)
+# (gk, def, mid, fwd) with 11 starters
+FORMATIONS: List[Tuple[int, int, int, int]] = [
+    (1, d, m, 10 - d - m)
+    for d in range(XI_MIN[1], XI_MAX[1] + 1)
+    for m in range(XI_MIN[2], XI_MAX[2] + 1)
+    if XI_MIN[3] <= 10 - d - m <= XI_MAX[3]
+]
+
+
+def position_codes(pos: ArrayLike) -> np.ndarray:
+    """Map position labels (or already-coded ints) to 0..3 in POS_ORDER."""
+    arr = np.asarray(pos)
+    if arr.dtype.kind in "iu":
+        return arr.astype(np.int8)
+    lut = {p: i for i, p in enumerate(POS_ORDER)}
+    return np.array([lut[str(p)] for p in arr], dtype=np.int8)
+
+def best_xi(ep: ArrayLike, pos: ArrayLike) -> Tuple[np.ndarray, int, float]:
+    """(starter_mask, captain_index, points incl. captain double) for one squad.
+
+    Raises ValueError if the players can't form a legal XI.
+    """
+    pts = np.asarray(ep, dtype=np.float64)
+    codes = position_codes(pos)
+    ranked = [np.flatnonzero(codes == p)[np.argsort(-pts[codes == p], kind="stable")]
+              for p in range(4)]
+    best, best_form = -np.inf, None
+    for form in FORMATIONS:
+        if any(len(ranked[p]) < form[p] for p in range(4)):
+            continue
+        total = sum(pts[ranked[p][:form[p]]].sum() for p in range(4))
+        if total > best + 1e-12:
+            best, best_form = total, form
+    if best_form is None:
+        raise ValueError("No legal XI from these players")
+    starters = np.zeros(len(pts), dtype=bool)
+    for p in range(4):
+        starters[ranked[p][:best_form[p]]] = True
+    idx = np.flatnonzero(starters)
+    captain = int(idx[np.argmax(pts[idx])])
+    return starters, captain, float(best + pts[captain])
+
+def best_xi_batch(ep: np.ndarray, pos: ArrayLike) -> np.ndarray:
+    """Best XI + captain points for many squads sharing one position layout.
+
+    ep is [n_squads, squad_size]; column j of every squad plays position pos[j].
+    Returns float array [n_squads] (-inf where no legal XI exists).
+    """
+    ep = np.asarray(ep, dtype=np.float32)
+    codes = position_codes(pos)
+    cums, tops = [], []
+    for p in range(4):
+        block = -np.sort(-ep[:, codes == p], axis=1)
+        zero = np.zeros((ep.shape[0], 1), dtype=np.float32)
+        cums.append(np.concatenate([zero, np.cumsum(block, axis=1)], axis=1))
+        tops.append(block[:, 0] if block.shape[1] else np.full(ep.shape[0], -np.inf, np.float32))
+    best = np.full(ep.shape[0], -np.inf, dtype=np.float32)
+    for form in FORMATIONS:
+        if any(cums[p].shape[1] - 1 < form[p] for p in range(4)):
+            continue
+        best = np.maximum(best, sum(cums[p][:, form[p]] for p in range(4)))
+    # Every legal formation starts each position's best player, so the captain
+    # is the best of those regardless of formation.
+    return best + np.max(np.stack(tops, axis=1), axis=1)
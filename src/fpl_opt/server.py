@@ -0,0 +1,241 @@
+"""Long-running optimizer daemon.
+
+Keeps the latest snapshot, normalized tables, projections and the compiled
+squad model (optimize.template) in memory and answers JSON requests over
+local HTTP (or a Unix socket), so a request pays only for its solve. Data is
+reloaded in the background at the `update_times_utc` listed in
+configs/settings.yaml.
+
+    python -m fpl_opt serve --port 8765
+    curl -s localhost:8765/recommend -d '{"team": {...my_team.json...}}'
+
+Endpoints: GET /health, POST /show-current, /recommend, /apply, /refresh.
+Team bodies have the my_team.json shape; /apply takes `accept_ins` /
+`accept_outs` as lists (or "a; b" strings) of names or IDs and returns the
+updated team without writing any file.
+"""
+from __future__ import annotations
+import argparse, json, os, socket, socketserver, sys, threading, time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterable, List
+
+from .features.projcache import ProjectionCache
+from .features.projections import load_yaml
+from .ops import apply_transfers, check_team, load_payloads, parse_accept_list, prepare, recommend
+from .optimize.model import pick_xi_from_squad
+from .optimize.template import SquadTemplate
+
+SETTINGS = "configs/settings.yaml"
+
+def next_refresh(now: datetime, times: Iterable[str]) -> datetime:
+    """First of the daily "HH:MM" UTC times strictly after `now`."""
+    now = now.astimezone(timezone.utc)
+    slots = []
+    for t in times:
+        hh, mm = (int(x) for x in str(t).split(":"))
+        at = now.replace(hour=hh, minute=mm, second=0, microsecond=0)
+        slots.append(at if at > now else at + timedelta(days=1))
+    if not slots:
+        raise ValueError("no update times")
+    return min(slots)
+
+def _lineup(squad) -> Dict[str, Any]:
+    return {
+        "starters": [int(x) for x in squad.loc[squad["is_starter"], "element_id"]],
+        "bench": [int(x) for x in squad.loc[~squad["is_starter"], "element_id"]],
+        "captain": int(squad.loc[squad["is_captain"], "element_id"].iloc[0]),
+    }
+
+def _ids(v, lut: Dict[str, int]) -> List[int]:
+    return parse_accept_list(";".join(str(x) for x in v) if isinstance(v, list) else v, lut)
+
+
+class State:
+    """Warm data for the handlers. `refresh` builds a new snapshot dict and swaps
+    it in whole, so in-flight requests keep reading the one they started with."""
+
+    def __init__(self, offline: bool = False, as_of: str | None = None,
+                 weights_path: str = "configs/weights.yaml", threads: int | None = None,
+                 max_time: float = 25.0):
+        self.offline, self.as_of, self.weights_path = offline, as_of, weights_path
+        self.threads, self.max_time = threads, max_time
+        self.snap: Dict[str, Any] | None = None
+        self.proj_cache = ProjectionCache()
+        self._lock = threading.Lock()  # one refresh at a time
+
+    def refresh(self) -> Dict[str, Any]:
+        with self._lock:
+            t0 = time.perf_counter()
+            bs, fx, bh, fh = load_payloads(self.offline, self.as_of, None)
+            snap = prepare(bs, fx, bh, fh, self.weights_path, self.proj_cache)
+            snap["template"] = SquadTemplate(snap["candidates"])
+            snap.update(loaded_at=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                        hashes=[bh, fh], load_seconds=time.perf_counter() - t0)
+            self.snap = snap
+            return self.info()
+
+    def current(self) -> Dict[str, Any]:
+        if self.snap is None:
+            raise RuntimeError("No data loaded yet; refresh() first")
+        return self.snap
+
+    def info(self) -> Dict[str, Any]:
+        s = self.current()
+        return {"loaded_at": s["loaded_at"], "hashes": s["hashes"],
+                "load_seconds": round(s["load_seconds"], 3), "candidates": len(s["candidates"]),
+                "projection_cache": self.proj_cache.stats()}
+
+    # ---- ops (body -> response dict); SystemExit means a bad request ----
+
+    def show_current(self, body: Dict) -> Dict[str, Any]:
+        s = self.current()
+        cfg = check_team(dict(body["team"]))
+        df15 = s["candidates"][s["candidates"]["element_id"].isin(cfg["element_ids"])]
+        missing = sorted(set(cfg["element_ids"]) - set(df15["element_id"].astype(int)))
+        xi_df, xi_obj = pick_xi_from_squad(df15.copy())
+        return {**_lineup(xi_df), "points": float(xi_obj), "missing": missing}
+
+    def recommend(self, body: Dict) -> Dict[str, Any]:
+        s = self.current()
+        cfg = check_team(dict(body["team"]))
+        sell = _ids(body["sell_candidates"], s["name_lut"]) if body.get("sell_candidates") else None
+        ranked, res = recommend(s["proj"], s["candidates"], cfg,
+                                 int(body.get("max_extra_transfers", 3)), int(body.get("top_k", 5)),
+                                 sell_candidates=sell, num_workers=self.threads,
+                                 max_time=float(body.get("max_time", self.max_time)),
+                                 template=s["template"])
+        moves = [{"transfers_out": [int(x) for x in r.transfers_out],
+                  "transfers_in": [int(x) for x in r.transfers_in],
+                  "hits": int(r.hits), "net": float(r.net), "gain": float(r.gain),
+                  "bank_after": int(r.bank_after)} for r in ranked.itertuples()] if ranked is not None else []
+        return {
+            "moves": moves,
+            "transfers_out": [int(x) for x in res["transfers_out"]],
+            "transfers_in": [int(x) for x in res["transfers_in"]],
+            "extra_transfers": int(res["extra_transfers"]),
+            "final_bank_tenths": int(res["final_bank_tenths"]),
+            "objective": float(res["objective"]),
+            **_lineup(res["squad"]),
+            "stats": res["stats"],
+        }
+
+    def apply(self, body: Dict) -> Dict[str, Any]:
+        s = self.current()
+        cfg = check_team(dict(body["team"]))
+        ins = _ids(body.get("accept_ins") or [], s["name_lut"])
+        outs = _ids(body.get("accept_outs") or [], s["name_lut"])
+        new_cfg, outs = apply_transfers(cfg, s["candidates"], ins, outs)
+        return {"team": new_cfg, "transfers_in": ins, "transfers_out": outs}
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    state: State  # set on the server-specific subclass in make_server
+
+    def _send(self, code: int, payload: Dict) -> None:
+        data = json.dumps(payload, default=str).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/health":
+            return self._send(200, {"ok": True, **self.state.info()})
+        self._send(404, {"error": f"unknown path {self.path}"})
+
+    def do_POST(self):
+        ops = {"/show-current": self.state.show_current, "/recommend": self.state.recommend,
+               "/apply": self.state.apply, "/refresh": lambda body: self.state.refresh()}
+        n = int(self.headers.get("Content-Length") or 0)
+        if self.path not in ops:
+            self.rfile.read(n)
+            return self._send(404, {"error": f"unknown path {self.path}"})
+        t0 = time.perf_counter()
+        try:
+            body = json.loads(self.rfile.read(n) or b"{}")
+            out = ops[self.path](body)
+        except (SystemExit, KeyError, ValueError, TypeError) as e:
+            return self._send(400, {"error": str(e) or type(e).__name__})
+        except Exception as e:
+            return self._send(500, {"error": f"{type(e).__name__}: {e}"})
+        out["seconds"] = time.perf_counter() - t0
+        self._send(200, out)
+
+    def address_string(self) -> str:
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, fmt, *args):
+        sys.stderr.write(f"[{self.log_date_time_string()}] {fmt % args}\n")
+
+
+class UnixHTTPServer(ThreadingHTTPServer):
+    address_family = socket.AF_UNIX
+
+    def server_bind(self):
+        socketserver.TCPServer.server_bind(self)
+        self.server_name, self.server_port = "localhost", 0
+
+
+def make_server(state: State, host: str = "127.0.0.1", port: int = 8765,
+                unix_socket: str | None = None) -> ThreadingHTTPServer:
+    handler = type("BoundHandler", (Handler,), {"state": state})
+    if unix_socket:
+        if os.path.exists(unix_socket):
+            os.unlink(unix_socket)
+        return UnixHTTPServer(unix_socket, handler)  # type: ignore[arg-type]  # AF_UNIX binds a path, not (host, port)
+    return ThreadingHTTPServer((host, port), handler)
+
+def start_refresher(state: State, times: Iterable[str], stop: threading.Event) -> threading.Thread:
+    """Daemon thread that reloads `state` at each scheduled time until `stop` is set."""
+    times = list(times)
+
+    def loop():
+        while True:
+            wait = (next_refresh(datetime.now(timezone.utc), times) - datetime.now(timezone.utc)).total_seconds()
+            if stop.wait(max(0.0, wait)):
+                return
+            try:
+                info = state.refresh()
+                sys.stderr.write(f"refreshed data: {info}\n")
+            except (Exception, SystemExit) as e:  # keep serving the previous snapshot
+                sys.stderr.write(f"refresh failed, keeping previous data: {e}\n")
+
+    t = threading.Thread(target=loop, name="fpl-refresh", daemon=True)
+    t.start()
+    return t
+
+def main(argv: List[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description="FPL optimizer daemon")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--socket", type=str, default=None, help="Listen on this Unix socket instead of TCP")
+    ap.add_argument("--settings", default=SETTINGS)
+    ap.add_argument("--threads", type=int, default=None, help="CP-SAT threads per solve")
+    ap.add_argument("--max-time", type=float, default=25.0, help="Default solver time limit (s)")
+    ap.add_argument("--offline", action="store_true", help="Serve the newest stored snapshot (reloaded on schedule)")
+    ap.add_argument("--as-of", type=str, default=None)
+    args = ap.parse_args(argv)
+
+    settings = load_yaml(args.settings) or {}
+    state = State(args.offline, args.as_of, threads=args.threads, max_time=args.max_time)
+    sys.stderr.write(f"loaded data: {state.refresh()}\n")
+    stop = threading.Event()
+    if not args.as_of:  # a pinned snapshot never changes
+        start_refresher(state, settings.get("update_times_utc", ["06:00", "18:00"]), stop)
+    server = make_server(state, args.host, args.port, args.socket)
+    where = args.socket or f"http://{args.host}:{server.server_address[1]}"
+    sys.stderr.write(f"serving on {where}\n")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
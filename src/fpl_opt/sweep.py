@@ -0,0 +1,271 @@
+"""How stable are recommendations across plausible projection weights?
+
+Weight sets come from a grid over chosen configs/weights.yaml entries or from
+random multiplicative jitter of every numeric entry. All sets are projected at
+once (features.projections.project_weight_sets, a sets x players matrix) and
+solved over a fork-based process pool sharing one compiled squad model, as
+in batch.py. Sets are ordered into a nearest-neighbour chain and handed out as
+contiguous blocks, so within a block each solve is warm-started from the
+previous (neighbouring) point's squad. The report counts how often each
+player is picked (and, with --current-team, each transfer) across the sweep.
+
+    python -m fpl_opt sweep --samples 64 --scale 0.15 --offline
+    python -m fpl_opt sweep --grid grid.yaml --current-team my_team.json
+
+A grid file maps dotted weight keys to value lists, e.g.
+`{ppg_weight: [0.5, 0.7, 0.9], fixture_bump.5: [0.8, 0.86, 0.92]}`.
+"""
+from __future__ import annotations
+import argparse, copy, itertools, json, math, multiprocessing as mp, os, time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing.context import BaseContext
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+from rich.console import Console
+from rich.table import Table
+
+from .features.projections import load_yaml, project_weight_sets
+from .fplio.tablecache import normalized_tables
+from .ops import load_current_team, load_payloads
+from .optimize.model import build_squad
+from .optimize.template import SquadTemplate
+from .optimize.transfers import build_squad_with_transfers
+
+DEFAULTS = {"ppg_weight": 0.7, "form_weight": 0.3}  # projections' fallbacks, so they get swept too
+
+# Shared with forked workers (set in the parent before the pool starts)
+_POOL: pd.DataFrame | None = None
+_EP: np.ndarray | None = None
+_LIVE: np.ndarray | None = None
+_TEMPLATE: SquadTemplate | None = None
+_TEAM: Dict | None = None
+
+console = Console()
+
+
+def _flatten(weights: Dict, prefix: str = "") -> Dict[str, float]:
+    out = {}
+    for k, v in weights.items():
+        key = f"{prefix}{k}"
+        if isinstance(v, dict):
+            out.update(_flatten(v, key + "."))
+        elif isinstance(v, (int, float)) and not isinstance(v, bool):
+            out[key] = float(v)
+    return out
+
+def _key(d: Dict, part: str):
+    return int(part) if part.isdigit() and int(part) in d else part  # YAML int keys (fixture_bump)
+
+def _set_key(weights: Dict, key: str, value: float) -> None:
+    *path, leaf = key.split(".")
+    d = weights
+    for part in path:
+        d = d[_key(d, part)]
+    if _key(d, leaf) not in d:
+        raise KeyError(f"unknown weight {key!r}")
+    d[_key(d, leaf)] = value
+
+def grid_weight_sets(base: Dict, grid: Dict[str, Sequence[float]]) -> List[Dict]:
+    """Cartesian product of `grid` ({dotted key: values}) applied to base."""
+    base = {**DEFAULTS, **base}
+    keys = list(grid)
+    out = []
+    for combo in itertools.product(*(grid[k] for k in keys)):
+        w = copy.deepcopy(base)
+        for k, v in zip(keys, combo):
+            _set_key(w, k, float(v))
+        out.append(w)
+    return out
+
+def random_weight_sets(base: Dict, n: int, scale: float = 0.15, seed: int = 0) -> List[Dict]:
+    """base plus n - 1 copies with every numeric entry scaled by U(1 - scale, 1 + scale)."""
+    base = {**DEFAULTS, **base}
+    rng = np.random.default_rng(seed)
+    flat = _flatten(base)
+    out = [copy.deepcopy(base)]
+    for _ in range(n - 1):
+        w = copy.deepcopy(base)
+        for k, v in flat.items():
+            _set_key(w, k, v * float(rng.uniform(1 - scale, 1 + scale)))
+        out.append(w)
+    return out
+
+def neighbour_order(weight_sets: Sequence[Dict]) -> np.ndarray:
+    """Greedy nearest-neighbour chain through the sets (entries scaled to unit
+    range), starting from the first; consecutive sets are then close."""
+    keys = sorted(_flatten(weight_sets[0]))
+    X = np.array([[_flatten(w).get(k, 0.0) for k in keys] for w in weight_sets])
+    span = X.max(axis=0) - X.min(axis=0)
+    X = X / np.where(span > 0, span, 1.0)
+    order, left = [0], np.ones(len(X), dtype=bool)
+    left[0] = False
+    while left.any():
+        d = ((X[left] - X[order[-1]]) ** 2).sum(axis=1)
+        nxt = int(np.flatnonzero(left)[np.argmin(d)])
+        order.append(nxt)
+        left[nxt] = False
+    return np.array(order)
+
+
+def _init_worker(pool, ep, live, team) -> None:
+    global _POOL, _EP, _LIVE, _TEMPLATE, _TEAM
+    if pool is not None:
+        _POOL, _EP, _LIVE, _TEAM = pool, ep, live, team
+        _TEMPLATE = SquadTemplate(pool)
+
+def _solve_block(points: List[int], threads: int, max_time: float, max_extra_transfers: int) -> List[Dict[str, Any]]:
+    """Solve consecutive weight points, each warm-started from the previous squad."""
+    assert _POOL is not None and _EP is not None and _LIVE is not None
+    out, prev = [], None
+    ids = _POOL["element_id"].to_numpy()
+    for i in points:
+        t0 = time.perf_counter()
+        df = _POOL.assign(ep_next=_EP[i])
+        excluded = ids[~_LIVE[i]]  # no minutes under these weights: not a candidate
+        try:
+            if _TEAM is None:
+                squad, objective = build_squad(df, hint_ids=prev, max_time=max_time, num_workers=threads,
+                                               template=_TEMPLATE, exclude_ids=excluded)
+                rec = {}
+            else:
+                res = build_squad_with_transfers(
+                    df, _TEAM["element_ids"], _TEAM["bank_tenths"], _TEAM["purchases_tenths"],
+                    _TEAM["free_transfers"], max_extra_transfers, hint_ids=prev, max_time=max_time,
+                    num_workers=threads, template=_TEMPLATE, exclude_ids=excluded)
+                squad, objective = res["squad"], res["objective"]
+                rec = {"transfers_in": [int(x) for x in res["transfers_in"]],
+                       "transfers_out": [int(x) for x in res["transfers_out"]]}
+        except (RuntimeError, ValueError) as e:
+            out.append({"point": int(i), "error": str(e)})
+            continue
+        prev = [int(x) for x in squad["element_id"]]
+        out.append({
+            "point": int(i), "objective": float(objective), "squad": prev,
+            "starters": [int(x) for x in squad.loc[squad["is_starter"], "element_id"]],
+            "captain": int(squad.loc[squad["is_captain"], "element_id"].iloc[0]),
+            **rec, "status": squad.attrs["solve_stats"]["status"],
+            "hinted": squad.attrs["solve_stats"]["hinted"], "seconds": time.perf_counter() - t0,
+        })
+    return out
+
+def run_sweep(pool: pd.DataFrame, ep: np.ndarray, live: np.ndarray, team: Dict | None = None,
+              order: Sequence[int] | np.ndarray | None = None, workers: int | None = None, threads: int = 1,
+              max_time: float = 10.0, max_extra_transfers: int = 3) -> List[Dict[str, Any]]:
+    """Solve every row of ep ([sets, len(pool)], aligned with pool rows) over a
+    process pool; live masks players with minutes per set. Points are taken in
+    `order` (default: as given) in one contiguous block per worker. Returns
+    one record per point, sorted by point."""
+    global _POOL, _EP, _LIVE, _TEMPLATE, _TEAM
+    order = list(range(len(ep)) if order is None else order)
+    workers = min(len(order), workers or max(1, (os.cpu_count() or 1) // max(1, threads)))
+    _POOL, _EP, _LIVE, _TEAM = pool, ep, live, team
+    _TEMPLATE = SquadTemplate(pool)
+    if "fork" in mp.get_all_start_methods():
+        ctx: BaseContext = mp.get_context("fork")
+        initargs: tuple = (None, None, None, None)
+    else:
+        ctx, initargs = mp.get_context("spawn"), (pool, ep, live, team)
+
+    size = math.ceil(len(order) / max(1, workers))
+    blocks = [order[k:k + size] for k in range(0, len(order), size)]
+    out: List[Dict[str, Any]] = []
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                             initializer=_init_worker, initargs=initargs) as ex:
+        futs = [ex.submit(_solve_block, b, threads, max_time, max_extra_transfers) for b in blocks]
+        for fut in as_completed(futs):
+            out.extend(fut.result())
+    return sorted(out, key=lambda r: r["point"])
+
+def stability_report(results: List[Dict[str, Any]], names: Dict[int, str]) -> Dict[str, pd.DataFrame]:
+    """Share of solved points in which each player is in the squad / XI / captaincy,
+    and (transfer sweeps) each transfer and whole move set is recommended."""
+    ok = [r for r in results if "error" not in r]
+    n = max(len(ok), 1)
+    squad: Counter[int] = Counter()
+    xi: Counter[int] = Counter()
+    cap = Counter(r["captain"] for r in ok)
+    for r in ok:
+        squad.update(r["squad"])
+        xi.update(r["starters"])
+    players = pd.DataFrame([{"element_id": pid, "name": names.get(pid, str(pid)), "squad": squad[pid] / n,
+                             "xi": xi[pid] / n, "captain": cap[pid] / n} for pid in squad],
+                           columns=["element_id", "name", "squad", "xi", "captain"])
+    players = players.sort_values(["squad", "xi", "captain"], ascending=False, ignore_index=True)
+    out = {"players": players}
+    if ok and "transfers_in" in ok[0]:
+        moves = Counter((tuple(r["transfers_out"]), tuple(r["transfers_in"])) for r in ok)
+        single: Counter[tuple[str, int]] = Counter()
+        for r in ok:
+            single.update(("out", p) for p in r["transfers_out"])
+            single.update(("in", p) for p in r["transfers_in"])
+        out["transfers"] = pd.DataFrame(
+            [{"direction": d, "element_id": p, "name": names.get(p, str(p)), "share": c / n}
+             for (d, p), c in single.most_common()], columns=["direction", "element_id", "name", "share"])
+        fmt = lambda ids: ", ".join(names.get(p, str(p)) for p in ids) or "-"
+        out["moves"] = pd.DataFrame([{"out": fmt(o), "in": fmt(i), "share": c / n}
+                                     for (o, i), c in moves.most_common()])
+    return out
+
+def _print_table(df: pd.DataFrame, title: str, rows: int) -> None:
+    t = Table(title=title)
+    for col in df.columns:
+        t.add_column(str(col))
+    for r in df.head(rows).itertuples(index=False):
+        t.add_row(*[f"{v:.0%}" if isinstance(v, float) else str(v) for v in r])
+    console.print(t)
+
+def main(argv: List[str] | None = None) -> None:
+    ap = argparse.ArgumentParser(description="Sensitivity sweep over projection weights")
+    src = ap.add_mutually_exclusive_group()
+    src.add_argument("--grid", type=str, default=None, help="YAML of {dotted weight key: [values]}")
+    src.add_argument("--samples", type=int, default=32, help="Random weight sets (incl. the base set)")
+    ap.add_argument("--scale", type=float, default=0.15, help="Relative jitter for --samples")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--weights", default="configs/weights.yaml")
+    ap.add_argument("--current-team", type=str, default=None, help="Sweep transfer recommendations for this team")
+    ap.add_argument("--max-extra-transfers", type=int, default=3)
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--threads", type=int, default=1, help="CP-SAT threads per worker")
+    ap.add_argument("--max-time", type=float, default=10.0, help="Solver time limit per point (s)")
+    ap.add_argument("--out", type=str, default=None, help="Also write per-point results (JSONL) here")
+    ap.add_argument("--top", type=int, default=25, help="Rows per report table")
+    ap.add_argument("--offline", action="store_true")
+    ap.add_argument("--as-of", type=str, default=None)
+    args = ap.parse_args(argv)
+
+    t0 = time.perf_counter()
+    base = load_yaml(args.weights)
+    sets = (grid_weight_sets(base, load_yaml(args.grid)) if args.grid
+            else random_weight_sets(base, args.samples, args.scale, args.seed))
+    bs, fx, bh, fh = load_payloads(args.offline, args.as_of, None)
+    players, teams, fixtures = normalized_tables(bs, fx, bh, fh)
+    frame, ep, minutes = project_weight_sets(players, teams, fixtures, sets)
+    live = minutes > 0
+    keep = live.any(axis=0)  # candidates under at least one set
+    team = load_current_team(args.current_team) if args.current_team else None
+    if team is not None:
+        keep |= frame["element_id"].isin(team["element_ids"]).to_numpy()
+    pool = frame[keep].reset_index(drop=True)
+
+    results = run_sweep(pool, ep[:, keep], live[:, keep], team, neighbour_order(sets), args.workers,
+                        args.threads, args.max_time, args.max_extra_transfers)
+    if args.out:
+        with open(args.out, "w") as f:
+            for r in results:
+                f.write(json.dumps({**r, "weights": _flatten(sets[r["point"]])}) + "\n")
+
+    names = {int(i): str(n) for i, n in zip(pool["element_id"], pool["web_name"])}
+    report = stability_report(results, names)
+    failed = sum("error" in r for r in results)
+    _print_table(report["players"], f"Player pick rate over {len(results) - failed} weight sets", args.top)
+    if "moves" in report:
+        _print_table(report["moves"], "Recommended move sets", args.top)
+        _print_table(report["transfers"], "Individual transfers", args.top)
+    console.print(f"{len(results)} weight sets ({failed} failed) in {time.perf_counter() - t0:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
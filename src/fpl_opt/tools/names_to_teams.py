@@ -3,12 +3,14 @@ import json, sys
 from pathlib import Path
 from typing import List
 from fpl_opt.fplio.api import get_bootstrap_static
+from fpl_opt.fplio.client import FPLClient
 
 def normalize(s: str) -> str:
     return " ".join(s.lower().split())
 
-def build_team_from_names(names: List[str], bank_tenths: int = 0, free_transfers: int = 1) -> dict:
-    bs = get_bootstrap_static(save=False)
+def build_team_from_names(names: List[str], bank_tenths: int = 0, free_transfers: int = 1,
+                          client: FPLClient | None = None) -> dict:
+    bs = get_bootstrap_static(save=False, client=client)
     elements = bs["elements"]
     # map web_name and "first last" to id
     lookup = {}
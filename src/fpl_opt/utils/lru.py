@@ -0,0 +1,47 @@
+"""Size-capped, least-recently-used trimming of an on-disk cache directory.
+
+An entry is either a table directory (complete once its meta.json exists) or
+a plain .json file; its last use is that file's mtime, so readers refresh it
+with os.utime on a hit.
+"""
+from __future__ import annotations
+import pathlib, shutil
+from typing import Container, List, Tuple
+
+
+def _dir_bytes(path: pathlib.Path) -> int:
+    return sum(f.stat().st_size for f in path.iterdir() if f.is_file())
+
+def cache_entries(root: pathlib.Path) -> List[Tuple[float, str, int]]:
+    """(last use, name, bytes) of the complete entries under root."""
+    out = []
+    for p in root.iterdir() if root.exists() else ():
+        try:
+            if p.is_dir() and (p / "meta.json").exists():
+                out.append(((p / "meta.json").stat().st_mtime, p.name, _dir_bytes(p)))
+            elif p.suffix == ".json":
+                st = p.stat()
+                out.append((st.st_mtime, p.name, st.st_size))
+        except FileNotFoundError:  # evicted by another process meanwhile
+            continue
+    return out
+
+def evict_lru(root: str | pathlib.Path, max_bytes: int, keep: Container[str] = ()) -> int:
+    """Delete the least recently used entries under root until they total at
+    most max_bytes; entries named in `keep` are spared. Returns the count."""
+    root = pathlib.Path(root)
+    entries = cache_entries(root)
+    total, n = sum(e[2] for e in entries), 0
+    for _, name, size in sorted(entries):
+        if total <= max_bytes:
+            break
+        if name in keep:
+            continue
+        p = root / name
+        if p.is_dir():
+            shutil.rmtree(p, ignore_errors=True)
+        else:
+            p.unlink(missing_ok=True)
+        total -= size
+        n += 1
+    return n
@@ -0,0 +1,120 @@
+"""Per-stage wall/CPU/peak-memory timings, CP-SAT stats and Chrome trace export.
+
+Code marks stages with the module-level `stage(name)`, which is a no-op
+unless a Profiler has been activated (cli `--profile`), and on threads other
+than the activating one: the stage stack and tracemalloc's peak are
+per-process, so e.g. daemon handler threads are never profiled. Stages nest;
+the summary shows each stage's own time next to its total so e.g. model
+building is the `optimize` self time and the solve is its `solve` child.
+"""
+from __future__ import annotations
+import json, os, threading, time, tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, List
+
+from rich.table import Table
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None  # type: ignore[assignment]
+
+_ACTIVE: "Profiler | None" = None
+
+
+class Profiler:
+    def __init__(self, memory: bool = True):
+        self.memory = memory
+        self.records: List[Dict[str, Any]] = []
+        self._stack: List[Dict[str, Any]] = []
+        self.thread = threading.get_ident()
+        self.t0 = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str):
+        if self.memory:
+            if self._stack:  # the reset below would lose the parent's peak so far
+                self._stack[-1]["peak"] = max(self._stack[-1]["peak"], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        path = "/".join([r["name"] for r in self._stack] + [name])
+        rec: Dict[str, Any] = {"name": name, "path": path, "depth": len(self._stack), "start": time.perf_counter() - self.t0,
+               "cpu": time.process_time(), "peak": 0, "child_wall": 0.0, "args": {}}
+        self.records.append(rec)
+        self._stack.append(rec)
+        t = time.perf_counter()
+        try:
+            yield rec
+        finally:
+            rec["wall"] = time.perf_counter() - t
+            rec["cpu"] = time.process_time() - rec["cpu"]
+            if self.memory:
+                rec["peak"] = max(rec["peak"], tracemalloc.get_traced_memory()[1])
+            self._stack.pop()
+            if self._stack:
+                self._stack[-1]["child_wall"] += rec["wall"]
+                self._stack[-1]["peak"] = max(self._stack[-1]["peak"], rec["peak"])
+
+    def summary(self) -> Table:
+        t = Table(title="Profile")
+        for col in ["stage", "wall s", "self s", "cpu s", "peak MB"]:
+            t.add_column(col, justify="left" if col == "stage" else "right")
+        for r in self.records:
+            if "wall" not in r:
+                continue
+            peak = f"{r['peak'] / 2**20:.1f}" if self.memory else "-"
+            t.add_row("  " * r["depth"] + r["name"], f"{r['wall']:.3f}",
+                      f"{r['wall'] - r['child_wall']:.3f}", f"{r['cpu']:.3f}", peak)
+        if resource is not None:
+            rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB on Linux
+            t.caption = f"process max RSS {rss:.0f} MB (includes native solver memory)"
+        return t
+
+    def solver_summary(self) -> Table | None:
+        rows = [r for r in self.records if "solver" in r["args"]]  # set by optimize.solve
+        if not rows:
+            return None
+        t = Table(title="CP-SAT")
+        for col in ["stage", "status", "wall s", "conflicts", "branches", "objective", "bound", "gap"]:
+            t.add_column(col)
+        fmt = lambda v, spec: "-" if v is None else format(v, spec)
+        for r in rows:
+            s = r["args"]["solver"]
+            t.add_row(r["path"], str(s["status"]).lower(), f"{s['wall_time']:.2f}",
+                      str(s.get("conflicts", "-")), str(s.get("branches", "-")),
+                      fmt(s.get("objective"), ".2f"), fmt(s.get("best_bound"), ".2f"),
+                      fmt(s.get("gap"), ".2%"))
+        return t
+
+    def write_trace(self, path: str) -> None:
+        """Chrome trace-event JSON (open in chrome://tracing or Perfetto)."""
+        pid, tid = os.getpid(), threading.get_ident()
+        events = [{
+            "name": r["name"], "cat": "stage", "ph": "X", "pid": pid, "tid": tid,
+            "ts": round(r["start"] * 1e6), "dur": round(r["wall"] * 1e6),
+            "args": {"cpu_s": r["cpu"], "peak_mb": r["peak"] / 2**20, **r["args"]},
+        } for r in self.records if "wall" in r]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, default=str)
+
+
+def activate(memory: bool = True) -> Profiler:
+    global _ACTIVE
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _ACTIVE = Profiler(memory)
+    return _ACTIVE
+
+def deactivate() -> None:
+    global _ACTIVE
+    if _ACTIVE is not None and _ACTIVE.memory and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _ACTIVE = None
+
+def stage(name: str):
+    """Time a block under the active profiler, if any and if on its thread. Yields
+    the stage record (None otherwise) so callers can attach trace args such as
+    solver stats."""
+    prof = _ACTIVE
+    if prof is None or threading.get_ident() != prof.thread:
+        return nullcontext()
+    return prof.stage(name)
@@ -0,0 +1,124 @@
+"""Deterministic synthetic FPL payloads for tests, benchmarks and offline demos.
+
+Shapes match the live `bootstrap-static` / `fixtures` endpoints closely enough
+for normalize.* and everything downstream.
+"""
+import numpy as np
+
+_POS_PER_TEAM = {1: 3, 2: 9, 3: 10, 4: 4}
+_PRICE_RANGE = {1: (40, 55), 2: (40, 70), 3: (45, 130), 4: (45, 140)}
+
+def make_bootstrap(n_teams=20, seed=0):
+    rng = np.random.default_rng(seed)
+    teams = [{"id": t, "name": f"Team {t}", "short_name": f"T{t:02d}"} for t in range(1, n_teams + 1)]
+    elements, pid = [], 1
+    for t in range(1, n_teams + 1):
+        for et, cnt in _POS_PER_TEAM.items():
+            lo, hi = _PRICE_RANGE[et]
+            for _ in range(cnt):
+                cost = int(rng.integers(lo, hi + 1))
+                quality = (cost - lo) / (hi - lo + 1)
+                status = rng.choice(["a", "a", "a", "a", "a", "a", "d", "i", "u"])
+                elements.append({
+                    "id": pid, "web_name": f"P{pid}", "first_name": "Player", "second_name": str(pid),
+                    "team": t, "element_type": et, "now_cost": cost, "status": str(status),
+                    "chance_of_playing_next_round": None if status == "a" else 50,
+                    "form": f"{rng.uniform(0, 8) * (0.5 + quality):.1f}",
+                    "points_per_game": f"{rng.uniform(1, 6) * (0.6 + quality):.1f}",
+                })
+                pid += 1
+    events = [{"id": gw, "is_current": gw == 4, "is_next": gw == 5} for gw in range(1, 39)]
+    return {"elements": elements, "teams": teams, "events": events}
+
+def make_fixtures(n_teams=20, first_gw=5, seed=0):
+    """Double round robin from first_gw on; GW10 has two blanks that move to GW12 (a double)."""
+    rng = np.random.default_rng(seed)
+    ids = list(range(1, n_teams + 1))
+    rounds = []
+    for r in range(n_teams - 1):
+        pairs = [(ids[i], ids[-1 - i]) for i in range(n_teams // 2)]
+        rounds.append(pairs)
+        ids = [ids[0]] + [ids[-1]] + ids[1:-1]
+    rounds += [[(a, h) for h, a in rnd] for rnd in rounds]
+    out, fid = [], 1
+    for gw, rnd in enumerate(rounds, start=1):
+        for h, a in rnd:
+            event = gw
+            if gw == 10 and (h, a) == rnd[0]:
+                event = 12
+            if gw < first_gw:
+                continue
+            out.append({"id": fid, "event": event, "team_h": h, "team_a": a,
+                        "team_h_difficulty": int(rng.integers(2, 6)),
+                        "team_a_difficulty": int(rng.integers(2, 6)),
+                        "kickoff_time": f"2024-{8 + gw // 5:02d}-{1 + gw % 28:02d}T15:00:00Z"})
+            fid += 1
+    out.append({"id": fid, "event": None, "team_h": 1, "team_a": 2, "team_h_difficulty": 3,
+                "team_a_difficulty": 3, "kickoff_time": None})
+    return out
+
+def make_candidates(seed=0, weights_path="configs/weights.yaml"):
+    """Projected candidate pool (exp_minutes > 0) built from the synthetic payloads."""
+    from ..features.projections import project_next_gw
+    from ..fplio.normalize import fixtures_table, players_table, teams_table
+
+    bs, fx = make_bootstrap(seed=seed), make_fixtures(seed=seed)
+    proj = project_next_gw(players_table(bs), teams_table(bs), fixtures_table(fx), weights_path)
+    return proj[proj["exp_minutes"] > 0].reset_index(drop=True)
+
+def make_season(root, first_gw=5, last_gw=10, seed=0):
+    """Write a replayable mini season under `root`: one bootstrap/fixtures snapshot
+    per GW (taken before its deadline, with drifting prices, statuses, form and
+    points_per_game) into a SnapshotStore, and element-summary histories with
+    realised points for those GWs into root/element_summary. Returns root."""
+    import copy, json, pathlib
+    from datetime import datetime, timedelta
+    from ..fplio.store import SnapshotStore, TS_FMT
+
+    root = pathlib.Path(root)
+    store = SnapshotStore(root)
+    rng = np.random.default_rng(seed + 1)
+    base = make_bootstrap(seed=seed)
+    els = base["elements"]
+    skill = np.array([float(e["points_per_game"]) for e in els])  # true mean points per appearance
+    cost = np.array([e["now_cost"] for e in els])
+    played = {e["id"]: [] for e in els}
+    history = {e["id"]: [] for e in els}
+    schedule = make_fixtures(first_gw=first_gw, seed=seed)
+
+    for gw in range(first_gw, last_gw + 1):
+        bs = copy.deepcopy(base)
+        bs["events"] = [{"id": g, "is_current": g == gw - 1, "is_next": g == gw} for g in range(1, 39)]
+        cost = np.clip(cost + rng.choice([-1, 0, 0, 0, 0, 1], len(cost)), 38, 145)
+        for k, e in enumerate(bs["elements"]):
+            pts = played[e["id"]]
+            e["now_cost"] = int(cost[k])
+            e["status"] = str(rng.choice(["a"] * 10 + ["d", "i"]))
+            e["chance_of_playing_next_round"] = None if e["status"] == "a" else (50 if e["status"] == "d" else 0)
+            if pts:
+                e["form"] = f"{np.mean(pts[-4:]):.1f}"
+                e["points_per_game"] = f"{np.mean(pts):.1f}"
+        ts = (datetime(2024, 8, 1, 6) + timedelta(days=7 * gw)).strftime(TS_FMT)
+        store.put("bootstrap_static", bs, ts=ts)
+        store.put("fixtures", make_fixtures(first_gw=gw, seed=seed), ts=ts)
+
+        for fx in (f for f in schedule if f["event"] == gw):
+            for k, e in enumerate(bs["elements"]):
+                if e["team"] not in (fx["team_h"], fx["team_a"]):
+                    continue
+                p_play = {"a": 0.9, "d": 0.5}.get(e["status"], 0.0)
+                minutes = int(rng.choice([90, 25])) if rng.random() < p_play else 0
+                pts = 0 if not minutes else (2 if minutes >= 60 else 1) + int(rng.poisson(max(skill[k] - 2, 0.2)))
+                if minutes:
+                    played[e["id"]].append(pts)
+                home = e["team"] == fx["team_h"]
+                history[e["id"]].append({
+                    "element": e["id"], "fixture": fx["id"], "round": gw, "minutes": minutes,
+                    "total_points": pts, "goals_scored": 0, "assists": 0, "clean_sheets": 0,
+                    "was_home": home, "opponent_team": fx["team_a"] if home else fx["team_h"]})
+
+    out = root / "element_summary"
+    out.mkdir(parents=True, exist_ok=True)
+    for pid, rows in history.items():
+        (out / f"{pid}.json").write_text(json.dumps({"history": rows}))
+    return root
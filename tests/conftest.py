@@ -0,0 +1,90 @@
+import json, threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from fpl_opt.utils.synthetic import make_bootstrap, make_fixtures
+
+
+class _StandIn(BaseHTTPRequestHandler):
+    """Minimal FPL API stand-in: serves `routes` with an ETag, honours If-None-Match,
+    and replays any queued status codes (e.g. 429/503) before succeeding."""
+    routes: dict = {}
+    fail_queue: list = []
+    hits: list = []
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def _empty(self, code, **headers):
+        self.send_response(code)
+        for k, v in headers.items():
+            self.send_header(k.replace("_", "-"), v)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self):
+        self.hits.append((self.path, dict(self.headers)))
+        if self.fail_queue:
+            self._empty(self.fail_queue.pop(0), Retry_After="0")
+            return
+        if self.path not in self.routes:
+            self._empty(404)
+            return
+        body = json.dumps(self.routes[self.path]).encode()
+        etag = f'"{hash(body) & 0xffffffff:x}"'
+        if self.headers.get("If-None-Match") == etag:
+            self._empty(304)
+            return
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stand_in():
+    handler = type("Handler", (_StandIn,), {"routes": {}, "fail_queue": [], "hits": []})
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    t = threading.Thread(target=srv.serve_forever, daemon=True)
+    t.start()
+    srv.base = f"http://127.0.0.1:{srv.server_address[1]}"
+    srv.handler = handler
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+# ---------- synthetic FPL payloads (offline test data) ----------
+
+@pytest.fixture(scope="session")
+def bootstrap():
+    return make_bootstrap()
+
+@pytest.fixture(scope="session")
+def fixtures_payload():
+    return make_fixtures()
+
+@pytest.fixture(scope="session")
+def cheap_squad(bootstrap):
+    """A legal 15 of the cheapest available players."""
+    need = {1: 2, 2: 5, 3: 5, 4: 3}
+    per_team, ids = {}, []
+    for e in sorted(bootstrap["elements"], key=lambda e: e["now_cost"]):
+        if e["status"] != "a" or need[e["element_type"]] == 0 or per_team.get(e["team"], 0) == 3:
+            continue
+        need[e["element_type"]] -= 1
+        per_team[e["team"]] = per_team.get(e["team"], 0) + 1
+        ids.append(e["id"])
+    return ids
+
+@pytest.fixture
+def snapshot_store(tmp_path, bootstrap, fixtures_payload):
+    from fpl_opt.fplio.store import SnapshotStore
+    store = SnapshotStore(tmp_path / "raw")
+    store.put("bootstrap_static", bootstrap, ts="20240901T060000Z")
+    store.put("fixtures", fixtures_payload, ts="20240901T060000Z")
+    return store
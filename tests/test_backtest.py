@@ -0,0 +1,62 @@
+import pandas as pd
+import pytest
+
+from fpl_opt.backtest import (load_season, next_free_transfers, realized_score, run_backtest,
+                              summarize)
+from fpl_opt.features.projections import load_yaml
+from fpl_opt.utils.synthetic import make_season
+
+def test_free_transfer_rollover():
+    assert next_free_transfers(1, 0) == 2
+    assert next_free_transfers(1, 1) == 1
+    assert next_free_transfers(2, 4) == 1  # took hits
+    assert next_free_transfers(5, 0) == 5 and next_free_transfers(2, 0, max_free=2) == 2
+
+def test_auto_subs_and_vice_captain():
+    pos = ["GK"] * 2 + ["DEF"] * 5 + ["MID"] * 5 + ["FWD"] * 3
+    squad = pd.DataFrame({"element_id": range(1, 16), "position": pos,
+                          "ep_next": [5.0 - 0.1 * i for i in range(15)]})
+    bench = {2, 7, 12, 15}  # GK2, DEF7, MID12, FWD15
+    squad["is_starter"] = ~squad["element_id"].isin(bench)
+    squad["is_captain"] = squad["element_id"] == 8
+    points = {i: 2 for i in range(1, 16)} | {3: 10, 7: 6}
+    minutes = {i: 90 for i in range(1, 16)} | {3: 0, 8: 0, 12: 0}
+    score, xi = realized_score(squad, points, minutes)
+    # DEF 3 out -> first playing bench outfielder by ep (DEF 7); MID 8 out -> MID 12 didn't play, FWD 15 did
+    assert 3 not in xi and 7 in xi and 8 not in xi and 15 in xi and len(xi) == 11
+    vice = 1  # best other starter by ep_next
+    assert score == sum(points[p] for p in xi) + points[vice]
+
+    # 3-4-3 with two DEF blanks: both bench DEFs come on like for like
+    squad["is_starter"] = ~squad["element_id"].isin({2, 6, 7, 12})
+    minutes = {i: 90 for i in range(1, 16)} | {3: 0, 4: 0}
+    score, xi = realized_score(squad, points, minutes)
+    assert sorted(xi) == [1, 5, 6, 7, 8, 9, 10, 11, 13, 14, 15]
+
+def test_backtest_replays_state_over_process_pool(tmp_path):
+    root = make_season(tmp_path / "season", first_gw=5, last_gw=8)
+    season = load_season(root, "s")
+    assert sorted(season["gameweeks"]) == [5, 6, 7, 8]
+    weights = load_yaml("configs/weights.yaml")
+    configs = [{"name": f"x{mx}", "weights": weights, "max_extra_transfers": mx, "max_time": 1.0,
+                "cache_root": str(tmp_path / "cache")} for mx in (0, 2)]
+    recs = run_backtest([season], configs, workers=2, out_path=str(tmp_path / "bt.jsonl"))
+    assert len(recs) == 8 and not any("error" in r for r in recs)
+    assert len((tmp_path / "bt.jsonl").read_text().splitlines()) == 8
+    assert len(list((tmp_path / "cache" / "projections").iterdir())) == 4  # shared by both configs
+
+    for name in ("x0", "x2"):
+        run = sorted((r for r in recs if r["config"] == name), key=lambda r: r["gw"])
+        assert run[0]["transfers_in"] == [] and run[0]["free_transfers"] == run[1]["free_transfers"] == 1
+        for prev, cur in zip(run[1:], run[2:]):
+            assert cur["free_transfers"] == next_free_transfers(prev["free_transfers"], len(prev["transfers_in"]))
+        for r in run:
+            assert r["bank_tenths"] >= 0 and len(r["transfers_in"]) == len(r["transfers_out"])
+            assert r["hits"] == 4 * max(0, len(r["transfers_in"]) - r["free_transfers"])
+            assert r["net"] == r["realized"] - r["hits"] and len(r["xi"]) == 11
+        if name == "x0":
+            assert all(r["hits"] == 0 for r in run)
+
+    summ = summarize(recs)
+    assert list(summ["gws"]) == [4, 4]
+    assert summ["net"].sum() == pytest.approx(sum(r["net"] for r in recs))
@@ -0,0 +1,29 @@
+import json
+
+import numpy as np
+
+from fpl_opt.batch import run_batch
+from fpl_opt.optimize.hints import greedy_squad
+from fpl_opt.utils.synthetic import make_candidates
+
+def test_run_batch_streams_one_line_per_team(tmp_path):
+    cands = make_candidates()
+    small = cands[cands["team"] <= 10].reset_index(drop=True)
+    paths = []
+    for k in range(2):
+        noisy = small.assign(ep_next=small["ep_next"] * np.random.default_rng(k).uniform(0.3, 1.7, len(small)))
+        p = tmp_path / f"team{k}.json"
+        p.write_text(json.dumps({"element_ids": greedy_squad(noisy, 1000, 3), "bank_tenths": 0, "free_transfers": 1}))
+        paths.append(str(p))
+    bad = tmp_path / "bad.json"
+    bad.write_text("{}")
+    out = tmp_path / "out.jsonl"
+
+    counts = run_batch(paths + [str(bad)], str(out), small, workers=2, threads=1, max_time=5.0)
+    assert counts == {"ok": 2, "failed": 1}
+    recs = {r["team"]: r for r in map(json.loads, out.read_text().splitlines())}
+    assert set(recs) == set(paths) | {str(bad)}
+    assert "error" in recs[str(bad)]
+    for p in paths:
+        assert len(recs[p]["transfers_in"]) == len(recs[p]["transfers_out"])
+        assert len(recs[p]["starters"]) == 11
@@ -0,0 +1,32 @@
+from fpl_opt.fplio.bulk import fetch_element_summaries, load_element_summaries
+from fpl_opt.fplio.client import FPLClient
+from fpl_opt.fplio.normalize import history_table
+
+def _summary(pid):
+    return {"history": [{"element": pid, "fixture": 1, "round": 1, "minutes": 90, "total_points": pid % 7,
+                         "goals_scored": 0, "assists": 0, "clean_sheets": 0, "was_home": True,
+                         "opponent_team": 2}], "fixtures": []}
+
+def test_bulk_fetch_resumes(stand_in, tmp_path):
+    ids = list(range(1, 41))
+    for pid in ids:
+        stand_in.handler.routes[f"/element-summary/{pid}/"] = _summary(pid)
+    client = FPLClient(base=stand_in.base, rate=0)
+    seen = []
+
+    first = fetch_element_summaries(ids[:25], tmp_path, run_key="gw1", client=client, workers=8,
+                                    progress=lambda d, t: seen.append(d))
+    assert first["fetched"] == 25 and not first["failed"]
+    assert seen[-1] == 25
+
+    stand_in.handler.hits.clear()
+    second = fetch_element_summaries(ids, tmp_path, run_key="gw1", client=client, workers=8)
+    assert second["skipped"] == 25 and second["fetched"] == 15
+    assert len(stand_in.handler.hits) == 15
+
+    hist = history_table(load_element_summaries(tmp_path))
+    assert sorted(hist["element_id"]) == ids
+
+    # A new run key refetches everything
+    third = fetch_element_summaries(ids, tmp_path, run_key="gw2", client=client, workers=8)
+    assert third["fetched"] == 40
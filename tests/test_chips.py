@@ -0,0 +1,65 @@
+import os
+from itertools import permutations
+
+import numpy as np
+
+from fpl_opt.features.horizon import project_horizon
+from fpl_opt.fplio.normalize import fixtures_table, players_table
+from fpl_opt.optimize.chips import plan_chips, schedule_chips, solve_squads, squad_value_tenths
+from fpl_opt.optimize.hints import greedy_squad
+from fpl_opt.utils.synthetic import make_candidates
+
+CHIPS = [("wildcard", 1, 3), ("wildcard", 4, 6), ("free_hit", 1, 6), ("bench_boost", 1, 6)]
+
+def test_dp_matches_brute_force():
+    rng = np.random.default_rng(0)
+    gws = list(range(1, 7))
+    gains = {c: rng.uniform(-2, 10, 6) for c in ("wildcard", "free_hit", "bench_boost")}
+    total, schedule = schedule_chips(gains, gws, CHIPS)
+
+    best = 0.0
+    for weeks in permutations(list(range(6)) + [None] * 4, 4):  # week (or unused) per chip instance
+        used = [w for w in weeks if w is not None]
+        if len(set(used)) != len(used):
+            continue
+        if any(w is not None and not lo <= gws[w] <= hi for w, (_, lo, hi) in zip(weeks, CHIPS)):
+            continue
+        best = max(best, sum(gains[c][w] for w, (c, _, _) in zip(weeks, CHIPS) if w is not None))
+    assert abs(total - best) < 1e-9
+    assert len({s["gw"] for s in schedule}) == len(schedule)
+
+def test_plan_chips_end_to_end(bootstrap, fixtures_payload, tmp_path):
+    players = players_table(bootstrap)
+    ep, gws = project_horizon(players, fixtures_table(fixtures_payload), start_gw=9, n_gw=4)
+    current = greedy_squad(make_candidates(), 1000, 3)
+    budget = squad_value_tenths(players, current, 0)
+    plan = plan_chips(players, ep, gws, current, budget, workers=2, max_time=1.0,
+                      cache_dir=tmp_path, wildcard_span=2)
+    assert plan["total_gain"] >= 0
+    assert {s["chip"] for s in plan["schedule"]} <= {"wildcard", "free_hit", "bench_boost", "triple_captain"}
+    assert all(len(s["squad_ids"]) == 15 for s in plan["schedule"] if "squad_ids" in s)
+    # 4 free-hit + 4 wildcard solves; the last wildcard span equals the last GW's free hit
+    assert len(list(tmp_path.glob("*.json"))) == 7
+
+def test_solve_squads_trims_cache_lru(tmp_path):
+    df = make_candidates()
+    for k in range(6):  # stale entries from earlier runs, oldest first
+        (tmp_path / f"old{k}.json").write_text("x" * 100)
+        os.utime(tmp_path / f"old{k}.json", (k, k))
+    res = solve_squads(df, [df["ep_next"].to_numpy()], 1000, workers=1, max_time=1.0,
+                       cache_dir=tmp_path, max_bytes=400)
+    assert len(res[0]["element_ids"]) == 15
+    left = sorted(tmp_path.glob("*.json"))
+    old = [p.name for p in left if p.name.startswith("old")]
+    assert len(left) == len(old) + 1  # the fresh entry is kept
+    assert old == [f"old{k}.json" for k in range(6 - len(old), 6)]  # most recently used survive
+    assert sum(p.stat().st_size for p in left) <= 400
+
+def test_solve_squads_cache_is_keyed_by_time_limit(tmp_path):
+    df = make_candidates()
+    ep = [df["ep_next"].to_numpy()]
+    res = solve_squads(df, ep, 1000, workers=1, max_time=0.5, cache_dir=tmp_path)
+    assert res[0]["status"] in ("OPTIMAL", "FEASIBLE")
+    assert solve_squads(df, ep, 1000, workers=1, max_time=0.5, cache_dir=tmp_path) == res  # cache hit
+    solve_squads(df, ep, 1000, workers=1, max_time=1.0, cache_dir=tmp_path)  # bigger budget re-solves
+    assert len(list(tmp_path.glob("*.json"))) == 2
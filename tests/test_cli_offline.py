@@ -0,0 +1,52 @@
+import json
+
+import pytest
+
+from fpl_opt import cli
+from fpl_opt.features import projcache
+from fpl_opt.fplio import api, tablecache
+
+def test_show_current_offline(snapshot_store, cheap_squad, tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(api, "RAW_DIR", snapshot_store.root)
+    monkeypatch.setattr(tablecache, "TABLE_DIR", tmp_path / "tables")
+    monkeypatch.setattr(projcache, "PROJ_DIR", tmp_path / "projections")
+    team = tmp_path / "my_team.json"
+    team.write_text(json.dumps({"element_ids": cheap_squad, "bank_tenths": 0, "free_transfers": 1}))
+    cli.run(current_team_path=str(team), show_current=True, apply_path=None, accept_ins_raw=None,
+            accept_outs_raw=None, max_extra_transfers=1, export_current_team=None,
+            as_of="20240902T000000Z")
+    assert "Projected GW score with your team" in capsys.readouterr().out
+
+def test_recommend_with_owned_player_gone(snapshot_store, bootstrap, cheap_squad, tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(api, "RAW_DIR", snapshot_store.root)
+    monkeypatch.setattr(tablecache, "TABLE_DIR", tmp_path / "tables")
+    monkeypatch.setattr(projcache, "PROJ_DIR", tmp_path / "projections")
+    monkeypatch.setattr(cli, "save_last_optimum", lambda ids: None)
+    gone = max(e["id"] for e in bootstrap["elements"]) + 1  # e.g. left the league
+    team = tmp_path / "my_team.json"
+    team.write_text(json.dumps({"element_ids": cheap_squad[:14] + [gone],
+                                "bank_tenths": 50, "free_transfers": 1}))
+    cli.run(current_team_path=str(team), show_current=False, apply_path=None, accept_ins_raw=None,
+            accept_outs_raw=None, max_extra_transfers=1, export_current_team=None,
+            as_of="20240902T000000Z")
+    out = capsys.readouterr().out
+    assert f"Not in pool (status/minutes=0?): [{gone}]" in out
+    assert "Transfers in:" in out and "Top " not in out
+
+def test_plan_with_owned_player_gone_exits_cleanly(snapshot_store, bootstrap, cheap_squad, tmp_path, monkeypatch):
+    monkeypatch.setattr(api, "RAW_DIR", snapshot_store.root)
+    monkeypatch.setattr(tablecache, "TABLE_DIR", tmp_path / "tables")
+    monkeypatch.setattr(projcache, "PROJ_DIR", tmp_path / "projections")
+    gone = max(e["id"] for e in bootstrap["elements"]) + 1
+    team = tmp_path / "my_team.json"
+    team.write_text(json.dumps({"element_ids": cheap_squad[:14] + [gone],
+                                "bank_tenths": 50, "free_transfers": 1}))
+    with pytest.raises(SystemExit, match=f"missing: \\[{gone}\\]"):
+        cli.run(current_team_path=str(team), show_current=False, apply_path=None, accept_ins_raw=None,
+                accept_outs_raw=None, max_extra_transfers=1, export_current_team=None,
+                as_of="20240902T000000Z", plan_horizon=3)
+
+def test_risk_target_requires_target(capsys):
+    with pytest.raises(SystemExit):
+        cli.main(["--risk", "target", "--offline"])
+    assert "--risk target requires --target" in capsys.readouterr().err
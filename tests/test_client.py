@@ -0,0 +1,41 @@
+import time
+
+import pytest
+import requests
+
+from fpl_opt.fplio.client import FPLClient, TokenBucket
+from fpl_opt.fplio.httpcache import HttpCache
+
+def _client(srv, tmp_path, **kw):
+    kw.setdefault("backoff", 0.01)
+    return FPLClient(base=srv.base, cache=HttpCache(tmp_path / "http"), **kw)
+
+def test_retries_on_429_and_5xx(stand_in, tmp_path):
+    stand_in.handler.routes["/fixtures/"] = [{"id": 1}]
+    stand_in.handler.fail_queue.extend([429, 503, 502])
+    r = _client(stand_in, tmp_path).get("/fixtures/")
+    assert r.json() == [{"id": 1}]
+    assert len(stand_in.handler.hits) == 4
+
+def test_gives_up_after_max_retries(stand_in, tmp_path):
+    stand_in.handler.fail_queue.extend([503] * 5)
+    with pytest.raises(requests.HTTPError):
+        _client(stand_in, tmp_path, max_retries=2).get("/fixtures/")
+    assert len(stand_in.handler.hits) == 3
+
+def test_connection_reuse(stand_in, tmp_path):
+    stand_in.handler.routes["/a/"] = {"ok": True}
+    c = _client(stand_in, tmp_path)
+    for _ in range(5):
+        c.get("/a/")
+    # Keep-alive: one pooled connection serves every request
+    (pool,) = [c.session.adapters["http://"].poolmanager.pools[k]
+               for k in c.session.adapters["http://"].poolmanager.pools.keys()]
+    assert pool.num_connections == 1 and pool.num_requests == 5
+
+def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=50, capacity=1)
+    t0 = time.monotonic()
+    for _ in range(11):
+        bucket.acquire()
+    assert time.monotonic() - t0 >= 0.18
@@ -0,0 +1,21 @@
+from fpl_opt.fplio.api import get_bootstrap_static
+from fpl_opt.fplio.client import FPLClient
+from fpl_opt.fplio.httpcache import HttpCache
+
+def test_conditional_get_and_max_age(stand_in, tmp_path):
+    stand_in.handler.routes["/bootstrap-static/"] = {"elements": [], "teams": []}
+    client = FPLClient(base=stand_in.base, cache=HttpCache(tmp_path / "http"))
+
+    first = get_bootstrap_static(save=False, client=client)
+    assert first == {"elements": [], "teams": []}
+    assert len(stand_in.handler.hits) == 1
+
+    # Within max-age: served from disk, no request at all
+    assert get_bootstrap_static(save=False, client=client) == first
+    assert len(stand_in.handler.hits) == 1
+
+    # Forced revalidation: conditional GET answered by 304
+    assert get_bootstrap_static(save=False, max_age=0, client=client) == first
+    path, headers = stand_in.handler.hits[-1]
+    assert len(stand_in.handler.hits) == 2
+    assert "If-None-Match" in headers
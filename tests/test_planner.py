@@ -0,0 +1,37 @@
+from collections import Counter
+
+from fpl_opt.features.horizon import project_horizon
+from fpl_opt.fplio.normalize import fixtures_table, players_table
+from fpl_opt.optimize.hints import greedy_squad
+from fpl_opt.optimize.planner import plan_transfers
+from fpl_opt.utils.synthetic import make_candidates
+
+def test_rolling_plan_respects_rules(bootstrap, fixtures_payload):
+    players = players_table(bootstrap)
+    ep, gws = project_horizon(players, fixtures_table(fixtures_payload), start_gw=5, n_gw=3)
+    current = greedy_squad(make_candidates(), 1000, 3)
+
+    plan = plan_transfers(players, ep, gws, current, bank_tenths=5, free_transfers=1, horizon=3,
+                          window=2, time_budget=12, pool_per_position={"GK": 4, "DEF": 10, "MID": 10, "FWD": 6})
+    assert [w["gw"] for w in plan["weeks"]] == [5, 6, 7]
+
+    squad, ft = set(current), 1
+    for w in plan["weeks"]:
+        assert w["free_transfers"] == ft
+        assert w["hits"] == max(0, len(w["transfers_in"]) - ft)
+        assert len(w["transfers_in"]) == len(w["transfers_out"])
+        squad = (squad - set(w["transfers_out"])) | set(w["transfers_in"])
+        assert squad == set(w["squad"]["element_id"].astype(int))
+        assert max(Counter(w["squad"]["team"]).values()) <= 3
+        assert w["squad"]["is_starter"].sum() == 11 and w["bank_tenths"] >= 0
+        ft = min(5, ft - (len(w["transfers_in"]) - w["hits"]) + 1)
+
+def test_free_transfers_are_spent_before_hits(bootstrap, fixtures_payload):
+    # Free hits make banking a free transfer behind a hit cost nothing, so only the rule prevents it
+    players = players_table(bootstrap)
+    ep, gws = project_horizon(players, fixtures_table(fixtures_payload), start_gw=5, n_gw=3)
+    current = greedy_squad(make_candidates(), 1000, 3)
+    plan = plan_transfers(players, ep, gws, current, bank_tenths=50, free_transfers=2, horizon=3, window=3,
+                          time_budget=12, hit_cost=0.0, pool_per_position={"GK": 4, "DEF": 10, "MID": 10, "FWD": 6})
+    for w in plan["weeks"]:
+        assert w["hits"] == max(0, len(w["transfers_in"]) - w["free_transfers"])
@@ -0,0 +1,19 @@
+from fpl_opt.optimize.common import QUOTAS
+from fpl_opt.optimize.presolve import prune_dominated
+from fpl_opt.utils.synthetic import make_candidates
+
+def test_prunes_only_dominated_and_keeps_owned():
+    cands = make_candidates()
+    worst = cands.sort_values("ep_next").groupby("position", observed=True).head(1)
+    owned = worst["element_id"].astype(int).tolist()
+
+    pruned, n = prune_dominated(cands, keep_ids=owned)
+    assert n > len(cands) // 4
+    assert len(pruned) + n == len(cands)
+    assert set(owned) <= set(pruned["element_id"].astype(int))
+
+    dropped = cands[~cands["element_id"].isin(pruned["element_id"])]
+    for _, r in dropped.iterrows():
+        better = cands[(cands["position"] == r.position) & (cands["price_tenths"] <= r.price_tenths)
+                       & (cands["ep_next"] > r.ep_next)]
+        assert better["team"].nunique() >= QUOTAS[str(r.position)] + 4
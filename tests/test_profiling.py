@@ -0,0 +1,47 @@
+import json, threading
+
+from ortools.sat.python import cp_model
+
+from fpl_opt.optimize.solve import solve
+from fpl_opt.utils import profiling
+
+def test_nested_stages_solver_stats_and_trace(tmp_path):
+    with profiling.stage("inactive") as rec:
+        assert rec is None
+
+    prof = profiling.activate()
+    try:
+        with prof.stage("optimize"):
+            m = cp_model.CpModel()
+            x = [m.NewBoolVar(f"x{i}") for i in range(8)]
+            m.Add(sum(x) <= 3)
+            m.Maximize(sum((i + 1) * v for i, v in enumerate(x)))
+            _, _, stats = solve(m, 5.0)
+    finally:
+        profiling.deactivate()
+
+    assert stats["objective"] == 21 and stats["gap"] == 0 and "conflicts" in stats
+    opt, sol = prof.records
+    assert sol["path"] == "optimize/solve" and sol["args"]["solver"]["status"] == "OPTIMAL"
+    assert opt["child_wall"] == sol["wall"] <= opt["wall"]
+
+    out = tmp_path / "trace.json"
+    prof.write_trace(str(out))
+    events = json.loads(out.read_text())["traceEvents"]
+    assert [e["name"] for e in events] == ["optimize", "solve"]
+    assert all(e["ph"] == "X" and e["dur"] >= 0 for e in events)
+
+def test_stages_off_the_profiling_thread_are_noops():
+    prof = profiling.activate(memory=False)
+    seen = []
+    def work():
+        with profiling.stage("handler") as rec:
+            seen.append(rec)
+    try:
+        with profiling.stage("main"):
+            t = threading.Thread(target=work)
+            t.start()
+            t.join()
+    finally:
+        profiling.deactivate()
+    assert seen == [None] and [r["path"] for r in prof.records] == ["main"]
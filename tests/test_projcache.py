@@ -0,0 +1,34 @@
+import os
+
+import pandas as pd
+
+from fpl_opt import ops
+from fpl_opt.features.projcache import ProjectionCache, fingerprint
+from fpl_opt.features.projections import project_next_gw
+from fpl_opt.fplio import tablecache
+from fpl_opt.fplio.normalize import fixtures_table, players_table, teams_table
+
+def test_prepare_reuses_projection(bootstrap, fixtures_payload, tmp_path, monkeypatch):
+    monkeypatch.setattr(tablecache, "TABLE_DIR", tmp_path / "tables")
+    cache = ProjectionCache(tmp_path / "projections")
+    first = ops.prepare(bootstrap, fixtures_payload, proj_cache=cache)["proj"]
+    again = ops.prepare(bootstrap, fixtures_payload, proj_cache=cache)["proj"]
+    assert (cache.hits, cache.misses) == (1, 1)
+    expected = project_next_gw(players_table(bootstrap), teams_table(bootstrap), fixtures_table(fixtures_payload))
+    pd.testing.assert_frame_equal(first, expected)
+    pd.testing.assert_frame_equal(again, expected)
+
+def test_fingerprint_covers_weights():
+    assert fingerprint("a", "b", b"w: 1") != fingerprint("a", "b", b"w: 2")
+    assert fingerprint("a", "b", b"w: 1") == fingerprint("a", "b", b"w: 1")
+
+def test_evicts_least_recently_used(tmp_path):
+    df = pd.DataFrame({"element_id": range(1000), "ep_next": 1.0})
+    cache = ProjectionCache(tmp_path)
+    cache.put("old", df)
+    cache.put("new", df)
+    os.utime(tmp_path / "old" / "meta.json", (0, 0))
+    cache.max_bytes = cache.stats()["bytes"] - 1
+    assert cache.evict() == 1
+    assert cache.get("old") is None and cache.get("new") is not None
+    assert cache.stats()["entries"] == 1 and cache.evictions == 1
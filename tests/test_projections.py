@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+
+from fpl_opt.features.projections import load_yaml, next_fixture_difficulty, project_next_gw, project_weight_sets
+from fpl_opt.fplio.normalize import players_table, teams_table, fixtures_table
+
+def test_next_fixture_difficulty_matches_first_fixture(fixtures_payload):
+    fixtures = fixtures_table(fixtures_payload)
+    expected = {}
+    for _, row in fixtures.sort_values(["event", "fixture_id"]).dropna(subset=["event"]).iterrows():
+        expected.setdefault(row["team_h"], row["team_h_difficulty"])
+        expected.setdefault(row["team_a"], row["team_a_difficulty"])
+    assert next_fixture_difficulty(fixtures).to_dict() == expected
+
+def test_projection_uses_status_and_position(bootstrap, fixtures_payload):
+    players = players_table(bootstrap)
+    proj = project_next_gw(players, teams_table(bootstrap), fixtures_table(fixtures_payload))
+    assert len(proj) == len(players)
+    assert proj["ep_next"].is_monotonic_decreasing
+    injured = proj[proj["status"] == "i"]
+    assert (injured["exp_minutes"] == 0).all()
+    # zero minutes leaves only the position bias
+    gk = injured[injured["position"] == "GK"]
+    assert pd.Series(gk["ep_next"]).round(4).eq(0.2).all()
+
+def test_weight_sets_match_per_set_projection(bootstrap, fixtures_payload):
+    players, teams, fixtures = players_table(bootstrap), teams_table(bootstrap), fixtures_table(fixtures_payload)
+    base = load_yaml("configs/weights.yaml")
+    alt = {**base, "ppg_weight": 0.4, "form_weight": 0.6, "fixture_bump": {**base["fixture_bump"], 5: 0.7},
+           "status_minutes": {**base["status_minutes"], "d": 0}}
+    frame, ep, minutes = project_weight_sets(players, teams, fixtures, [base, alt])
+    assert ep.shape == minutes.shape == (2, len(players)) and ep.dtype == np.float32
+    for row, w in enumerate([base, alt]):
+        proj = project_next_gw(players, teams, fixtures, weights=w).set_index("element_id").loc[frame["element_id"]]
+        assert np.array_equal(proj["ep_next"].to_numpy(), ep[row])
+        assert np.array_equal(proj["exp_minutes"].to_numpy(), minutes[row])
+
+def test_horizon_counts_doubles_and_blanks(bootstrap, fixtures_payload):
+    from fpl_opt.features.horizon import project_horizon
+
+    players = players_table(bootstrap)
+    fixtures = fixtures_table(fixtures_payload)
+    matrix, gws = project_horizon(players, fixtures, start_gw=5, n_gw=34)
+    assert matrix.shape == (len(players), 34) and matrix.dtype == "float32"
+    assert list(gws[:2]) == [5, 6]
+
+    moved = [f for f in fixtures_payload if f["event"] == 12 and f["id"] < 100]
+    h, a = moved[0]["team_h"], moved[0]["team_a"]
+    playing = players["status"].astype(str).eq("a").to_numpy()
+    team = players["team"].to_numpy()
+    col = {g: i for i, g in enumerate(gws)}
+    for t in (h, a):
+        rows = playing & (team == t)
+        assert (matrix[rows, col[10]] == 0).all()        # blank
+        assert (matrix[rows, col[12]] > matrix[rows, col[11]] * 1.4).all()  # double
+
+    # Single-GW column agrees with project_next_gw for teams with one fixture
+    proj = project_next_gw(players, teams_table(bootstrap), fixtures)
+    ep = proj.set_index("element_id")["ep_next"].reindex(players["element_id"]).to_numpy()
+    assert abs(matrix[:, 0] - ep).max() < 1e-4
@@ -0,0 +1,40 @@
+import json, threading
+from datetime import datetime, timezone
+
+import requests
+
+from fpl_opt import server
+from fpl_opt.features import projcache
+from fpl_opt.fplio import api, tablecache
+
+def test_next_refresh_wraps_to_tomorrow():
+    now = datetime(2024, 9, 1, 19, 30, tzinfo=timezone.utc)
+    assert server.next_refresh(now, ["06:00", "18:00"]) == datetime(2024, 9, 2, 6, 0, tzinfo=timezone.utc)
+    assert server.next_refresh(now.replace(hour=7), ["06:00", "18:00"]).hour == 18
+
+def test_serve_show_current_and_apply(snapshot_store, cheap_squad, tmp_path, monkeypatch):
+    monkeypatch.setattr(api, "RAW_DIR", snapshot_store.root)
+    monkeypatch.setattr(tablecache, "TABLE_DIR", tmp_path / "tables")
+    monkeypatch.setattr(projcache, "PROJ_DIR", tmp_path / "projections")
+    state = server.State(as_of="20240902T000000Z", max_time=3.0)
+    state.refresh()
+    assert state.refresh()["projection_cache"]["hits"] == 1  # same snapshot: projection reused
+    srv = server.make_server(state, port=0)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{srv.server_address[1]}"
+    team = {"element_ids": cheap_squad, "bank_tenths": 0, "free_transfers": 1}
+    try:
+        assert requests.get(f"{base}/health").json()["candidates"] > 0
+
+        cur = requests.post(f"{base}/show-current", data=json.dumps({"team": team})).json()
+        assert len(cur["starters"]) == 11 and cur["captain"] in cur["starters"]
+
+        rec = requests.post(f"{base}/recommend", data=json.dumps({"team": team, "top_k": 2})).json()
+        assert len(rec["transfers_in"]) == len(rec["transfers_out"]) and rec["moves"]
+
+        sell = team["element_ids"][0]
+        bad = requests.post(f"{base}/apply", data=json.dumps({"team": team, "accept_outs": [sell]}))
+        assert bad.status_code == 400 and "14 players" in bad.json()["error"]
+    finally:
+        srv.shutdown()
+        srv.server_close()
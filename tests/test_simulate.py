@@ -0,0 +1,28 @@
+import numpy as np
+
+from fpl_opt.features.simulate import simulate_points
+from fpl_opt.utils.synthetic import make_candidates
+
+def test_simulation_is_seeded_calibrated_and_correlated():
+    proj = make_candidates()
+    scen, summ = simulate_points(proj, n_scenarios=20_000, seed=7, chunk=3000)
+    assert scen.dtype == np.float32 and scen.shape == (20_000, len(proj))
+
+    again, summ2 = simulate_points(proj, n_scenarios=20_000, seed=7, chunk=3000, keep=False)
+    assert again is None and summ.equals(summ2)
+    assert not np.array_equal(scen[:100], simulate_points(proj, n_scenarios=100, seed=8)[0])
+
+    # means track ep_next where it exceeds the appearance/clean-sheet baseline
+    hot = summ["ep_next"] > 5
+    assert np.allclose(summ.loc[hot, "mean"], summ.loc[hot, "ep_next"], atol=0.25)
+    assert np.allclose(summ["mean"], scen.mean(axis=0), atol=1e-3)
+    q = summ[["q05", "q25", "q50", "q75", "q95"]].to_numpy()
+    assert (np.diff(q, axis=1) >= 0).all()
+
+    # shared team shocks: teammates co-move, players on different clubs don't
+    att = proj[proj["position"].isin(["MID", "FWD"])].nlargest(60, "ep_next")
+    club = att["team"].value_counts().index[0]
+    same, other = att.index[att["team"] == club], att.index[att["team"] != club]
+    corr = lambda i, j: np.corrcoef(scen[:, i], scen[:, j])[0, 1]
+    assert corr(same[0], same[1]) > 0.05
+    assert abs(corr(same[0], other[0])) < 0.03
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from fpl_opt.features.simulate import simulate_points
+from fpl_opt.optimize.stochastic import (build_squad_stochastic, reduce_scenarios, risk_stats,
+                                         scenario_stability, xi_points)
+from fpl_opt.utils.synthetic import make_candidates
+
+def _pool(teams=6):
+    cands = make_candidates()
+    return cands[cands["team"] <= teams].reset_index(drop=True)
+
+def test_reduce_scenarios_and_risk_stats():
+    scen = np.random.default_rng(0).poisson(3.0, (2000, 30)).astype(np.float32)
+    reps, w = reduce_scenarios(scen, 50, seed=1)
+    assert reps.shape == (50, 30) and w.sum() == pytest.approx(1.0)
+    assert all((scen == r).all(axis=1).any() for r in reps)  # representatives are real scenarios
+    assert np.allclose(w @ reps, scen.mean(axis=0), atol=0.5)
+
+    st = risk_stats(np.array([1.0, 2, 3, 4, 10]), alpha=0.4, target=3)
+    assert st == pytest.approx({"mean": 4.0, "cvar": 1.5, "p_target": 0.6})
+    assert risk_stats(np.array([1.0, 5]), np.array([0.1, 0.9]), alpha=0.2)["cvar"] == pytest.approx(3.0)
+
+def test_risk_modes_pick_legal_squads_no_worse_than_mean_optimum():
+    df = _pool(teams=5)  # small enough for the CVaR model to prove optimality
+    scen, _ = simulate_points(df, 2000, seed=3)
+    kw = dict(n_reps=10, max_time=30, prune=False)
+    base, _ = build_squad_stochastic(df, scen, risk_weight=0.0, **kw)
+    safe, obj = build_squad_stochastic(df, scen, risk_weight=0.8, **kw)
+    for sq in (base, safe):
+        assert len(sq) == 15 and sq["price_tenths"].sum() <= 1000
+        assert sq["is_starter"].sum() == 11 and sq["is_captain"].sum() == 1
+    b, s = base.attrs["risk"], safe.attrs["risk"]  # same representatives (same seed)
+    assert safe.attrs["solve_stats"]["status"] == "OPTIMAL"
+    assert obj == pytest.approx(0.2 * s["mean"] + 0.8 * s["cvar"], abs=1e-6) == s["objective"]
+    assert s["cvar"] >= b["cvar"] - 1e-9 and b["mean"] >= s["mean"] - 1e-9
+
+    target = round(b["mean"])
+    hit, _ = build_squad_stochastic(df, scen, risk="target", target=target, **kw)
+    mask = lambda sq, col: df["element_id"].isin(sq.loc[sq[col], "element_id"]).to_numpy()
+    reps, w = reduce_scenarios(scen, 10)
+    p_base = risk_stats(xi_points(reps, mask(base, "is_starter"), mask(base, "is_captain")), w, target=target)
+    assert hit.attrs["risk"]["p_target"] >= p_base["p_target"] - 1e-9
+
+    with pytest.raises(ValueError):
+        build_squad_stochastic(df, scen[:, 1:])
+    with pytest.raises(ValueError):
+        build_squad_stochastic(df, scen, risk="target")
+
+def test_duplicated_scenarios_collapse_to_fewer_reps():
+    df = _pool()
+    scen = np.repeat(simulate_points(df, 50)[0], 10, axis=0)  # 500 rows, at most 50 distinct
+    sq, _ = build_squad_stochastic(df, scen, n_reps=200, max_time=2)
+    assert len(sq) == 15 and sq["is_starter"].sum() == 11
+    assert sq.attrs["risk"]["reps"] <= 50
+
+def test_scenario_stability_report():
+    rep = scenario_stability(_pool(), counts=(100, 400), n_eval=2000, n_reps=30, max_time=2)
+    assert list(rep["n_scenarios"]) == [100, 400]
+    assert {"eval_mean", "eval_cvar", "score", "regret", "shared_prev", "shared_last"} <= set(rep.columns)
+    assert rep["regret"].min() == 0 and rep["shared_last"].iloc[-1] == 15
@@ -0,0 +1,31 @@
+import json
+
+import pytest
+
+from fpl_opt.fplio.store import SnapshotStore
+
+def test_dedup_and_as_of_lookup(tmp_path):
+    store = SnapshotStore(tmp_path)
+    a, b = {"elements": [1, 2]}, {"elements": [1, 2, 3]}
+    ha = store.put("bootstrap_static", a, ts="20240801T060000Z")
+    assert store.put("bootstrap_static", a, ts="20240801T180000Z") == ha
+    hb = store.put("bootstrap_static", b, ts="20240802T060000Z")
+
+    assert store.entries("bootstrap_static") == [("20240801T060000Z", ha), ("20240802T060000Z", hb)]
+    assert len(list((tmp_path / "objects").iterdir())) == 2
+    assert store.get("bootstrap_static") == b
+    assert store.get("bootstrap_static", as_of="20240801T235959Z") == a
+    with pytest.raises(LookupError):
+        store.get("bootstrap_static", as_of="20240701T000000Z")
+
+    # A fresh handle reads the persisted index; lzma objects are readable too
+    other = SnapshotStore(tmp_path, codec="lzma")
+    other.put("fixtures", [{"id": 1}], ts="20240801T060000Z")
+    assert SnapshotStore(tmp_path).get("fixtures") == [{"id": 1}]
+
+def test_import_legacy(tmp_path):
+    (tmp_path / "fixtures_20240801T060000Z.json").write_text(json.dumps([{"id": 1}], indent=2))
+    store = SnapshotStore(tmp_path)
+    assert store.import_legacy(remove=True) == 1
+    assert store.get("fixtures") == [{"id": 1}]
+    assert not list(tmp_path.glob("fixtures_*.json"))
@@ -0,0 +1,40 @@
+from collections import Counter
+from itertools import combinations
+
+import numpy as np
+
+from fpl_opt.optimize.hints import greedy_squad
+from fpl_opt.optimize.swaps import enumerate_transfers
+from fpl_opt.optimize.xi import best_xi_batch
+from fpl_opt.utils.synthetic import make_candidates
+
+def _brute_force(df, current, bank, free_transfers):
+    rows = {int(r.element_id): (str(r.position), int(r.price_tenths), int(r.team), float(r.ep_next))
+            for r in df.itertuples()}
+    POS = ["GK", "DEF", "MID", "FWD"]
+    pool = [pid for pid in rows if pid not in current]
+    singles = [(o, i) for o in current for i in pool if rows[o][0] == rows[i][0]]
+    moves = [()] + [(s,) for s in singles] + [
+        (a, b) for a, b in combinations(singles, 2) if a[0] != b[0] and a[1] != b[1]]
+    squads, nets = [], []
+    for mv in moves:
+        outs, ins = {o for o, _ in mv}, [i for _, i in mv]
+        squad = [p for p in current if p not in outs] + ins
+        cash = bank + sum(rows[o][1] for o in outs) - sum(rows[i][1] for i in ins)
+        if cash < 0 or max(Counter(rows[p][2] for p in squad).values()) > 3:
+            continue
+        squad.sort(key=lambda p: POS.index(rows[p][0]))
+        squads.append([rows[p][3] for p in squad])
+        nets.append(-4.0 * max(0, len(mv) - free_transfers))
+    layout = sorted([rows[p][0] for p in current], key=POS.index)
+    return float(np.max(best_xi_batch(np.array(squads), layout) + np.array(nets)))
+
+def test_matches_brute_force_on_small_league():
+    cands = make_candidates()
+    small = cands[cands["team"] <= 10].reset_index(drop=True)
+    current = greedy_squad(small, 1000, 3)
+    for bank, ft in [(0, 1), (15, 2), (0, 0)]:
+        ranked = enumerate_transfers(small, current, bank_tenths=bank, free_transfers=ft, top_k=5)
+        assert ranked["net"].is_monotonic_decreasing
+        assert abs(ranked["net"].iloc[0] - _brute_force(small, current, bank, ft)) < 1e-3
+        assert (ranked["bank_after"] >= 0).all()
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from fpl_opt.features.projections import load_yaml, project_weight_sets
+from fpl_opt.fplio.normalize import fixtures_table, players_table, teams_table
+from fpl_opt.sweep import (grid_weight_sets, neighbour_order, random_weight_sets, run_sweep,
+                           stability_report)
+from fpl_opt.utils.synthetic import make_bootstrap, make_fixtures
+
+def test_weight_set_generation_and_order():
+    base = load_yaml("configs/weights.yaml")
+    grid = grid_weight_sets(base, {"ppg_weight": [0.5, 0.9], "fixture_bump.5": [0.8, 0.86, 0.9]})
+    assert len(grid) == 6 and grid[-1]["ppg_weight"] == 0.9 and grid[-1]["fixture_bump"][5] == 0.9
+    assert grid[0]["form_weight"] == 0.3 and base["fixture_bump"][5] == 0.86  # defaults filled, base untouched
+    with pytest.raises(KeyError):
+        grid_weight_sets(base, {"fixture_bump.9": [1.0]})
+
+    sets = random_weight_sets(base, 12, scale=0.2, seed=1)
+    assert sets[0]["status_minutes"] == base["status_minutes"] and sets[1]["status_minutes"]["i"] == 0
+    order = neighbour_order(sets)
+    assert order[0] == 0 and sorted(order) == list(range(12))
+
+def _sweep_inputs():
+    bs, fx = make_bootstrap(), make_fixtures()
+    players = players_table(bs)
+    players = players[players["team"] <= 6].reset_index(drop=True)
+    base = load_yaml("configs/weights.yaml")
+    sets = grid_weight_sets(base, {"ppg_weight": [0.5, 0.7, 0.9]})
+    frame, ep, minutes = project_weight_sets(players, teams_table(bs), fixtures_table(fx), sets)
+    keep = (minutes > 0).any(axis=0)
+    return frame[keep].reset_index(drop=True), ep[:, keep], minutes[:, keep] > 0
+
+def test_sweep_over_process_pool_and_report():
+    pool, ep, live = _sweep_inputs()
+    star = int(np.argmax(ep[1]))
+    live[1, star] = False  # excluded under set 1 only
+    res = run_sweep(pool, ep, live, workers=2, max_time=2)
+    assert [r["point"] for r in res] == [0, 1, 2] and all("error" not in r for r in res)
+    star_id = int(pool["element_id"].iloc[star])
+    assert star_id not in res[1]["squad"] and star_id in res[0]["squad"]
+    assert res[1]["hinted"] or res[0]["hinted"]  # second point of a block starts from its neighbour
+
+    names = dict(zip(pool["element_id"].astype(int), pool["web_name"]))
+    players = stability_report(res, names)["players"]
+    assert players["squad"].max() == 1.0 and players["captain"].sum() == pytest.approx(1.0)
+
+    team = {"element_ids": res[0]["squad"], "bank_tenths": 5, "free_transfers": 1, "purchases_tenths": {}}
+    res = run_sweep(pool, ep, live, team, order=[2, 1, 0], workers=1, max_time=5)
+    assert all("error" not in r for r in res)
+    rep = stability_report(res, names)
+    assert {"players", "transfers", "moves"} <= set(rep)
+    assert rep["moves"]["share"].sum() == pytest.approx(1.0)
+    for r in res:
+        assert len(r["transfers_in"]) == len(r["transfers_out"])
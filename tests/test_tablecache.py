@@ -0,0 +1,24 @@
+import copy
+
+import numpy as np
+import pytest
+
+from fpl_opt.fplio.normalize import players_table, teams_table, fixtures_table
+from fpl_opt.fplio.tablecache import normalized_tables
+
+def test_roundtrip_is_lossless_and_mmapped(bootstrap, fixtures_payload, tmp_path):
+    built = normalized_tables(bootstrap, fixtures_payload, root=tmp_path)
+    players, teams, fixtures = normalized_tables(bootstrap, fixtures_payload, root=tmp_path)
+
+    assert players.equals(players_table(bootstrap))
+    assert teams.equals(teams_table(bootstrap))
+    assert fixtures.equals(fixtures_table(fixtures_payload))
+    assert all(a.equals(b) for a, b in zip(built, (players, teams, fixtures)))
+    assert isinstance(players["element_id"].values, np.memmap)
+    assert len(list(tmp_path.iterdir())) == 3
+
+def test_unknown_status_fails_loudly(bootstrap):
+    bs = copy.deepcopy(bootstrap)
+    bs["elements"][0]["status"] = "x"
+    with pytest.raises(ValueError, match="'x'"):
+        players_table(bs)
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from fpl_opt.optimize.hints import greedy_squad
+from fpl_opt.optimize.model import build_squad
+from fpl_opt.optimize.template import SquadTemplate
+from fpl_opt.optimize.transfers import build_squad_with_transfers
+from fpl_opt.utils.synthetic import make_candidates
+
+def _pool():
+    cands = make_candidates()
+    return cands[cands["team"] <= 6].reset_index(drop=True)
+
+def test_template_resolves_match_fresh_models():
+    df = _pool()
+    tpl = SquadTemplate(df)
+    rng = np.random.default_rng(1)
+    current = greedy_squad(df.assign(ep_next=df["ep_next"] * rng.uniform(0.3, 1.7, len(df))), 1000, 3)
+    for k in range(2):  # same compiled model, new objective each time
+        pool = df.assign(ep_next=df["ep_next"] * rng.uniform(0.8, 1.2, len(df)))
+        fresh = build_squad_with_transfers(pool, current, bank_tenths=5, free_transfers=1)
+        warm = build_squad_with_transfers(pool, current, bank_tenths=5, free_transfers=1, template=tpl)
+        assert fresh["stats"]["status"] == warm["stats"]["status"] == "OPTIMAL"
+        assert warm["objective"] == pytest.approx(fresh["objective"], abs=1e-6)
+        assert warm["final_bank_tenths"] >= 0
+
+    squad, _ = build_squad(df, budget_tenths=900, template=tpl, max_time=2)
+    assert len(squad) == 15 and squad["price_tenths"].sum() <= 900 and squad["is_captain"].sum() == 1
+
+def test_fixed_players_and_pool_mismatch():
+    df = _pool()
+    tpl = SquadTemplate(df)
+    ep, price = df["ep_next"].to_numpy(), df["price_tenths"].to_numpy()
+    best = int(np.argmax(ep))
+    cheap_gk = int(df.index[df["position"] == "GK"][np.argmin(price[df["position"] == "GK"])])
+    fixed_out = np.zeros(len(df), dtype=bool); fixed_out[best] = True
+    fixed_in = np.zeros(len(df), dtype=bool); fixed_in[cheap_gk] = True
+    res = tpl.solve(ep, price, 1000, fixed_in=fixed_in, fixed_out=fixed_out, max_time=10)
+    assert res["squad"].sum() == 15 and res["starters"].sum() == 11 and res["captain"].sum() == 1
+    assert res["squad"][cheap_gk] and not res["squad"][best]
+    assert int(price[res["squad"]].sum()) <= 1000
+
+    with pytest.raises(ValueError):
+        build_squad(df.iloc[1:], template=tpl)
@@ -0,0 +1,22 @@
+import numpy as np
+
+from fpl_opt.optimize.hints import greedy_squad
+from fpl_opt.optimize.transfers import build_squad_with_transfers
+from fpl_opt.utils.synthetic import make_candidates
+
+def _setup():
+    cands = make_candidates()
+    small = cands[cands["team"] <= 10].reset_index(drop=True)
+    noisy = small.assign(ep_next=small["ep_next"] * np.random.default_rng(3).uniform(0.3, 1.7, len(small)))
+    return small, greedy_squad(noisy, 1000, 3)
+
+def test_transfer_cap_and_neighbourhood():
+    df, current = _setup()
+    capped = build_squad_with_transfers(df, current, bank_tenths=0, free_transfers=1, max_extra_transfers=0)
+    assert capped["transfers_out_count"] <= 1 and capped["extra_transfers"] == 0
+
+    weakest = df[df["element_id"].isin(current)].nsmallest(3, "ep_next")["element_id"].astype(int).tolist()
+    local = build_squad_with_transfers(df, current, bank_tenths=0, free_transfers=2,
+                                       max_extra_transfers=None, sell_candidates=weakest)
+    assert set(local["transfers_out"]) <= set(weakest)
+    assert local["final_bank_tenths"] >= 0
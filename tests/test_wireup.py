@@ -1,9 +1,9 @@
-from fpl_opt.fplio.api import get_bootstrap_static, get_fixtures
+from fpl_opt.fplio.api import load_bootstrap_static, load_fixtures
 from fpl_opt.fplio.normalize import players_table, teams_table, fixtures_table
 
-def test_end_to_end_shapes():
-    bs = get_bootstrap_static(save=False)
-    fx = get_fixtures(save=False)
+def test_end_to_end_shapes(snapshot_store):
+    bs = load_bootstrap_static(store=snapshot_store)
+    fx = load_fixtures(store=snapshot_store)
 
     players = players_table(bs)
     teams = teams_table(bs)
@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+
+from fpl_opt.optimize.model import pick_xi_from_squad
+from fpl_opt.optimize.xi import FORMATIONS, best_xi, best_xi_batch
+
+LAYOUT = ["GK"] * 2 + ["DEF"] * 5 + ["MID"] * 5 + ["FWD"] * 3
+
+def test_formations():
+    assert len(FORMATIONS) == 8
+    assert (1, 4, 4, 2) in FORMATIONS and (1, 3, 5, 2) in FORMATIONS and (1, 2, 5, 3) not in FORMATIONS
+
+def test_exact_matches_cpsat():
+    rng = np.random.default_rng(1)
+    for _ in range(10):
+        df = pd.DataFrame({"position": LAYOUT, "ep_next": rng.uniform(0, 9, 15).round(2)})
+        exact, v_exact = pick_xi_from_squad(df)
+        _, v_cp = pick_xi_from_squad(df, method="cpsat")
+        assert abs(v_exact - v_cp) < 1e-6
+        assert exact["is_starter"].sum() == 11 and exact["is_captain"].sum() == 1
+        assert exact.loc[exact["is_captain"], "is_starter"].all()
+
+def test_batch_matches_single():
+    rng = np.random.default_rng(2)
+    ep = rng.uniform(-1, 9, (50, 15)).astype(np.float32)
+    batch = best_xi_batch(ep, LAYOUT)
+    single = [best_xi(row, LAYOUT)[2] for row in ep]
+    assert np.allclose(batch, single, atol=1e-4)